@@ -0,0 +1,168 @@
+"""This module computes concentration statistics over the contributors of a run."""
+
+import math
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# How many of the busiest contributors the top share adds up
+TOP_CONTRIBUTORS = 10
+# The percentiles of the contribution counts that are reported
+PERCENTILES = (50, 90, 99)
+# The share of the contributions of a repository its bus factor contributors make
+BUS_FACTOR_SHARE = 0.5
+
+
+def summarize(contributors: list) -> dict:
+    """
+    Compute concentration statistics over the contributors of a run.
+
+    The contributions form a contributor x repository count matrix. It is
+    kept in coordinate form, one entry per contributor and repository they
+    contributed to, since a dense matrix of 100k contributors and 5k
+    repositories would not fit in memory while nearly all of it is zero.
+    With numpy installed the statistics are computed on arrays, otherwise
+    with plain Python.
+
+    Args:
+        contributors (list): The merged ContributorStats objects of the run
+
+    Returns:
+        analytics (dict): The keys 'top_contributors', 'top_share' (percent
+            of the contributions the busiest contributors made), 'gini' (Gini
+            coefficient of the contribution counts), 'percentiles' (maps
+            'p50', 'p90' and 'p99' to a contribution count) and
+            'repositories', which maps each "owner/name" to a dict with the
+            keys 'contributors', 'bus_factor' (the fewest contributors who made
+            half of its contributions) and 'new_contributor_rate' (percent)
+    """
+    names = sorted(
+        {
+            name
+            for contributor in contributors
+            for name, count in (contributor.repository_counts or {}).items()
+            if count > 0
+        }
+    )
+    index = {name: column for column, name in enumerate(names)}
+    rows, columns, counts = [], [], []
+    for row, contributor in enumerate(contributors):
+        for name, count in (contributor.repository_counts or {}).items():
+            if count > 0:
+                rows.append(row)
+                columns.append(index[name])
+                counts.append(count)
+    totals = [contributor.contribution_count for contributor in contributors]
+    new = [bool(contributor.new_contributor) for contributor in contributors]
+
+    summarize_matrix = _summarize_lists if numpy is None else _summarize_arrays
+    top_share, gini, percentiles, sizes, bus_factors, new_rates = summarize_matrix(
+        totals, new, rows, columns, counts, len(names)
+    )
+    return {
+        "top_contributors": TOP_CONTRIBUTORS,
+        "top_share": round(float(top_share), 2),
+        "gini": round(float(gini), 3),
+        "percentiles": {
+            f"p{percentile}": round(float(value), 2)
+            for percentile, value in zip(PERCENTILES, percentiles)
+        },
+        "repositories": {
+            name: {
+                "contributors": int(sizes[column]),
+                "bus_factor": int(bus_factors[column]),
+                "new_contributor_rate": round(float(new_rates[column]), 2),
+            }
+            for column, name in enumerate(names)
+        },
+    }
+
+
+def _summarize_arrays(totals, new, rows, columns, counts, repository_count):
+    """Compute the statistics of summarize with numpy arrays."""
+    totals = numpy.asarray(totals, dtype=numpy.int64)
+    total = int(totals.sum())
+    busiest = totals
+    if len(totals) > TOP_CONTRIBUTORS:
+        busiest = numpy.partition(totals, -TOP_CONTRIBUTORS)[-TOP_CONTRIBUTORS:]
+    top_share = busiest.sum() / total * 100 if total else 0.0
+
+    gini = 0.0
+    if total:
+        ordered = numpy.sort(totals)
+        ranks = numpy.arange(1, len(ordered) + 1)
+        size = len(ordered)
+        gini = 2 * (ranks * ordered).sum() / (size * total) - (size + 1) / size
+    percentiles = [0.0] * len(PERCENTILES)
+    if len(totals):
+        percentiles = numpy.percentile(totals, PERCENTILES)
+
+    rows = numpy.asarray(rows, dtype=numpy.int64)
+    columns = numpy.asarray(columns, dtype=numpy.int64)
+    counts = numpy.asarray(counts, dtype=numpy.int64)
+    # Each repository's entries next to each other, busiest contributor first
+    order = numpy.lexsort((-counts, columns))
+    rows, columns, counts = rows[order], columns[order], counts[order]
+    sizes = numpy.bincount(columns, minlength=repository_count)
+    repository_totals = numpy.bincount(
+        columns, weights=counts, minlength=repository_count
+    )
+    # The contributions of the busier contributors of the same repository
+    preceding = numpy.cumsum(counts) - counts
+    starts = numpy.cumsum(sizes) - sizes
+    preceding -= preceding[starts][columns]
+    needed = preceding < BUS_FACTOR_SHARE * repository_totals[columns]
+    bus_factors = numpy.bincount(columns[needed], minlength=repository_count)
+    new_counts = numpy.bincount(
+        columns,
+        weights=numpy.asarray(new, dtype=numpy.float64)[rows],
+        minlength=repository_count,
+    )
+    new_rates = new_counts / numpy.maximum(sizes, 1) * 100
+    return top_share, gini, percentiles, sizes, bus_factors, new_rates
+
+
+def _summarize_lists(totals, new, rows, columns, counts, repository_count):
+    """Compute the statistics of summarize with plain Python."""
+    total = sum(totals)
+    ordered = sorted(totals)
+    top_share = sum(ordered[-TOP_CONTRIBUTORS:]) / total * 100 if total else 0.0
+
+    gini = 0.0
+    if total:
+        size = len(ordered)
+        weighted = sum(rank * value for rank, value in enumerate(ordered, 1))
+        gini = 2 * weighted / (size * total) - (size + 1) / size
+    percentiles = [_percentile(ordered, percentile) for percentile in PERCENTILES]
+
+    repository_counts = [[] for _ in range(repository_count)]
+    for row, column, count in zip(rows, columns, counts):
+        repository_counts[column].append((count, row))
+    sizes, bus_factors, new_rates = [], [], []
+    for entries in repository_counts:
+        entries.sort(key=lambda entry: -entry[0])
+        threshold = BUS_FACTOR_SHARE * sum(count for count, _ in entries)
+        preceding = bus_factor = 0
+        for count, _ in entries:
+            if preceding >= threshold:
+                break
+            preceding += count
+            bus_factor += 1
+        sizes.append(len(entries))
+        bus_factors.append(bus_factor)
+        new_rates.append(
+            sum(new[row] for _, row in entries) / max(len(entries), 1) * 100
+        )
+    return top_share, gini, percentiles, sizes, bus_factors, new_rates
+
+
+def _percentile(ordered: list, percentile: int) -> float:
+    """Interpolate a percentile of sorted values the way numpy.percentile does."""
+    if not ordered:
+        return 0.0
+    position = percentile / 100 * (len(ordered) - 1)
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
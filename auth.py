@@ -1,7 +1,18 @@
 """This is the module that contains functions related to authenticating to GitHub with a personal access token."""
 
+import datetime
+import threading
+import time
+from urllib.parse import urlparse
+
 import github3
 import requests
+import transport
+
+# Installation tokens are replaced this long before GitHub expires them
+TOKEN_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+# Assumed remaining requests of a credential until GitHub reports its rate limit
+DEFAULT_RATE_LIMIT_REMAINING = 5000
 
 
 def auth_to_github(
@@ -11,34 +22,62 @@ def auth_to_github(
     gh_app_private_key_bytes: bytes,
     ghe: str,
     gh_app_enterprise_only: bool,
+    token_manager: "AppInstallationTokenManager | CredentialPool | None" = None,
 ) -> github3.GitHub:
     """
     Connect to GitHub.com or GitHub Enterprise, depending on env variables.
 
     Args:
-        token (str): the GitHub personal access token
+        token (str): the GitHub personal access token, or a comma separated list of them
         gh_app_id (int | None): the GitHub App ID
         gh_app_installation_id (int | None): the GitHub App Installation ID
         gh_app_private_key_bytes (bytes): the GitHub App Private Key
         ghe (str): the GitHub Enterprise URL
         gh_app_enterprise_only (bool): Set this to true if the GH APP is created on GHE and needs to communicate with GHE api only
+        token_manager (AppInstallationTokenManager | CredentialPool | None): the installation
+            token manager to authenticate the GitHub App with, or the pool of several tokens.
+            Created from the App credentials or the token list when None
 
     Returns:
         github3.GitHub: the GitHub connection object
     """
     if gh_app_id and gh_app_private_key_bytes and gh_app_installation_id:
         if ghe and gh_app_enterprise_only:
-            gh = github3.github.GitHubEnterprise(url=ghe)
+            gh = github3.github.GitHubEnterprise(
+                url=ghe, session=transport.github_session()
+            )
         else:
-            gh = github3.github.GitHub()
-        gh.login_as_app_installation(
-            gh_app_private_key_bytes, gh_app_id, gh_app_installation_id
-        )
+            gh = github3.github.GitHub(session=transport.github_session())
+        if token_manager is None:
+            token_manager = AppInstallationTokenManager(
+                ghe if gh_app_enterprise_only else "",
+                gh_app_id,
+                gh_app_private_key_bytes,
+                gh_app_installation_id,
+            )
+        if not token_manager.token():
+            raise ValueError("Unable to authenticate to GitHub")
+        # Every github3 request asks the manager for a current token
+        gh.session.auth = token_manager
+        github_connection = gh
+    elif "," in token:
+        if ghe:
+            gh = github3.github.GitHubEnterprise(
+                url=ghe, session=transport.github_session()
+            )
+        else:
+            gh = github3.github.GitHub(session=transport.github_session())
+        # Every github3 request is sent with the token that has the most quota left
+        gh.session.auth = token_manager or CredentialPool(token.split(","))
         github_connection = gh
     elif ghe and token:
-        github_connection = github3.github.GitHubEnterprise(url=ghe, token=token)
+        github_connection = github3.github.GitHubEnterprise(
+            url=ghe, token=token, session=transport.github_session()
+        )
     elif token:
-        github_connection = github3.login(token=token)
+        github_connection = github3.github.GitHub(
+            token=token, session=transport.github_session()
+        )
     else:
         raise ValueError(
             "GH_TOKEN or the set of [GH_APP_ID, GH_APP_INSTALLATION_ID, GH_APP_PRIVATE_KEY] environment variables are not set"
@@ -56,9 +95,12 @@ def get_github_app_installation_token(
     gh_app_installation_id: str,
 ) -> str | None:
     """
-    Get a GitHub App Installation token.
+    Get a GitHub App Installation token once, without refreshing it.
     API: https://docs.github.com/en/apps/creating-github-apps/authenticating-with-a-github-app/authenticating-as-a-github-app-installation
 
+    Long runs should use an AppInstallationTokenManager, which replaces the
+    token before it expires.
+
     Args:
         ghe (str): the GitHub Enterprise endpoint
         gh_app_id (str): the GitHub App ID
@@ -68,14 +110,175 @@ def get_github_app_installation_token(
     Returns:
         str: the GitHub App token
     """
+    return AppInstallationTokenManager(
+        ghe, gh_app_id, gh_app_private_key_bytes, gh_app_installation_id
+    ).token()
+
+
+class AppInstallationTokenManager(requests.auth.AuthBase):
+    """
+    Mint one GitHub App installation token and replace it shortly before it expires.
+
+    Installation tokens are only valid for one hour, so long organization
+    scans need a fresh one partway through. The manager is used as the auth
+    of the github3 session and hands the same token to the raw GraphQL
+    requests. Refreshing is serialized with a lock, so concurrent workers
+    wait for the new token instead of sending an expired one.
+
+    Attributes:
+        refresh_margin (timedelta): How long before expiry the token is replaced
+    """
+
+    def __init__(
+        self,
+        ghe: str,
+        gh_app_id: int | str,
+        gh_app_private_key_bytes: bytes,
+        gh_app_installation_id: int | str,
+        refresh_margin: datetime.timedelta = TOKEN_REFRESH_MARGIN,
+    ):
+        """Initialize the manager without requesting a token yet"""
+        self.refresh_margin = refresh_margin
+        self._credentials = (
+            ghe,
+            gh_app_id,
+            gh_app_private_key_bytes,
+            gh_app_installation_id,
+        )
+        self._token: str | None = None
+        self._expires_at = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+        self._lock = threading.Lock()
+
+    def token(self) -> str | None:
+        """Return a token valid for at least refresh_margin, minting a new one if needed"""
+        with self._lock:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            if self._token is None or now + self.refresh_margin >= self._expires_at:
+                installation_token = _create_installation_token(*self._credentials)
+                if installation_token is None:
+                    return self._token
+                self._token = installation_token["token"]
+                self._expires_at = datetime.datetime.fromisoformat(
+                    installation_token["expires_at"]
+                )
+            return self._token
+
+    def __call__(self, request):
+        """Authenticate a request with the current installation token"""
+        request.headers["Authorization"] = f"token {self.token()}"
+        return request
+
+
+class CredentialPool(requests.auth.AuthBase):
+    """
+    Spread requests across several credentials by their remaining rate limit.
+
+    Each request is sent with the credential that has the most requests left
+    for the rate limit resource it counts against (core, search or graphql).
+    The estimate is decremented when a credential is picked and corrected
+    from the X-RateLimit headers of every response, so concurrent workers
+    are spread over the pool instead of draining one credential first.
+
+    Attributes:
+        credentials (list): Personal access tokens and/or
+            AppInstallationTokenManager objects
+    """
+
+    def __init__(self, credentials: list):
+        """Initialize the pool, stripping blanks from token strings"""
+        self.credentials = [
+            credential.strip() if isinstance(credential, str) else credential
+            for credential in credentials
+            if not isinstance(credential, str) or credential.strip()
+        ]
+        # (credential index, resource) -> (remaining requests, reset epoch seconds)
+        self._rate_limits: dict[tuple[int, str], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def token(self, resource: str = "graphql") -> str | None:
+        """Return the token with the most requests left for a rate limit resource"""
+        return self._token_of(self._select(resource))
+
+    def __call__(self, request):
+        """Authenticate a request with the best credential and track its rate limit"""
+        index = self._select(_rate_limit_resource(request.url))
+        request.headers["Authorization"] = f"token {self._token_of(index)}"
+        request.register_hook(
+            "response", lambda response, **_: self._update(index, response)
+        )
+        return request
+
+    def _select(self, resource: str) -> int:
+        """Pick the credential with the most requests left and count one request against it"""
+        with self._lock:
+            now = time.time()
+            remaining = [
+                self._remaining(index, resource, now)
+                for index in range(len(self.credentials))
+            ]
+            best = remaining.index(max(remaining))
+            reset = self._rate_limits.get((best, resource), (0, 0.0))[1]
+            if reset <= now:
+                reset = now + 3600
+            self._rate_limits[(best, resource)] = (remaining[best] - 1, reset)
+            return best
+
+    def _remaining(self, index: int, resource: str, now: float) -> int:
+        """Return the estimated requests left, assuming a full budget after a reset"""
+        remaining, reset = self._rate_limits.get(
+            (index, resource), (DEFAULT_RATE_LIMIT_REMAINING, now + 3600)
+        )
+        if reset <= now:
+            return DEFAULT_RATE_LIMIT_REMAINING
+        return remaining
+
+    def _update(self, index: int, response) -> None:
+        """Record the rate limit GitHub reported for a credential"""
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        resource = response.headers.get(
+            "X-RateLimit-Resource", _rate_limit_resource(response.url)
+        )
+        with self._lock:
+            self._rate_limits[(index, resource)] = (int(remaining), float(reset))
+
+    def _token_of(self, index: int) -> str | None:
+        """Return the current token of a credential"""
+        credential = self.credentials[index]
+        if isinstance(credential, str):
+            return credential
+        return credential.token()
+
+
+def _rate_limit_resource(url: str | None) -> str:
+    """Return the rate limit resource a request to this url counts against"""
+    path = urlparse(url or "").path
+    if path.endswith("/graphql"):
+        return "graphql"
+    if "/search/" in path:
+        return "search"
+    return "core"
+
+
+def _create_installation_token(
+    ghe: str,
+    gh_app_id: int | str,
+    gh_app_private_key_bytes: bytes,
+    gh_app_installation_id: int | str,
+) -> dict | None:
+    """Request a new installation token, returning its token and expires_at or None on failure"""
     jwt_headers = github3.apps.create_jwt_headers(gh_app_private_key_bytes, gh_app_id)
     api_endpoint = f"{ghe}/api/v3" if ghe else "https://api.github.com"
     url = f"{api_endpoint}/app/installations/{gh_app_installation_id}/access_tokens"
 
     try:
-        response = requests.post(url, headers=jwt_headers, json=None, timeout=5)
+        response = transport.session().post(
+            url, headers=jwt_headers, json=None, timeout=transport.TIMEOUT
+        )
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Request to get GitHub App Installation Token failed: {e}")
         return None
-    return response.json().get("token")
+    return response.json()
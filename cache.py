@@ -0,0 +1,45 @@
+"""This module keeps small JSON documents in the cache directory between runs."""
+
+import json
+import os
+
+
+def load(cache_dir: str, filename: str) -> dict:
+    """
+    Load a JSON document saved by a previous run.
+
+    Args:
+        cache_dir (str): The cache directory, nothing is loaded when empty
+        filename (str): The name of the document in the cache directory
+
+    Returns:
+        data (dict): The saved document, empty when there is none
+    """
+    if not cache_dir:
+        return {}
+    try:
+        with open(
+            os.path.join(cache_dir, filename), "r", encoding="utf-8"
+        ) as cache_file:
+            return json.load(cache_file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save(cache_dir: str, filename: str, data: dict) -> None:
+    """
+    Save a JSON document for the next runs.
+
+    Args:
+        cache_dir (str): The cache directory, nothing is saved when empty
+        filename (str): The name of the document in the cache directory
+        data (dict): The document to save
+    """
+    if not cache_dir:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, filename)
+    # Write to a temporary file first so a killed run never leaves half a file
+    with open(f"{path}.tmp", "w", encoding="utf-8") as cache_file:
+        json.dump(data, cache_file, indent=4, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
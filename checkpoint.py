@@ -0,0 +1,125 @@
+"""This module saves the progress of a run so that a restarted run can resume it."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from urllib.parse import quote
+
+import contributor_stats
+
+
+class Checkpoint:
+    """
+    The on-disk progress of one run, keyed by the parameters of the run.
+
+    Every repository that is finished is saved with its contributors. Heavy
+    repositories that are fetched in time slices also save each finished
+    slice, which acts as their pagination cursor. A restarted run with the
+    same parameters finds the same directory, skips the finished
+    repositories and only fetches the slices that are still missing. A run
+    that finishes every repository removes its progress, so the next run
+    with the same parameters fetches everything again.
+
+    Attributes:
+        path (str): The directory holding the progress of this run
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        organization: str,
+        repository_list: list,
+        start_date: str,
+        end_date: str,
+    ):
+        """Initialize the checkpoint, creating its directory if needed"""
+        parameters = json.dumps(
+            [organization, sorted(repository_list or []), start_date, end_date]
+        )
+        run_key = hashlib.sha256(parameters.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, run_key)
+        os.makedirs(self.path, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def load_contributors(self, repo_full_name: str) -> list | None:
+        """Return the saved contributors of a finished repository, or None"""
+        try:
+            with open(
+                self._file(repo_full_name, "json"), "r", encoding="utf-8"
+            ) as checkpoint_file:
+                saved = json.load(checkpoint_file)
+        except FileNotFoundError:
+            return None
+        return [contributor_stats.ContributorStats(**data) for data in saved]
+
+    def save_contributors(self, repo_full_name: str, contributors: list) -> None:
+        """Save the contributors of a finished repository"""
+        filename = self._file(repo_full_name, "json")
+        # Write to a temporary file first so a killed run never leaves half a file
+        with open(f"{filename}.tmp", "w", encoding="utf-8") as checkpoint_file:
+            json.dump(
+                [contributor.__dict__ for contributor in contributors], checkpoint_file
+            )
+        os.replace(f"{filename}.tmp", filename)
+
+    def load_slices(self, repo_full_name: str) -> list:
+        """
+        Return the saved time slices of a repository.
+
+        Returns:
+            slices (list): (since, until, contributor_data, commits) tuples with
+                since and until as ISO 8601 strings
+        """
+        slices = []
+        try:
+            with open(
+                self._file(repo_full_name, "slices"), "r", encoding="utf-8"
+            ) as slices_file:
+                for line in slices_file:
+                    try:
+                        saved = json.loads(line)
+                    except ValueError:
+                        continue  # the run was killed while writing this line
+                    slices.append(
+                        (
+                            saved["since"],
+                            saved["until"],
+                            saved["contributor_data"],
+                            saved["commits"],
+                        )
+                    )
+        except FileNotFoundError:
+            pass
+        return slices
+
+    def save_slice(
+        self,
+        repo_full_name: str,
+        since: str,
+        until: str,
+        contributor_data: dict,
+        commits: int,
+    ) -> None:
+        """Append a finished time slice of a repository"""
+        line = json.dumps(
+            {
+                "since": since,
+                "until": until,
+                "contributor_data": contributor_data,
+                "commits": commits,
+            }
+        )
+        with self._lock, open(
+            self._file(repo_full_name, "slices"), "a", encoding="utf-8"
+        ) as slices_file:
+            slices_file.write(f"{line}\n")
+
+    def remove(self) -> None:
+        """Delete the progress of this run once it is complete"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _file(self, repo_full_name: str, extension: str) -> str:
+        """Return the checkpoint file of a repository"""
+        return os.path.join(self.path, f"{quote(repo_full_name, safe='')}.{extension}")
@@ -0,0 +1,110 @@
+"""This module counts the commits of a whole organization with the commit search API."""
+
+import datetime
+
+import paginator
+
+# The search API never returns more than this many results for one query
+SEARCH_RESULT_LIMIT = 1000
+# How many times a page is requested again after the search rate limit, which
+# only allows 30 requests a minute, resets
+SEARCH_RATE_LIMIT_WAITS = 5
+
+
+def iter_org_commit_authors(
+    github_connection: object,
+    organization: str,
+    window_start: datetime.datetime,
+    window_end: datetime.datetime,
+):
+    """
+    Yield the author of every commit in every repository of an organization.
+
+    Instead of listing the commits of every repository one by one, this
+    streams all commits of the organization in the date window from the
+    search/commits endpoint. Search results are capped at
+    SEARCH_RESULT_LIMIT per query, so the window is split in halves
+    recursively until each slice fits.
+
+    Commits are matched on their committer date, the same date the commits
+    endpoint filters on, so the counts match the ones from scanning each
+    repository.
+
+    Args:
+        github_connection (object): The authenticated GitHub connection object
+        organization (str): The organization to search the commits of.
+        window_start (datetime): The inclusive start of the window.
+        window_end (datetime): The inclusive end of the window.
+
+    Yields:
+        (repo_full_name, login, avatar_url, committed_date) tuples, where
+        login and avatar_url are None for commits without a linked GitHub user
+    """
+    slices = [(window_start, window_end)]
+    while slices:
+        since, until = slices.pop()
+        pages = _search_commits(github_connection, organization, since, until)
+        first_page = next(pages, None)
+        if first_page is None:
+            continue
+        if first_page["total_count"] > SEARCH_RESULT_LIMIT and until > since:
+            pages.close()
+            middle = (since + (until - since) / 2).replace(microsecond=0)
+            slices.append((since, middle))
+            slices.append((middle + datetime.timedelta(seconds=1), until))
+            continue
+        if first_page["total_count"] > SEARCH_RESULT_LIMIT:
+            print(
+                f"More than {SEARCH_RESULT_LIMIT} commits in {organization} at {since}, "
+                "only the first ones are counted"
+            )
+        yield from _iter_search_page(first_page)
+        for page in pages:
+            yield from _iter_search_page(page)
+
+
+def _search_commits(
+    github_connection: object,
+    organization: str,
+    since: datetime.datetime,
+    until: datetime.datetime,
+):
+    """Yield the result pages of the commit search for one slice, both ends inclusive."""
+    query = (
+        f"org:{organization} committer-date:"
+        f"{since.strftime('%Y-%m-%dT%H:%M:%SZ')}..{until.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+    )
+    url = github_connection.session.build_url("search", "commits")
+    yield from paginator.iter_json_pages(
+        github_connection.session,
+        url,
+        {"q": query, "per_page": 100},
+        rate_limit_waits=SEARCH_RATE_LIMIT_WAITS,
+    )
+
+
+def _to_utc(date: str) -> str:
+    """
+    Return a search result date in UTC, formatted like the commits endpoint.
+
+    Search results carry the UTC offset of the committer, like
+    2022-01-01T10:00:00.000-08:00, which would put the commit in the wrong
+    day and week when its date is bucketed.
+    """
+    return (
+        datetime.datetime.fromisoformat(date)
+        .astimezone(datetime.timezone.utc)
+        .strftime("%Y-%m-%dT%H:%M:%SZ")
+    )
+
+
+def _iter_search_page(page: dict):
+    """Yield the commit authors of one search result page."""
+    for item in page["items"]:
+        repo_full_name = item["repository"]["full_name"]
+        author = item["author"]
+        committed_date = _to_utc(item["commit"]["committer"]["date"])
+        if author:
+            yield repo_full_name, author["login"], author["avatar_url"], committed_date
+        else:
+            yield repo_full_name, None, None, committed_date
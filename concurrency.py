@@ -0,0 +1,211 @@
+"""This module adapts the number of concurrent API requests to how GitHub responds."""
+
+import copy
+import threading
+import time
+from urllib.parse import urlparse
+
+import resilience
+import singleflight
+from requests.adapters import HTTPAdapter
+
+# The number of requests allowed in flight when a run starts
+INITIAL_LIMIT = 4
+MIN_LIMIT = 1
+# Responses slower than this, in seconds, stop the limit from growing
+LATENCY_TARGET = 2.0
+# The limit is multiplied by this factor when GitHub throttles a request
+DECREASE_FACTOR = 0.5
+# Throttled responses arriving within this many seconds of a decrease are
+# answers to requests sent before it, so they do not decrease the limit again
+DECREASE_COOLDOWN = 5.0
+# How long to pause when a 429 response does not say how long to wait
+DEFAULT_RETRY_AFTER = 60.0
+# How many times a request is sent while GitHub keeps throttling it
+THROTTLED_ATTEMPTS = 3
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    An additive increase, multiplicative decrease (AIMD) limit on in-flight requests.
+
+    Every healthy response, fast and without a server error, raises the limit
+    by 1 / limit, so it grows by about one request per round of requests.
+    When GitHub throttles a request with a secondary rate limit, the limit is
+    halved and no new request starts until its Retry-After has passed.
+
+    Attributes:
+        max_limit (int): The highest the limit can grow to
+        limit (float): The current number of requests allowed in flight
+        metrics (dict): The "requests" made, the "throttled" responses and the
+            "peak_limit" reached during the run
+    """
+
+    def __init__(self, max_limit: int, initial_limit: int = INITIAL_LIMIT):
+        """Initialize the limiter with no request in flight"""
+        self.max_limit = max(max_limit, MIN_LIMIT)
+        self.limit = float(max(min(initial_limit, self.max_limit), MIN_LIMIT))
+        self.metrics = {"requests": 0, "throttled": 0, "peak_limit": self.limit}
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """Wait until a new request may be sent"""
+        with self._condition:
+            while True:
+                pause = self._paused_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self._in_flight < int(self.limit):
+                    break
+                else:
+                    self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, response, seconds: float = 0.0) -> bool:
+        """
+        Adjust the limit to a finished request.
+
+        Args:
+            response: The response of the request, None if it failed to connect
+            seconds (float): How long the request took until its response
+                arrived, measured by the caller since requests only sets
+                response.elapsed after the adapter returns
+
+        Returns:
+            throttled (bool): True if GitHub throttled the request
+        """
+        with self._condition:
+            self._in_flight -= 1
+            self.metrics["requests"] += 1
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                self.metrics["throttled"] += 1
+                now = time.monotonic()
+                self._paused_until = max(self._paused_until, now + retry_after)
+                if now - self._last_decrease >= DECREASE_COOLDOWN:
+                    self.limit = max(self.limit * DECREASE_FACTOR, MIN_LIMIT)
+                    self._last_decrease = now
+            elif (
+                response is not None
+                and response.status_code < 500
+                and seconds <= LATENCY_TARGET
+            ):
+                self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+                self.metrics["peak_limit"] = max(self.metrics["peak_limit"], self.limit)
+            self._condition.notify_all()
+            return retry_after is not None
+
+    def summary(self) -> str:
+        """Return the run metrics as a line of text"""
+        return (
+            f"{self.metrics['requests']} API requests, "
+            f"concurrency limit {self.limit:.1f} "
+            f"(peak {self.metrics['peak_limit']:.1f}), "
+            f"throttled {self.metrics['throttled']} times"
+        )
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """
+    A connection pool that sends each request only when its limiter allows it.
+
+    With flights set, identical GET requests share one response: a request
+    arriving while the same one is in flight waits for its response, and
+    successful responses are reused for the rest of the run without a new
+    round trip. Requests are identical when their method, url, Accept and
+    Authorization headers match, so a response is only reused for the same
+    credential and media type.
+
+    Attributes:
+        limiter (AdaptiveConcurrencyLimiter): The limit shared by every
+            session mounting this adapter
+        breaker (CircuitBreaker): Pauses the requests to hosts that keep failing
+        flights (SingleFlight | None): Coalesces and memoizes identical requests
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        breaker: resilience.CircuitBreaker | None = None,
+        flights: singleflight.SingleFlight | None = None,
+        **kwargs,
+    ):
+        """Initialize the adapter with the limiter gating its requests"""
+        self.limiter = limiter
+        self.breaker = breaker or resilience.CircuitBreaker()
+        self.flights = flights
+        super().__init__(**kwargs)
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=arguments-differ
+        """Send a request, or share the response of an identical one"""
+        if (
+            self.flights is None
+            or request.method not in ("GET", "HEAD")
+            or kwargs.get("stream")
+        ):
+            return self._send(request, *args, **kwargs)
+
+        def send_and_read():
+            response = self._send(request, *args, **kwargs)
+            # Read the body now so every caller can get it from the response
+            response.content  # pylint: disable=pointless-statement
+            return response
+
+        key = (
+            request.method,
+            request.url,
+            request.headers.get("Accept"),
+            request.headers.get("Authorization"),
+        )
+        response, shared = self.flights.do(
+            key, send_and_read, lambda response: response.status_code == 200
+        )
+        # Callers, and the hooks run on their behalf, get their own copy
+        return copy.copy(response) if shared else response
+
+    def _send(self, request, *args, **kwargs):
+        """
+        Send a request once the host and the limiter allow it and report how it went.
+
+        urllib3 retries connection failures and server errors but leaves
+        throttled responses alone, so every one of them reaches the limiter.
+        A throttled request is sent again once the limiter's pause is over.
+        """
+        host = urlparse(request.url).netloc
+        for attempt in range(1, THROTTLED_ATTEMPTS + 1):
+            self.breaker.wait(host)
+            self.limiter.acquire()
+            response = None
+            started = time.monotonic()
+            try:
+                response = super().send(request, *args, **kwargs)
+            finally:
+                throttled = self.limiter.release(response, time.monotonic() - started)
+                # Retries have been exhausted by now, so this is a real failure
+                self.breaker.record(
+                    host, response is None or response.status_code >= 500
+                )
+            if not throttled or attempt == THROTTLED_ATTEMPTS:
+                break
+            response.close()
+        return response
+
+
+def _retry_after(response) -> float | None:
+    """
+    Return how long to pause after a throttled response, None if it was not throttled.
+
+    A 403 only counts as throttled when it carries a Retry-After header, the
+    mark of a secondary rate limit; other 403s are permission errors.
+    """
+    if response is None or response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is not None and retry_after.strip().isdigit():
+        return float(retry_after)
+    if response.status_code == 429:
+        return DEFAULT_RETRY_AFTER
+    return None
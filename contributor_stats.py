@@ -12,12 +12,20 @@
 # ]
 
 
-from typing import List
+import functools
+import time
+from typing import Callable, List
 
+import enrichment
 import requests
+import resilience
+import transport
 
+# How many times a sponsor information query is sent before giving up
+SPONSOR_ATTEMPTS = 3
 
-class ContributorStats:
+
+class ContributorStats:  # pylint: disable=too-many-instance-attributes
     """
     A class to represent a contributor_stats object correlating to a single contributors stats.
 
@@ -28,6 +36,10 @@ class ContributorStats:
         contribution_count (int): The number of contributions the contributor has made
         commit_url (str): The url of the contributor's commits
         sponsor_info (str): The url of the contributor's sponsor page
+        weekly_commits (list | None): The commits of the contributor in each
+            week of the date range, oldest first, None without a date range
+        repository_counts (dict | None): Maps the "owner/name" of each
+            repository the contributor contributed to to their contributions
 
     """
 
@@ -43,6 +55,8 @@ class ContributorStats:
         contribution_count: int,
         commit_url: str,
         sponsor_info: str,
+        weekly_commits: list | None = None,
+        repository_counts: dict | None = None,
     ):
         """Initialize the contributor_stats object"""
         new_contributor = False
@@ -52,6 +66,8 @@ class ContributorStats:
         self.contribution_count = contribution_count
         self.commit_url = commit_url
         self.sponsor_info = sponsor_info
+        self.weekly_commits = weekly_commits
+        self.repository_counts = repository_counts
 
     def __repr__(self) -> str:
         """Return the representation of the contributor_stats object"""
@@ -103,46 +119,121 @@ def merge_contributors(contributors: list) -> list:
         merged_contributors (list): A list of ContributorStats objects with no duplicate usernames
     """
     merged_contributors: List[ContributorStats] = []
+    # Find the merged contributor of a username without scanning the list
+    merged_by_username: dict = {}
     for contributor_list in contributors:
         for contributor in contributor_list:
+            merged_contributor = merged_by_username.get(contributor.username)
             # if the contributor is already in the merged list, merge their relevant attributes
-            if contributor.username in [c.username for c in merged_contributors]:
-                for merged_contributor in merged_contributors:
-                    if merged_contributor.username == contributor.username:
-                        # Merge the contribution counts via addition
-                        merged_contributor.contribution_count += (
-                            contributor.contribution_count
-                        )
-                        # Merge the commit urls via concatenation
-                        merged_contributor.commit_url = (
-                            f"{merged_contributor.commit_url}, {contributor.commit_url}"
-                        )
-                        # Merge the new_contributor attribute via OR
-                        merged_contributor.new_contributor = (
-                            merged_contributor.new_contributor
-                            or contributor.new_contributor
+            if merged_contributor is not None:
+                # Merge the contribution counts via addition
+                merged_contributor.contribution_count += contributor.contribution_count
+                # Merge the commit urls via concatenation
+                merged_contributor.commit_url = (
+                    f"{merged_contributor.commit_url}, {contributor.commit_url}"
+                )
+                # Merge the weekly commits of the same date range week by week
+                if contributor.weekly_commits is not None:
+                    merged_contributor.weekly_commits = [
+                        merged + count
+                        for merged, count in zip(
+                            merged_contributor.weekly_commits
+                            or [0] * len(contributor.weekly_commits),
+                            contributor.weekly_commits,
                         )
+                    ]
+                # Merge the counts of each repository via addition
+                if contributor.repository_counts:
+                    repository_counts = dict(merged_contributor.repository_counts or {})
+                    for name, count in contributor.repository_counts.items():
+                        repository_counts[name] = repository_counts.get(name, 0) + count
+                    merged_contributor.repository_counts = repository_counts
+                # Merge the new_contributor attribute via OR
+                merged_contributor.new_contributor = (
+                    merged_contributor.new_contributor or contributor.new_contributor
+                )
 
             else:
                 merged_contributors.append(contributor)
+                merged_by_username[contributor.username] = contributor
 
     return merged_contributors
 
 
-def get_sponsor_information(contributors: list, token: str, ghe: str) -> list:
+def get_sponsor_information(
+    contributors: list,
+    token: str | Callable[[], str | None],
+    ghe: str,
+    enricher: enrichment.Enricher | None = None,
+) -> list:
     """
     Get the sponsor information for each contributor
 
+    Failed lookups are retried with backoff. A contributor whose lookup still
+    fails keeps an empty sponsor_info and is reported at the end, instead of
+    aborting the whole run.
+
     Args:
         contributors (list): A list of ContributorStats objects
-        github_connection (object): The authenticated GitHub connection object from PyGithub
+        token (str | Callable): The GitHub token, or a function returning a
+            current token for credentials that expire during the run
+        ghe (str): The GitHub Enterprise URL, if applicable.
+        enricher (Enricher): Looks up the sponsors listings concurrently,
+            possibly already started while the repositories were fetched.
+            Each contributor is looked up in turn when None.
 
     Returns:
         contributors (list): A list of ContributorStats objects with sponsor information
     """
+    lookup: Callable[[str], object] = sponsors_listing_lookup(token, ghe)
+    if enricher:
+        enricher.submit(contributor.username for contributor in contributors)
+        lookup = enricher.result
+
+    failed = []
     for contributor in contributors:
-        # query the graphql api for the user's sponsor information
-        query = """
+        has_sponsors_listing = lookup(contributor.username)
+        if has_sponsors_listing is None:
+            failed.append(contributor.username)
+            continue
+
+        endpoint = ghe if ghe else "https://github.com"
+        # if the user has a sponsor page, add it to the contributor object
+        if has_sponsors_listing:
+            contributor.sponsor_info = f"{endpoint}/sponsors/{contributor.username}"
+
+    if failed:
+        print(
+            f"::warning::Could not get the sponsor information of {len(failed)} "
+            f"contributors: {', '.join(failed)}"
+        )
+    return contributors
+
+
+def sponsors_listing_lookup(
+    token: str | Callable[[], str | None], ghe: str
+) -> Callable[[str], bool | None]:
+    """
+    Return a function asking if a login has a sponsors listing.
+
+    Args:
+        token (str | Callable): The GitHub token, or a function returning a
+            current token
+        ghe (str): The GitHub Enterprise URL, if applicable.
+
+    Returns:
+        lookup (Callable): Returns True or False for a login, None if the
+            query keeps failing
+    """
+    return functools.partial(_query_sponsors_listing, token=token, ghe=ghe)
+
+
+def _query_sponsors_listing(
+    username: str, token: str | Callable[[], str | None], ghe: str
+) -> bool | None:
+    """Ask the GraphQL API if a user has a sponsors listing, None if it keeps failing"""
+    # query the graphql api for the user's sponsor information
+    query = """
         query($username: String!){
             repositoryOwner(login: $username) {
                 ... on User {
@@ -151,27 +242,34 @@ def get_sponsor_information(contributors: list, token: str, ghe: str) -> list:
             }
         }
         """
-        variables = {"username": contributor.username}
-
-        # Send the GraphQL request
-        api_endpoint = f"{ghe}/api/v3" if ghe else "https://api.github.com"
-        headers = {"Authorization": f"Bearer {token}"}
-        response = requests.post(
-            f"{api_endpoint}/graphql",
-            json={"query": query, "variables": variables},
-            headers=headers,
-            timeout=60,
-        )
-
-        # Check for errors in the GraphQL response
-        if response.status_code != 200 or "errors" in response.json():
-            raise ValueError("GraphQL query failed")
-
-        data = response.json()["data"]
+    variables = {"username": username}
+    api_endpoint = f"{ghe}/api/v3" if ghe else "https://api.github.com"
 
-        endpoint = ghe if ghe else "https://github.com"
-        # if the user has a sponsor page, add it to the contributor object
-        if data["repositoryOwner"]["hasSponsorsListing"]:
-            contributor.sponsor_info = f"{endpoint}/sponsors/{contributor.username}"
+    # The query only reads data, so it is safe to send again
+    for attempt in range(SPONSOR_ATTEMPTS):
+        if attempt:
+            time.sleep(resilience.backoff_delay(attempt))
+        headers = {"Authorization": f"Bearer {token() if callable(token) else token}"}
+        try:
+            response = transport.session().post(
+                f"{api_endpoint}/graphql",
+                json={"query": query, "variables": variables},
+                headers=headers,
+                timeout=transport.TIMEOUT,
+            )
+        except requests.exceptions.RequestException as e:
+            print(f"Sponsor information request for {username} failed: {e}")
+            continue
 
-    return contributors
+        # Check for errors in the GraphQL response
+        if response.status_code == 200 and "errors" not in response.json():
+            owner = response.json()["data"]["repositoryOwner"] or {}
+            return bool(owner.get("hasSponsorsListing"))
+        print(
+            f"Sponsor information query for {username} failed "
+            f"with status {response.status_code}"
+        )
+        # Only server errors and rate limits are worth another try
+        if response.status_code < 500 and response.status_code not in (403, 429):
+            break
+    return None
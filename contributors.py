@@ -1,13 +1,62 @@
-# pylint: disable=broad-exception-caught
+# pylint: disable=broad-exception-caught, too-many-lines
 """This file contains the main() and other functions needed to get contributor information from the organization or repository"""
 
+import datetime
+import functools
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List
 
+import analytics
 import auth
+import cache
+import checkpoint
+import commit_search
 import contributor_stats
+import csv_writer
+import enrichment
 import env
+import events
+import github3
+import history
 import json_writer
 import markdown
+import matrix
+import parquet_writer
+import repository
+import resilience
+import scheduler
+import shard
+import snapshot
+import transport
+
+# A date window yielding more commits than this is considered heavy and is
+# re-fetched as concurrent time slices instead of one sequential iterator.
+SLICE_PROBE_COMMITS = 1000
+# The pages of 100 commits the probe reads, past which nothing is prefetched
+SLICE_PROBE_PAGES = SLICE_PROBE_COMMITS // 100 + 1
+# Roughly how many commits each time slice should contain.
+SLICE_TARGET_COMMITS = 1000
+# Slices never get shorter than this, however dense the history is.
+SLICE_MIN_SECONDS = 3600
+SLICE_WORKERS = 4
+# The ways to list the all-time contributors of a repository, cheapest first
+CONTRIBUTORS_STRATEGY = "contributors"
+STATS_STRATEGY = "stats"
+COMMITS_STRATEGY = "commits"
+# The strategy that works for each repository, kept in the cache directory
+STRATEGIES_FILENAME = "contributor_strategies.json"
+# How often the contributor statistics are requested while GitHub computes them
+STATS_ATTEMPTS = 4
+STATS_RETRY_SECONDS = 5
+# How many repositories are fetched at the same time. Their requests are
+# further limited by the adaptive concurrency limit of the transport.
+REPO_WORKERS = 8
+# How many times a failing repository is fetched before it is reported missing
+REPO_ATTEMPTS = 2
 
 
 def main():
@@ -29,8 +78,44 @@ def main():
         link_to_profile,
         output_filename,
         show_avatar,
+        use_commit_search,
+        http_pool_size,
+        checkpoint_dir,
+        shard_index,
+        shard_count,
+        shard_reduce,
+        cache_dir,
+        history_db,
+        date_windows,
+        time_series,
+        contributor_analytics,
+        matrix_export_dir,
+        output_formats,
+        event_log_path,
+        previous_json,
     ) = env.get_env_vars()
 
+    # Fail before fetching anything when a requested output cannot be written
+    if "parquet" in output_formats:
+        parquet_writer.require_pyarrow()
+
+    # Share one connection pool between github3 and the raw API requests
+    transport.configure(http_pool_size)
+
+    # A GitHub App mints one installation token that github3 and the GraphQL
+    # requests share, refreshed shortly before it expires
+    token_manager = None
+    if gh_app_id and gh_app_installation_id and gh_app_private_key:
+        token_manager = auth.AppInstallationTokenManager(
+            ghe if gh_app_enterprise_only else "",
+            gh_app_id,
+            gh_app_private_key,
+            gh_app_installation_id,
+        )
+    elif "," in token:
+        # Several tokens are pooled and spread by their remaining rate limit
+        token_manager = auth.CredentialPool(token.split(","))
+
     # Auth to GitHub.com
     github_connection = auth.auth_to_github(
         token,
@@ -39,45 +124,213 @@ def main():
         gh_app_private_key,
         ghe,
         gh_app_enterprise_only,
+        token_manager,
     )
 
-    if not token and gh_app_id and gh_app_installation_id and gh_app_private_key:
-        token = auth.get_github_app_installation_token(
-            ghe, gh_app_id, gh_app_private_key, gh_app_installation_id
+    # The GraphQL requests ask the manager for a current token each time
+    graphql_token = token
+    if token_manager and (not token or "," in token):
+        graphql_token = token_manager.token
+
+    # Sponsor information is looked up while the repositories are fetched,
+    # except by shards, whose reduce step looks it up once for all of them
+    enricher = None
+    if sponsor_info in (True, "true") and (shard_reduce or not shard_count):
+        enricher = enrichment.Enricher(
+            contributor_stats.sponsors_listing_lookup(graphql_token, ghe)
         )
 
-    # Get the contributors
-    contributors = get_all_contributors(
-        organization, repository_list, start_date, end_date, github_connection, ghe
-    )
+    # Several windows share one history store, so each commit is fetched
+    # once and every window after the first is mostly counted locally
+    windows = date_windows or [(start_date, end_date)]
+    history_dir = None
+    settle_margin = history.SETTLE_MARGIN
+    if len(windows) > 1 and not history_db:
+        history_dir = tempfile.mkdtemp()
+        history_db = os.path.join(history_dir, "history.db")
+        # Nothing is pushed during the run, so its own store covers up to now
+        settle_margin = datetime.timedelta(0)
+
+    for start_date, end_date in windows:
+        event_log = None
+        if event_log_path and not shard_reduce:
+            event_log = events.EventLog(
+                (
+                    window_filename(event_log_path, start_date, end_date)
+                    if len(windows) > 1
+                    else event_log_path
+                ),
+                {
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "organization": organization,
+                    "repository_list": repository_list,
+                    "ghe": ghe,
+                },
+            )
+
+        if shard_reduce:
+            # Combine the partial results written by every shard of the run
+            contributors, returning_contributors = shard.read_partials(".", shard_count)
+        else:
+            # Get the contributors
+            contributors = get_all_contributors(
+                organization,
+                repository_list,
+                start_date,
+                end_date,
+                github_connection,
+                ghe,
+                use_commit_search,
+                checkpoint_dir,
+                shard_index,
+                shard_count,
+                cache_dir,
+                enricher,
+                history_db,
+                event_log,
+                history_settle_margin=settle_margin,
+            )
+
+            returning_contributors = []
+            if start_date and end_date:
+                # get the list of contributors from before start_date
+                # so we can see if contributors after start_date are new or returning
+                returning_contributors = get_all_contributors(
+                    organization,
+                    repository_list,
+                    start_date="2008-02-29",  # GitHub was founded on 2008-02-29
+                    end_date=start_date,
+                    github_connection=github_connection,
+                    ghe=ghe,
+                    # Searching all the years before the window would take
+                    # more slices than the search rate limit allows quickly
+                    use_commit_search=False,
+                    checkpoint_dir=checkpoint_dir,
+                    shard_index=shard_index,
+                    shard_count=shard_count,
+                    cache_dir=cache_dir,
+                    history_db=history_db,
+                    event_log=event_log,
+                    history_settle_margin=settle_margin,
+                )
+            if event_log:
+                event_log.close()
 
-    # Check for new contributor if user provided start_date and end_date
-    if start_date and end_date:
-        # get the list of contributors from before start_date
-        # so we can see if contributors after start_date are new or returning
-        returning_contributors = get_all_contributors(
+            if shard_count:
+                # The reduce step renders the report once every shard is done
+                filename = shard.write_partial(
+                    shard_index, contributors, returning_contributors
+                )
+                print(f"Wrote the partial result of shard {shard_index} to {filename}")
+                print(f"Run metrics: {transport.summary()}")
+                return
+
+        # Check for new contributor if user provided start_date and end_date
+        if start_date and end_date:
+            for contributor in contributors:
+                contributor.new_contributor = contributor_stats.is_new_contributor(
+                    contributor.username, returning_contributors
+                )
+
+        # Get sponsor information on the contributor
+        if enricher:
+            contributors = contributor_stats.get_sponsor_information(
+                contributors, graphql_token, ghe, enricher
+            )
+
+        # Let downstream jobs load who contributed to which repository
+        if matrix_export_dir:
+            matrix_dir = matrix_export_dir
+            if len(windows) > 1:
+                matrix_dir = os.path.join(matrix_export_dir, f"{start_date}-{end_date}")
+            matrix.write_matrix(matrix_dir, contributors)
+
+        # Output the contributors information
+        # print(contributors)
+        markdown_filename, json_filename = output_filename, "contributors.json"
+        if len(windows) > 1:
+            markdown_filename = window_filename(output_filename, start_date, end_date)
+            json_filename = window_filename(json_filename, start_date, end_date)
+        write_reports(
+            contributors,
+            markdown_filename,
+            json_filename,
+            start_date,
+            end_date,
             organization,
             repository_list,
-            start_date="2008-02-29",  # GitHub was founded on 2008-02-29
-            end_date=start_date,
-            github_connection=github_connection,
-            ghe=ghe,
-        )
-        for contributor in contributors:
-            contributor.new_contributor = contributor_stats.is_new_contributor(
-                contributor.username, returning_contributors
-            )
+            sponsor_info,
+            link_to_profile,
+            ghe,
+            show_avatar,
+            time_series,
+            contributor_analytics,
+            output_formats,
+            previous_json,
+        )
+
+    if enricher:
+        enricher.close()
+    if history_dir:
+        shutil.rmtree(history_dir)
+    print(f"Run metrics: {transport.summary()}")
+
+
+def write_reports(
+    contributors: list,
+    markdown_filename: str,
+    json_filename: str,
+    start_date: str,
+    end_date: str,
+    organization: str,
+    repository_list: List[str],
+    sponsor_info: bool,
+    link_to_profile: bool,
+    ghe: str,
+    show_avatar: bool,
+    time_series: bool,
+    contributor_analytics: bool,
+    output_formats: List[str],
+    previous_json: str = "",
+) -> None:
+    """
+    Write the markdown and JSON reports and the requested tables of the contributors.
+
+    Args:
+        contributors (list): The merged ContributorStats objects to report on
+        markdown_filename (str): The name of the markdown report
+        json_filename (str): The name of the JSON report, which the tables
+            of output_formats are named after
+        start_date (str): The start date of the date range for the contributor list.
+        end_date (str): The end date of the date range for the contributor list.
+        organization (str): The organization for which the contributors are being listed.
+        repository_list (List[str]): The repository list for which the contributors are being listed.
+        sponsor_info (bool): Whether to show the sponsor information of the contributors.
+        link_to_profile (bool): Whether to link the usernames to their profiles.
+        ghe (str): The GitHub Enterprise URL, if applicable.
+        show_avatar (bool): Whether to show profile images in the markdown report.
+        time_series (bool): Whether to add the weekly commits of each contributor.
+        contributor_analytics (bool): Whether to add concentration statistics.
+        output_formats (List[str]): The formats to also write the contributors in.
+        previous_json (str): A JSON report of an earlier run to report the
+            changes since, if any.
+    """
+    # Concentration statistics over the contributors, for both outputs
+    contributor_summary = None
+    if contributor_analytics:
+        contributor_summary = analytics.summarize(contributors)
 
-    # Get sponsor information on the contributor
-    if sponsor_info == "true":
-        contributors = contributor_stats.get_sponsor_information(
-            contributors, token, ghe
+    # Read the previous report first, since it may be about to be overwritten
+    delta = None
+    if previous_json:
+        delta = snapshot.diff(
+            snapshot.load_previous_counts(previous_json), contributors
         )
-    # Output the contributors information
-    # print(contributors)
+
     markdown.write_to_markdown(
         contributors,
-        output_filename,
+        markdown_filename,
         start_date,
         end_date,
         organization,
@@ -86,9 +339,12 @@ def main():
         link_to_profile,
         ghe,
         show_avatar,
+        time_series,
+        contributor_summary,
+        delta,
     )
     json_writer.write_to_json(
-        filename="contributors.json",
+        filename=json_filename,
         start_date=start_date,
         end_date=end_date,
         organization=organization,
@@ -96,7 +352,42 @@ def main():
         sponsor_info=sponsor_info,
         link_to_profile=link_to_profile,
         contributors=contributors,
+        time_series=time_series,
+        analytics=contributor_summary,
     )
+    table_root = os.path.splitext(json_filename)[0]
+    if delta is not None:
+        json_writer.write_delta_to_json(
+            delta, f"{table_root}-delta.json", previous_json
+        )
+    # The same contributors as flat tables for analytics tools
+    if "csv" in output_formats:
+        csv_writer.write_to_csv(
+            contributors, f"{table_root}.csv", f"{table_root}-repositories.csv"
+        )
+    if "parquet" in output_formats:
+        parquet_writer.write_to_parquet(
+            contributors,
+            f"{table_root}.parquet",
+            f"{table_root}-repositories.parquet",
+        )
+
+
+def window_filename(filename: str, start_date: str, end_date: str) -> str:
+    """
+    Return the name of an output file for one of several date windows.
+
+    Args:
+        filename (str): The output file name of a single window report
+        start_date (str): The start date of the window
+        end_date (str): The end date of the window
+
+    Returns:
+        str: The file name with the window inserted before its extension,
+            like contributors-2024-01-01-2024-03-31.md
+    """
+    root, extension = os.path.splitext(filename)
+    return f"{root}-{start_date}-{end_date}{extension}"
 
 
 def get_all_contributors(
@@ -106,6 +397,15 @@ def get_all_contributors(
     end_date: str,
     github_connection: object,
     ghe: str,
+    use_commit_search: bool = False,
+    checkpoint_dir: str = "",
+    shard_index: int | None = None,
+    shard_count: int | None = None,
+    cache_dir: str = "",
+    enricher: enrichment.Enricher | None = None,
+    history_db: str = "",
+    event_log: events.EventLog | None = None,
+    history_settle_margin: datetime.timedelta = history.SETTLE_MARGIN,
 ):
     """
     Get all contributors from the organization or repository
@@ -116,26 +416,131 @@ def get_all_contributors(
         start_date (str): The start date of the date range for the contributor list.
         end_date (str): The end date of the date range for the contributor list.
         github_connection (object): The authenticated GitHub connection object from PyGithub
+        ghe (str): The GitHub Enterprise URL, if applicable.
+        use_commit_search (bool): Count the commits of the organization with the
+            commit search API instead of scanning each repository.
+        checkpoint_dir (str): Save the progress of each repository in this
+            directory and resume a previous run with the same parameters.
+        shard_index (int): Only get the repositories of this shard.
+        shard_count (int): The number of shards the repositories are split into.
+        cache_dir (str): Keep the commit counts of each repository in this
+            directory, to fetch the most expensive ones first next time.
+        enricher (Enricher): Receives the logins of each repository as soon
+            as it is fetched, to look them up in the background.
+        history_db (str): Keep the fetched commits in this SQLite database and
+            only fetch the parts of the date range it does not hold yet.
+        event_log (EventLog): Logs the commit authors of each repository, to
+            build the reports again offline.
+        history_settle_margin (timedelta): How much of the recent past the
+            history store fetches again on the next run.
 
     Returns:
         all_contributors (list): A list of ContributorStats objects
     """
+    # Commit search covers the whole organization at once, so it is not sharded
+    if (
+        use_commit_search
+        and organization
+        and start_date
+        and end_date
+        and not shard_count
+    ):
+        repo_contributors = search_contributors(
+            organization, start_date, end_date, github_connection, ghe
+        )
+        if event_log:
+            event_log.record(start_date, end_date, repo_contributors)
+        all_contributors = contributor_stats.merge_contributors(repo_contributors)
+        if enricher:
+            enricher.submit(contributor.username for contributor in all_contributors)
+        return all_contributors
+
     repos = []
     if organization:
-        repos = github_connection.organization(organization).repositories()
+        repos = [
+            repository.RepositoryHandle(github_connection, repo.full_name, repo)
+            for repo in github_connection.organization(organization).repositories()
+        ]
     else:
-        repos = []
-        for repo in repository_list:
-            owner, repo_name = repo.split("/")
-            repository_obj = github_connection.repository(owner, repo_name)
-            repos.append(repository_obj)
+        # The names are already known, so skip requesting each repository
+        repos = [
+            repository.RepositoryHandle(github_connection, repo)
+            for repo in repository_list
+        ]
+    if shard_count:
+        repos = [
+            repo
+            for repo in repos
+            if shard.in_shard(repo.full_name, shard_index or 0, shard_count)
+        ]
+
+    progress = None
+    if checkpoint_dir:
+        progress = checkpoint.Checkpoint(
+            checkpoint_dir, organization, repository_list, start_date, end_date
+        )
+    store = (
+        history.HistoryStore(history_db, history_settle_margin) if history_db else None
+    )
+
+    # The biggest repositories start first so they do not finish last
+    costs = scheduler.load_costs(cache_dir)
+    strategies = cache.load(cache_dir, STRATEGIES_FILENAME)
+    futures = {}
+    with ThreadPoolExecutor(max_workers=REPO_WORKERS) as executor:
+        for repo in scheduler.order_by_cost(repos, costs):
+            futures[repo.full_name] = executor.submit(
+                _get_repo_contributors,
+                repo,
+                start_date,
+                end_date,
+                ghe,
+                progress,
+                strategies,
+                enricher,
+                store,
+            )
+
+    results = {name: future.result() for name, future in futures.items()}
+
+    # Failed repositories are tried again once the others are done, giving a
+    # struggling host time to recover, and are never dropped silently
+    failed = [repo for repo in repos if results[repo.full_name] is None]
+    for attempt in range(1, REPO_ATTEMPTS):
+        if not failed:
+            break
+        time.sleep(resilience.backoff_delay(attempt))
+        for repo in failed:
+            results[repo.full_name] = _get_repo_contributors(
+                repo, start_date, end_date, ghe, progress, strategies, enricher, store
+            )
+        failed = [repo for repo in failed if results[repo.full_name] is None]
+    if failed:
+        print(
+            f"::warning::The contributors of {len(failed)} repositories are missing "
+            f"from the report: {', '.join(repo.full_name for repo in failed)}"
+        )
+    elif progress:
+        # Nothing is left to resume, and a later run must not reuse stale results
+        progress.remove()
 
     all_contributors = []
-    if repos:
-        for repo in repos:
-            repo_contributors = get_contributors(repo, start_date, end_date, ghe)
-            if repo_contributors:
-                all_contributors.append(repo_contributors)
+    for repo in repos:
+        repo_contributors = results[repo.full_name]
+        if repo_contributors is not None:
+            costs[repo.full_name] = sum(
+                contributor.contribution_count for contributor in repo_contributors
+            )
+        if repo_contributors:
+            all_contributors.append(repo_contributors)
+    scheduler.save_costs(cache_dir, costs)
+    cache.save(cache_dir, STRATEGIES_FILENAME, strategies)
+    if store:
+        store.close()
+
+    # Merging adds up into the first contributor of each username, so log first
+    if event_log:
+        event_log.record(start_date, end_date, all_contributors)
 
     # Check for duplicates and merge when usernames are equal
     all_contributors = contributor_stats.merge_contributors(all_contributors)
@@ -143,7 +548,40 @@ def get_all_contributors(
     return all_contributors
 
 
-def get_contributors(repo: object, start_date: str, end_date: str, ghe: str):
+def _get_repo_contributors(
+    repo: object,
+    start_date: str,
+    end_date: str,
+    ghe: str,
+    progress: checkpoint.Checkpoint | None,
+    strategies: dict,
+    enricher: enrichment.Enricher | None = None,
+    store: history.HistoryStore | None = None,
+):
+    """Get the contributors of a repository, from the checkpoint if it is already finished."""
+    repo_contributors = None
+    if progress:
+        repo_contributors = progress.load_contributors(repo.full_name)
+    if repo_contributors is None:
+        repo_contributors = get_contributors(
+            repo, start_date, end_date, ghe, progress, strategies, store
+        )
+        if progress and repo_contributors is not None:
+            progress.save_contributors(repo.full_name, repo_contributors)
+    if enricher and repo_contributors:
+        enricher.submit(contributor.username for contributor in repo_contributors)
+    return repo_contributors
+
+
+def get_contributors(
+    repo: object,
+    start_date: str,
+    end_date: str,
+    ghe: str,
+    progress: checkpoint.Checkpoint | None = None,
+    strategies: dict | None = None,
+    store: history.HistoryStore | None = None,
+):
     """
     Get contributors from a single repository and filter by start end dates if present.
 
@@ -151,9 +589,15 @@ def get_contributors(repo: object, start_date: str, end_date: str, ghe: str):
         repo (object): The repository object from PyGithub
         start_date (str): The start date of the date range for the contributor list.
         end_date (str): The end date of the date range for the contributor list.
+        progress (Checkpoint): Where finished time slices are saved, if anywhere.
+        strategies (dict): The way each repository lists its all-time
+            contributors, see get_all_time_contributors.
+        store (HistoryStore): Where fetched commits are kept, if anywhere.
 
     Returns:
-        contributors (list): A list of ContributorStats objects
+        contributors (list): A list of ContributorStats objects, empty when
+            GitHub refuses the repository for good (it is empty, missing or
+            unavailable), None when fetching it failed and may be retried
     """
     contributors = []
     endpoint = ghe if ghe else "https://github.com"
@@ -163,46 +607,34 @@ def get_contributors(repo: object, start_date: str, end_date: str, ghe: str):
             # This is much more efficient than iterating all-time contributors
             # and checking each one for commits, which causes rate limiting
             # on large repositories.
-            contributor_data = {}
-            for commit in repo.commits(since=start_date, until=end_date):
-                if commit.author is None:
-                    continue
-                login = commit.author.login
-                if "[bot]" in login:
-                    continue
-                if login not in contributor_data:
-                    contributor_data[login] = {
-                        "avatar_url": commit.author.avatar_url,
-                        "contribution_count": 0,
-                    }
-                contributor_data[login]["contribution_count"] += 1
-
-            for username, data in contributor_data.items():
-                commit_url = f"{endpoint}/{repo.full_name}/commits?author={username}&since={start_date}&until={end_date}"
-                contributor = contributor_stats.ContributorStats(
-                    username,
-                    False,
-                    data["avatar_url"],
-                    data["contribution_count"],
-                    commit_url,
-                    "",
-                )
-                contributors.append(contributor)
+            contributor_data = get_commit_authors(
+                repo, start_date, end_date, progress, store
+            )
+            contributors = build_contributors(
+                repo.full_name, contributor_data, start_date, end_date, ghe
+            )
         else:
-            for user in repo.contributors():
-                if "[bot]" in user.login:
+            for login, avatar_url, contributions_count in get_all_time_contributors(
+                repo, strategies if strategies is not None else {}, store
+            ):
+                if "[bot]" in login:
                     continue
-                commit_url = f"{endpoint}/{repo.full_name}/commits?author={user.login}"
+                commit_url = f"{endpoint}/{repo.full_name}/commits?author={login}"
                 contributor = contributor_stats.ContributorStats(
-                    user.login,
+                    login,
                     False,
-                    user.avatar_url,
-                    user.contributions_count,
+                    avatar_url,
+                    contributions_count,
                     commit_url,
                     "",
+                    repository_counts={repo.full_name: contributions_count},
                 )
                 contributors.append(contributor)
     except Exception as e:
+        if not _is_transient(e):
+            # Retrying will not help an empty, missing or blocked repository
+            print(f"Skipping repository {repo.full_name}: {e}")
+            return []
         print(f"Error getting contributors for repository: {repo.full_name}")
         print(e)
         return None
@@ -210,5 +642,485 @@ def get_contributors(repo: object, start_date: str, end_date: str, ghe: str):
     return contributors
 
 
+def _is_transient(error: Exception) -> bool:
+    """Return whether retrying may help: a server error, a connection failure or throttling."""
+    if not isinstance(error, github3.exceptions.ResponseError):
+        return True
+    if error.code >= 500 or error.code == 429:
+        return True
+    headers = error.response.headers
+    return error.code == 403 and (
+        "Retry-After" in headers or headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def get_all_time_contributors(
+    repo: object, strategies: dict, store: history.HistoryStore | None = None
+) -> list:
+    """
+    List the all-time contributors of a repository and their commit counts.
+
+    The contributors endpoint refuses repositories whose history is too
+    large, with a 403 or an empty list. Those fall back to the contributor
+    statistics and, when GitHub cannot compute them either, to a concurrent
+    scan of every commit. The fallback that worked is recorded in
+    strategies so later runs go straight to it.
+
+    Args:
+        repo (object): The repository object from PyGithub
+        strategies (dict): Maps "owner/name" to CONTRIBUTORS_STRATEGY,
+            STATS_STRATEGY or COMMITS_STRATEGY, updated in place
+        store (HistoryStore): Where the scanned commits are kept, if anywhere
+
+    Returns:
+        contributors (list): (login, avatar_url, contributions_count) tuples
+    """
+    strategy = strategies.get(repo.full_name, CONTRIBUTORS_STRATEGY)
+    contributors = None
+    if strategy == CONTRIBUTORS_STRATEGY:
+        contributors = _list_contributors(repo)
+        if contributors is None:
+            strategy = STATS_STRATEGY
+    if strategy == STATS_STRATEGY:
+        contributors = _contributor_statistics(repo)
+        if contributors is None:
+            strategy = COMMITS_STRATEGY
+    if strategy == COMMITS_STRATEGY:
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        contributor_data = get_commit_authors(
+            repo,
+            "2008-02-29",  # GitHub was founded on 2008-02-29
+            tomorrow.isoformat(),
+            store=store,
+        )
+        contributors = [
+            (login, data["avatar_url"], data["contribution_count"])
+            for login, data in contributor_data.items()
+        ]
+
+    if contributors and strategy != strategies.get(
+        repo.full_name, CONTRIBUTORS_STRATEGY
+    ):
+        print(
+            f"Listing the contributors of {repo.full_name} with {strategy} from now on"
+        )
+        strategies[repo.full_name] = strategy
+    return contributors or []
+
+
+def _list_contributors(repo: object) -> list | None:
+    """List the contributors endpoint, None when it refuses the repository."""
+    try:
+        contributors = [
+            (user.login, user.avatar_url, user.contributions_count)
+            for user in repo.contributors()
+        ]
+    except github3.exceptions.ForbiddenError as e:
+        if "too large" not in str(e):
+            raise
+        return None
+    # Only repository handles can tell an empty history from a refused one
+    if not contributors and isinstance(repo, repository.RepositoryHandle):
+        return None
+    return contributors
+
+
+def _contributor_statistics(repo: object) -> list | None:
+    """
+    Read the contributor statistics, None when GitHub does not compute them in time.
+
+    The statistics only cover the STATS_MAX_AUTHORS busiest authors, so a
+    repository that reaches that many is left to the commit scan as well.
+    """
+    if not isinstance(repo, repository.RepositoryHandle):
+        return None
+    for attempt in range(STATS_ATTEMPTS):
+        if attempt:
+            time.sleep(STATS_RETRY_SECONDS)
+        contributors = repo.contributor_statistics()
+        if contributors is not None:
+            if len(contributors) >= repository.STATS_MAX_AUTHORS:
+                return None
+            return contributors
+    return None
+
+
+def search_contributors(
+    organization: str,
+    start_date: str,
+    end_date: str,
+    github_connection: object,
+    ghe: str,
+) -> list:
+    """
+    Get the contributors of every repository of an organization from commit search.
+
+    Args:
+        organization (str): The organization for which the contributors are being listed.
+        start_date (str): The start date of the date range for the contributor list.
+        end_date (str): The end date of the date range for the contributor list.
+        github_connection (object): The authenticated GitHub connection object from PyGithub
+        ghe (str): The GitHub Enterprise URL, if applicable.
+
+    Returns:
+        repo_contributors (list): A list of lists of ContributorStats objects,
+            one list per repository
+    """
+    repo_contributor_data: dict = {}
+    for (
+        repo_full_name,
+        login,
+        avatar_url,
+        committed_date,
+    ) in commit_search.iter_org_commit_authors(
+        github_connection, organization, _parse_date(start_date), _parse_date(end_date)
+    ):
+        _tally_commit(
+            repo_contributor_data.setdefault(repo_full_name, {}),
+            login,
+            avatar_url,
+            committed_date,
+        )
+
+    return [
+        build_contributors(repo_full_name, contributor_data, start_date, end_date, ghe)
+        for repo_full_name, contributor_data in repo_contributor_data.items()
+    ]
+
+
+def build_contributors(
+    repo_full_name: str,
+    contributor_data: dict,
+    start_date: str,
+    end_date: str,
+    ghe: str,
+) -> list:
+    """
+    Turn the per-author commit counts of one repository into ContributorStats objects.
+
+    Args:
+        repo_full_name (str): The "owner/name" of the repository
+        contributor_data (dict): Maps each login to a dict with the keys
+            'avatar_url', 'contribution_count' and 'weeks'
+        start_date (str): The start date of the date range for the contributor list.
+        end_date (str): The end date of the date range for the contributor list.
+        ghe (str): The GitHub Enterprise URL, if applicable.
+
+    Returns:
+        contributors (list): A list of ContributorStats objects
+    """
+    endpoint = ghe if ghe else "https://github.com"
+    weeks = history.week_starts(start_date, end_date)
+    contributors = []
+    for username, data in contributor_data.items():
+        commit_url = f"{endpoint}/{repo_full_name}/commits?author={username}&since={start_date}&until={end_date}"
+        contributor = contributor_stats.ContributorStats(
+            username,
+            False,
+            data["avatar_url"],
+            data["contribution_count"],
+            commit_url,
+            "",
+            weekly_commits=[data.get("weeks", {}).get(week, 0) for week in weeks],
+            repository_counts={repo_full_name: data["contribution_count"]},
+        )
+        contributors.append(contributor)
+    return contributors
+
+
+def get_commit_authors(
+    repo: object,
+    start_date: str,
+    end_date: str,
+    progress: checkpoint.Checkpoint | None = None,
+    store: history.HistoryStore | None = None,
+) -> dict:
+    """
+    Count the commits of each author in a repository between two dates.
+
+    The window is first read with a single commit iterator. If it turns out to
+    hold more than SLICE_PROBE_COMMITS commits, the probe is discarded and the
+    window is split into time slices that are fetched concurrently, so one
+    very large repository does not serialize the whole run. When a previous
+    run already saved some of those slices, the probe is skipped and only the
+    missing slices are fetched. With a history store, the slices are the
+    ranges any earlier run fetched, whatever its dates, and their commits
+    are counted from the store, summing the weeks it rolled up.
+
+    Args:
+        repo (object): The repository object from PyGithub
+        start_date (str): The start date of the date range (YYYY-MM-DD).
+        end_date (str): The end date of the date range (YYYY-MM-DD).
+        progress (Checkpoint): Where finished time slices are saved, if anywhere.
+        store (HistoryStore): Where fetched commits are kept, if anywhere.
+
+    Returns:
+        contributor_data (dict): Maps each login to a dict with the keys
+            'avatar_url', 'contribution_count' and 'weeks'
+    """
+    window_start = _parse_date(start_date)
+    window_end = _parse_date(end_date)
+    saved_slices = _load_slices(repo, window_start, window_end, progress, store)
+    if saved_slices:
+        return _get_sliced_commit_authors(
+            repo, window_start, window_end, 0.0, progress, store, saved_slices
+        )
+
+    contributor_data: dict = {}
+    commits = []
+    probed = 0
+    for login, avatar_url, committed_date, sha in _iter_commit_authors(
+        repo, start_date, end_date, SLICE_PROBE_PAGES
+    ):
+        commits.append((login, avatar_url, committed_date, sha))
+        probed += 1
+        if probed > SLICE_PROBE_COMMITS:
+            oldest_probed = datetime.datetime.strptime(
+                committed_date, "%Y-%m-%dT%H:%M:%SZ"
+            ).replace(tzinfo=datetime.timezone.utc)
+            break
+        _tally_commit(contributor_data, login, avatar_url, committed_date)
+    else:
+        if store:
+            store.record(repo.full_name, window_start, window_end, commits)
+        return contributor_data
+
+    probed_seconds = max((window_end - oldest_probed).total_seconds(), 1.0)
+    return _get_sliced_commit_authors(
+        repo,
+        window_start,
+        window_end,
+        SLICE_PROBE_COMMITS / probed_seconds,
+        progress,
+        store,
+    )
+
+
+def _get_sliced_commit_authors(
+    repo: object,
+    window_start: datetime.datetime,
+    window_end: datetime.datetime,
+    density: float,
+    progress: checkpoint.Checkpoint | None = None,
+    store: history.HistoryStore | None = None,
+    saved_slices: list | None = None,
+) -> dict:
+    """
+    Fetch a date window as disjoint time slices on a thread pool.
+
+    Slices are planned from the newest end of the window backwards. The size
+    of each new slice is derived from the commit density (commits per second)
+    observed over all slices finished so far, aiming at SLICE_TARGET_COMMITS
+    commits per slice. Slices saved by a previous run are counted as finished
+    and only the gaps between them are fetched.
+
+    Args:
+        repo (object): The repository object from PyGithub
+        window_start (datetime): The inclusive start of the window.
+        window_end (datetime): The inclusive end of the window.
+        density (float): The initial estimate of commits per second.
+        progress (Checkpoint): Where finished time slices are saved, if anywhere.
+        store (HistoryStore): Where the commits of finished slices are kept,
+            if anywhere.
+        saved_slices (list): The slices already finished, loaded from
+            progress or store when None.
+
+    Returns:
+        contributor_data (dict): Maps each login to a dict with the keys
+            'avatar_url', 'contribution_count' and 'weeks'
+    """
+    contributor_data: dict = {}
+    fetched_commits = 0
+    fetched_seconds = 0.0
+    pending: dict = {}
+
+    if saved_slices is None:
+        saved_slices = _load_slices(repo, window_start, window_end, progress, store)
+    covered = []
+    for saved_since, saved_until, slice_data, slice_commits in saved_slices:
+        slice_range = (
+            datetime.datetime.fromisoformat(saved_since),
+            datetime.datetime.fromisoformat(saved_until),
+        )
+        covered.append(slice_range)
+        fetched_seconds += (slice_range[1] - slice_range[0]).total_seconds() + 1
+        fetched_commits += slice_commits
+        _merge_slice(contributor_data, slice_data)
+    if fetched_seconds:
+        density = max(fetched_commits, 1) / fetched_seconds
+    # The parts of the window still to fetch, oldest first
+    gaps = _uncovered(window_start, window_end, covered)
+
+    with ThreadPoolExecutor(max_workers=SLICE_WORKERS) as executor:
+
+        def plan_slices():
+            while gaps and len(pending) < SLICE_WORKERS:
+                gap_start, gap_end = gaps[-1]
+                span = max(SLICE_TARGET_COMMITS / density, SLICE_MIN_SECONDS)
+                since = max(gap_start, gap_end - datetime.timedelta(seconds=span))
+                future = executor.submit(
+                    _count_commit_slice, repo, since, gap_end, store
+                )
+                pending[future] = (since, gap_end)
+                if since == gap_start:
+                    gaps.pop()
+                else:
+                    gaps[-1] = (gap_start, since - datetime.timedelta(seconds=1))
+
+        plan_slices()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                since, until = pending.pop(future)
+                fetched_seconds += (until - since).total_seconds() + 1
+                slice_data, slice_commits = future.result()
+                if progress:
+                    progress.save_slice(
+                        repo.full_name,
+                        since.isoformat(),
+                        until.isoformat(),
+                        slice_data,
+                        slice_commits,
+                    )
+                fetched_commits += slice_commits
+                _merge_slice(contributor_data, slice_data)
+            density = max(fetched_commits, 1) / fetched_seconds
+            plan_slices()
+
+    return contributor_data
+
+
+def _load_slices(
+    repo: object,
+    window_start: datetime.datetime,
+    window_end: datetime.datetime,
+    progress: checkpoint.Checkpoint | None,
+    store: history.HistoryStore | None,
+) -> list:
+    """Return the finished slices of a window, from the history store when there is one."""
+    if store:
+        return store.load_slices(repo.full_name, window_start, window_end)
+    if progress:
+        return progress.load_slices(repo.full_name)
+    return []
+
+
+def _merge_slice(contributor_data: dict, slice_data: dict) -> None:
+    """Add the per-author counts of one time slice to the running totals."""
+    for login, data in slice_data.items():
+        if login not in contributor_data:
+            contributor_data[login] = {**data, "weeks": dict(data.get("weeks", {}))}
+            continue
+        contributor_data[login]["contribution_count"] += data["contribution_count"]
+        weeks = contributor_data[login].setdefault("weeks", {})
+        for week, count in data.get("weeks", {}).items():
+            weeks[week] = weeks.get(week, 0) + count
+
+
+def _uncovered(
+    window_start: datetime.datetime, window_end: datetime.datetime, covered: list
+) -> list:
+    """Return the (since, until) ranges of a window outside the covered ranges, oldest first."""
+    gaps = []
+    cursor = window_start
+    for since, until in sorted(covered):
+        if since > cursor:
+            gaps.append((cursor, since - datetime.timedelta(seconds=1)))
+        cursor = max(cursor, until + datetime.timedelta(seconds=1))
+    if cursor <= window_end:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def _count_commit_slice(
+    repo: object,
+    since: datetime.datetime,
+    until: datetime.datetime,
+    store: history.HistoryStore | None = None,
+) -> tuple[dict, int]:
+    """Count the commits of each author in one time slice, both ends inclusive."""
+    slice_data: dict = {}
+    commits = []
+    for login, avatar_url, committed_date, sha in _iter_commit_authors(
+        repo,
+        since.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        until.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    ):
+        commits.append((login, avatar_url, committed_date, sha))
+        _tally_commit(slice_data, login, avatar_url, committed_date)
+    if store:
+        store.record(repo.full_name, since, until, commits)
+    return slice_data, len(commits)
+
+
+def _iter_commit_authors(
+    repo: object, since: str, until: str, prefetch_pages: int | None = None
+):
+    """
+    Yield (login, avatar_url, committed_date, sha) for every commit in a date range.
+
+    Repository handles read the raw page JSON directly, fetching no page
+    after prefetch_pages ahead; any other repository object falls back to
+    its github3 commit models.
+    """
+    if isinstance(repo, repository.RepositoryHandle):
+        yield from repo.commit_authors(
+            since=since, until=until, prefetch_pages=prefetch_pages
+        )
+        return
+    for commit in repo.commits(since=since, until=until):
+        committed_date = commit.commit.committer["date"]
+        if commit.author is None:
+            yield None, None, committed_date, commit.sha
+        else:
+            yield (
+                commit.author.login,
+                commit.author.avatar_url,
+                committed_date,
+                commit.sha,
+            )
+
+
+def _tally_commit(
+    contributor_data: dict,
+    login: str | None,
+    avatar_url: str,
+    committed_date: str | None = None,
+) -> None:
+    """
+    Add one commit to the per-author counts, skipping bots and unlinked authors.
+
+    The commits of each author are also counted per week under "weeks", a
+    sparse dict from the start date of the week to its commits, so the
+    weekly time series comes out of the same pass over the commits.
+    """
+    if login is None or "[bot]" in login:
+        return
+    if login not in contributor_data:
+        contributor_data[login] = {
+            "avatar_url": avatar_url,
+            "contribution_count": 0,
+            "weeks": {},
+        }
+    contributor_data[login]["contribution_count"] += 1
+    if committed_date:
+        weeks = contributor_data[login]["weeks"]
+        week = _week_of(committed_date[:10])
+        weeks[week] = weeks.get(week, 0) + 1
+
+
+@functools.lru_cache(maxsize=1024)
+def _week_of(day: str) -> str:
+    """Return the start date of the week of a YYYY-MM-DD day."""
+    return history.week_start(_parse_date(day)).strftime(history.WEEK_FORMAT)
+
+
+def _parse_date(date: str) -> datetime.datetime:
+    """Parse a YYYY-MM-DD date as midnight UTC, the way the GitHub API reads it."""
+    return datetime.datetime.strptime(date, "%Y-%m-%d").replace(
+        tzinfo=datetime.timezone.utc
+    )
+
+
 if __name__ == "__main__":
     main()
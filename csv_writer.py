@@ -0,0 +1,54 @@
+"""This module contains a function that writes data to CSV files."""
+
+import csv
+
+# The columns of the contributors file and of the contributions per repository file
+CONTRIBUTOR_COLUMNS = [
+    "username",
+    "new_contributor",
+    "avatar_url",
+    "contribution_count",
+    "sponsor_info",
+]
+REPOSITORY_COLUMNS = ["username", "repository", "contribution_count"]
+
+
+def write_to_csv(contributors, filename, repositories_filename):
+    """Write data to CSV files.
+
+    Rows are written as the contributors are iterated, so no copy of the
+    data is built in memory.
+
+    Args:
+        contributors (list): A list of Contributor objects.
+        filename (str): The name of the CSV file with one row per contributor.
+        repositories_filename (str): The name of the CSV file with one row per
+            contributor and repository they contributed to.
+
+    Returns:
+        None
+    """
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(CONTRIBUTOR_COLUMNS)
+        writer.writerows(
+            (
+                contributor.username,
+                contributor.new_contributor,
+                contributor.avatar_url,
+                contributor.contribution_count,
+                contributor.sponsor_info,
+            )
+            for contributor in contributors
+        )
+
+    with open(repositories_filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPOSITORY_COLUMNS)
+        writer.writerows(
+            (contributor.username, repository, count)
+            for contributor in contributors
+            for repository, count in sorted(
+                (contributor.repository_counts or {}).items()
+            )
+        )
@@ -0,0 +1,51 @@
+# pylint: disable=broad-exception-caught
+"""This module looks up per-user information while repositories are still being fetched."""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable
+
+ENRICH_WORKERS = 4
+
+
+class Enricher:
+    """
+    Runs a per-user lookup in the background, once per login.
+
+    Fetchers hand over the logins of each repository as soon as it is done,
+    so the lookups overlap with the repositories still being fetched instead
+    of all starting after the last one. A login seen in several
+    repositories is only looked up the first time.
+
+    Attributes:
+        lookup (Callable): Returns the information of one login
+    """
+
+    def __init__(self, lookup: Callable[[str], object], workers: int = ENRICH_WORKERS):
+        """Initialize the enricher and its worker pool"""
+        self.lookup = lookup
+        self._futures: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="enrich"
+        )
+
+    def submit(self, logins: Iterable[str]) -> None:
+        """Start the lookup of every login that was not seen before"""
+        with self._lock:
+            for login in logins:
+                if login not in self._futures:
+                    self._futures[login] = self._executor.submit(self.lookup, login)
+
+    def result(self, login: str) -> object:
+        """Wait for the information of a login, None if its lookup failed"""
+        self.submit([login])
+        try:
+            return self._futures[login].result()
+        except Exception as e:
+            print(f"Looking up {login} failed: {e}")
+            return None
+
+    def close(self) -> None:
+        """Cancel the lookups nobody asked for and stop the workers"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
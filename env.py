@@ -10,6 +10,9 @@ from os.path import dirname, join
 
 from dotenv import load_dotenv
 
+# The formats the contributors can be written in next to markdown and JSON
+OUTPUT_FORMATS = ("csv", "parquet")
+
 
 def get_bool_env_var(env_var_name: str, default: bool = False) -> bool:
     """Get a boolean environment variable.
@@ -122,6 +125,93 @@ def validate_output_filename(output_filename: str) -> str:
     return filename
 
 
+def validate_shard(
+    shard_index: int | None, shard_count: int | None, shard_reduce: bool
+) -> None:
+    """Validate the sharding environment variables.
+
+    Does nothing if SHARD_COUNT is not set and sharding is not used.
+
+    Args:
+        shard_index: The index of the shard this job processes.
+        shard_count: The number of shards the repositories are split into.
+        shard_reduce: Whether this job combines the partial results of all shards.
+    """
+    if shard_count is None:
+        if shard_index is not None or shard_reduce:
+            raise ValueError("SHARD_INDEX and SHARD_REDUCE require SHARD_COUNT")
+        return
+    if shard_count < 1:
+        raise ValueError("SHARD_COUNT must be a positive integer")
+    if not shard_reduce and (shard_index is None or not 0 <= shard_index < shard_count):
+        raise ValueError("SHARD_INDEX must be between 0 and SHARD_COUNT - 1")
+
+
+def get_date_windows(
+    env_var_name: str, start_date: str, end_date: str, shard_count: int | None
+) -> list[tuple[str, str]]:
+    """Get a list of date windows from an environment variable.
+
+    Windows are written START:END, separated by commas or newlines, for
+    example "2024-01-01:2024-03-31,2024-03-01:2024-03-31".
+
+    Args:
+        env_var_name: The name of the environment variable to retrieve.
+        start_date: The START_DATE, which the windows replace.
+        end_date: The END_DATE, which the windows replace.
+        shard_count: The SHARD_COUNT, which the windows cannot be combined with.
+
+    Returns:
+        The (start_date, end_date) windows in the order they were listed,
+        an empty list if the environment variable is not set.
+    """
+    windows = []
+    for window in re.split(r"[,\n]", os.getenv(env_var_name, "")):
+        if not window.strip():
+            continue
+        window_start, _, window_end = window.strip().partition(":")
+        try:
+            datetime.datetime.strptime(window_start, "%Y-%m-%d")
+            datetime.datetime.strptime(window_end, "%Y-%m-%d")
+        except ValueError as exc:
+            raise ValueError(
+                f"{env_var_name} windows must be in the format YYYY-MM-DD:YYYY-MM-DD"
+            ) from exc
+        validate_date_range(window_start, window_end)
+        windows.append((window_start, window_end))
+
+    if windows and (start_date or end_date):
+        raise ValueError(
+            f"{env_var_name} cannot be combined with START_DATE or END_DATE"
+        )
+    if windows and shard_count is not None:
+        raise ValueError(f"{env_var_name} cannot be combined with SHARD_COUNT")
+    return windows
+
+
+def get_output_formats(env_var_name: str) -> list[str]:
+    """Get the additional output formats from a comma separated environment variable.
+
+    Args:
+        env_var_name: The name of the environment variable to retrieve.
+
+    Returns:
+        The lowercased formats in the order they were listed, an empty list
+        if the environment variable is not set.
+    """
+    formats = []
+    for output_format in os.getenv(env_var_name, "").split(","):
+        output_format = output_format.strip().lower()
+        if not output_format:
+            continue
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(
+                f"{env_var_name} must be a comma separated list of {', '.join(OUTPUT_FORMATS)}"
+            )
+        formats.append(output_format)
+    return formats
+
+
 def get_env_vars(
     test: bool = False,
 ) -> tuple[
@@ -139,6 +229,21 @@ def get_env_vars(
     bool,
     str,
     bool,
+    bool,
+    int | None,
+    str,
+    int | None,
+    int | None,
+    bool,
+    str,
+    str,
+    list[tuple[str, str]],
+    bool,
+    bool,
+    str,
+    list[str],
+    str,
+    str,
 ]:
     """
     Get the environment variables for use in the action.
@@ -159,6 +264,23 @@ def get_env_vars(
         end_date (str): The end date to get contributor information to
         sponsor_info (str): Whether to get sponsor information on the contributor
         link_to_profile (str): Whether to link username to Github profile in markdown output
+        output_filename (str): The output filename for the markdown report
+        show_avatar (bool): Whether to show profile images in the markdown output
+        use_commit_search (bool): Whether to count organization commits with the commit search API
+        http_pool_size (int | None): The maximum number of pooled connections per host
+        checkpoint_dir (str): The directory to save the progress of the run in, to resume it after a failure
+        shard_index (int | None): The index of the shard of repositories this job processes
+        shard_count (int | None): The number of shards the repositories are split into
+        shard_reduce (bool): Whether to combine the partial results of all shards
+        cache_dir (str): The directory to keep data between runs in
+        history_db (str): The SQLite database to keep the fetched commits in
+        date_windows (list): The (start_date, end_date) windows to report on in one run
+        time_series (bool): Whether to add each contributor's weekly commit counts to the output
+        contributor_analytics (bool): Whether to add concentration statistics of the contributors to the output
+        matrix_export_dir (str): The directory to export the contributor x repository matrix to
+        output_formats (list[str]): The formats to also write the contributors in, csv or parquet
+        event_log_path (str): The gzip compressed NDJSON file to log the counted commit authors in
+        previous_json (str): A JSON report of an earlier run to report the changes since
     """
 
     if not test:
@@ -204,6 +326,22 @@ def get_env_vars(
         os.getenv("OUTPUT_FILENAME", "contributors.md")
     )
     show_avatar = get_bool_env_var("SHOW_AVATAR", False)
+    use_commit_search = get_bool_env_var("USE_COMMIT_SEARCH", False)
+    http_pool_size = get_int_env_var("HTTP_POOL_SIZE")
+    checkpoint_dir = os.getenv("CHECKPOINT_DIR", "").strip()
+    shard_index = get_int_env_var("SHARD_INDEX")
+    shard_count = get_int_env_var("SHARD_COUNT")
+    shard_reduce = get_bool_env_var("SHARD_REDUCE", False)
+    validate_shard(shard_index, shard_count, shard_reduce)
+    cache_dir = os.getenv("CACHE_DIR", "").strip()
+    history_db = os.getenv("HISTORY_DB", "").strip()
+    date_windows = get_date_windows("DATE_WINDOWS", start_date, end_date, shard_count)
+    time_series = get_bool_env_var("TIME_SERIES", False)
+    contributor_analytics = get_bool_env_var("CONTRIBUTOR_ANALYTICS", False)
+    matrix_export_dir = os.getenv("MATRIX_EXPORT_DIR", "").strip()
+    output_formats = get_output_formats("OUTPUT_FORMATS")
+    event_log_path = os.getenv("EVENT_LOG", "").strip()
+    previous_json = os.getenv("PREVIOUS_JSON", "").strip()
 
     # Separate repositories_str into a list based on the comma separator
     repositories_list = []
@@ -227,4 +365,19 @@ def get_env_vars(
         link_to_profile,
         output_filename,
         show_avatar,
+        use_commit_search,
+        http_pool_size,
+        checkpoint_dir,
+        shard_index,
+        shard_count,
+        shard_reduce,
+        cache_dir,
+        history_db,
+        date_windows,
+        time_series,
+        contributor_analytics,
+        matrix_export_dir,
+        output_formats,
+        event_log_path,
+        previous_json,
     )
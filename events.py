@@ -0,0 +1,99 @@
+"""This module logs the commit authors a run counted, to build its reports again offline."""
+
+import gzip
+import json
+
+import history
+
+
+class EventLog:
+    """
+    A gzip compressed NDJSON log of the commit authors counted by a run.
+
+    The first line describes the run. Every other line is one event: the
+    commits of one author to one repository in one week of a date range
+    the contributors were fetched for. Commits without a week, like the
+    all-time counts of the contributors endpoint, are logged with a null
+    week. The events hold everything the reports are built from, so
+    replay.py can build them again with other options and no API requests.
+
+    Attributes:
+        path (str): The file the events are written to
+    """
+
+    def __init__(self, path: str, run: dict):
+        """Open the log and write the description of the run"""
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._write(run)
+
+    def record(self, since: str, until: str, repo_contributors: list) -> None:
+        """
+        Log the commit authors of each repository of a date range.
+
+        Args:
+            since (str): The start date the contributors were fetched for
+            until (str): The end date the contributors were fetched for
+            repo_contributors (list): A list of lists of ContributorStats
+                objects, one list per repository, before they are merged
+        """
+        weeks = history.week_starts(since, until)
+        for contributors in repo_contributors:
+            for contributor in contributors:
+                repository_counts = contributor.repository_counts or {}
+                for repository, commits in repository_counts.items():
+                    self._record_contributor(
+                        since, until, repository, commits, contributor, weeks
+                    )
+
+    def close(self) -> None:
+        """Close the log"""
+        self._file.close()
+
+    def _record_contributor(
+        self,
+        since: str,
+        until: str,
+        repository: str,
+        commits: int,
+        contributor,
+        weeks: list,
+    ) -> None:
+        """Log the commits of one contributor to one repository, week by week"""
+        event = {
+            "since": since,
+            "until": until,
+            "repository": repository,
+            "login": contributor.username,
+            "avatar_url": contributor.avatar_url,
+        }
+        weekly_commits = contributor.weekly_commits or []
+        if len(weekly_commits) != len(weeks):
+            weekly_commits = []
+        for week, week_commits in zip(weeks, weekly_commits):
+            if week_commits:
+                self._write({**event, "week": week, "commits": week_commits})
+        # Commits that were counted without their date
+        undated = commits - sum(weekly_commits)
+        if undated:
+            self._write({**event, "week": None, "commits": undated})
+
+    def _write(self, line: dict) -> None:
+        """Append one line to the log"""
+        self._file.write(json.dumps(line) + "\n")
+
+
+def read_events(path: str) -> tuple[dict, list]:
+    """
+    Read a log written by EventLog.
+
+    Args:
+        path (str): The file the events were written to
+
+    Returns:
+        run (dict): The description of the run
+        events (list): The events, in the order they were logged
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        run = json.loads(f.readline())
+        return run, [json.loads(line) for line in f if line.strip()]
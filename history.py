@@ -0,0 +1,345 @@
+"""This module keeps the commits fetched by every run in a local SQLite database."""
+
+import datetime
+import sqlite3
+import threading
+
+# How commit dates are stored, so that they sort as text
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+WEEK_FORMAT = "%Y-%m-%d"
+WEEK = datetime.timedelta(days=7)
+SECOND = datetime.timedelta(seconds=1)
+# Commits keep arriving with recent dates for a while, through pushes and
+# merges of older branches, so this much of the recent past is fetched again
+SETTLE_MARGIN = datetime.timedelta(days=14)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS commits (
+    repo TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    login TEXT,
+    avatar_url TEXT,
+    committed_at TEXT NOT NULL,
+    PRIMARY KEY (repo, sha)
+);
+CREATE INDEX IF NOT EXISTS commits_by_date ON commits (repo, committed_at);
+CREATE TABLE IF NOT EXISTS coverage (
+    repo TEXT NOT NULL,
+    since TEXT NOT NULL,
+    until TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS coverage_by_repo ON coverage (repo);
+CREATE TABLE IF NOT EXISTS weeks (
+    repo TEXT NOT NULL,
+    week TEXT NOT NULL,
+    PRIMARY KEY (repo, week)
+);
+CREATE TABLE IF NOT EXISTS weekly_commits (
+    repo TEXT NOT NULL,
+    week TEXT NOT NULL,
+    login TEXT NOT NULL,
+    avatar_url TEXT,
+    commits INTEGER NOT NULL,
+    PRIMARY KEY (repo, week, login)
+);
+"""
+
+
+class HistoryStore:
+    """
+    The commit authors of every repository, kept across runs.
+
+    Each commit is stored once with its repository, SHA, author login,
+    avatar and date. The store also records which time ranges of each
+    repository have been fetched completely, so a run only asks the API for
+    the parts of its window no earlier run has fetched, and counts the rest
+    from the database.
+
+    The commits of every complete week, Sunday to Saturday in UTC, that the
+    stored ranges cover are also rolled up per author. A window of any
+    length is then counted by summing its whole weeks, with only the partial
+    weeks at its edges counted commit by commit. Only fetched commits are
+    rolled up, never the contributor statistics of GitHub: those leave out
+    merge commits and date commits by author, so they would not match the
+    counts of a run without a store.
+
+    Attributes:
+        path (str): The SQLite database file
+        settle_margin (timedelta): How much of the recent past recorded
+            ranges leave uncovered, so later runs fetch it again
+    """
+
+    def __init__(self, path: str, settle_margin: datetime.timedelta = SETTLE_MARGIN):
+        """Open the database, creating its tables if needed"""
+        self.path = path
+        self.settle_margin = settle_margin
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        repo_full_name: str,
+        since: datetime.datetime,
+        until: datetime.datetime,
+        commits: list,
+    ) -> None:
+        """
+        Save every commit of a time range that was fetched completely.
+
+        A range is only covered up to settle_margin before now, since
+        commits dated after that can still be pushed. Its later commits are
+        stored, but the next run fetches that part again. Every week the
+        stored ranges now cover completely is rolled up from its commits.
+
+        Args:
+            repo_full_name (str): The "owner/name" of the repository
+            since (datetime): The inclusive start of the range
+            until (datetime): The inclusive end of the range
+            commits (list): (login, avatar_url, committed_date, sha) tuples
+        """
+        until = min(
+            until, datetime.datetime.now(datetime.timezone.utc) - self.settle_margin
+        )
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO commits VALUES (?, ?, ?, ?, ?)",
+                [
+                    (repo_full_name, sha, login, avatar_url, committed_date)
+                    for login, avatar_url, committed_date, sha in commits
+                ],
+            )
+            if since > until:
+                return
+            self._connection.execute(
+                "INSERT INTO coverage VALUES (?, ?, ?)",
+                (
+                    repo_full_name,
+                    since.strftime(DATE_FORMAT),
+                    until.strftime(DATE_FORMAT),
+                ),
+            )
+            # Roll up the weeks of this range that are now covered completely
+            for covered_since, covered_until in self._covered(repo_full_name):
+                week = week_start(max(since, covered_since))
+                while week <= min(until, covered_until):
+                    if covered_since <= week and week + WEEK - SECOND <= covered_until:
+                        self._roll_up_commits(repo_full_name, week)
+                    week += WEEK
+
+    def load_slices(
+        self,
+        repo_full_name: str,
+        window_start: datetime.datetime,
+        window_end: datetime.datetime,
+    ) -> list:
+        """
+        Return the parts of a window already fetched, counted from the database.
+
+        Args:
+            repo_full_name (str): The "owner/name" of the repository
+            window_start (datetime): The inclusive start of the window
+            window_end (datetime): The inclusive end of the window
+
+        Returns:
+            slices (list): (since, until, contributor_data, commits) tuples with
+                since and until as ISO 8601 strings, like Checkpoint.load_slices
+        """
+        slices = []
+        with self._lock:
+            weeks = self._weeks(repo_full_name, window_start, window_end)
+            ranges = self._covered(repo_full_name) + [
+                (week, week + WEEK - SECOND) for week in weeks
+            ]
+            for since, until in _merge(ranges):
+                since = max(since, window_start)
+                until = min(until, window_end)
+                if since > until:
+                    continue
+                contributor_data, commits = self._count(
+                    repo_full_name, since, until, weeks
+                )
+                slices.append(
+                    (since.isoformat(), until.isoformat(), contributor_data, commits)
+                )
+        return slices
+
+    def close(self) -> None:
+        """Close the database"""
+        with self._lock:
+            self._connection.close()
+
+    def _covered(self, repo_full_name: str) -> list:
+        """Return the fetched ranges of a repository, merged and oldest first, with _lock held"""
+        rows = self._connection.execute(
+            "SELECT since, until FROM coverage WHERE repo = ?", (repo_full_name,)
+        ).fetchall()
+        return _merge(
+            [
+                (_parse(since, DATE_FORMAT), _parse(until, DATE_FORMAT))
+                for since, until in rows
+            ]
+        )
+
+    def _weeks(
+        self,
+        repo_full_name: str,
+        window_start: datetime.datetime,
+        window_end: datetime.datetime,
+    ) -> list:
+        """Return the rolled up weeks lying entirely in a window, with _lock held"""
+        rows = self._connection.execute(
+            "SELECT week FROM weeks WHERE repo = ? AND week BETWEEN ? AND ? "
+            "ORDER BY week",
+            (
+                repo_full_name,
+                window_start.strftime(WEEK_FORMAT),
+                (window_end - WEEK + SECOND).strftime(WEEK_FORMAT),
+            ),
+        ).fetchall()
+        weeks = [_parse(week, WEEK_FORMAT) for (week,) in rows]
+        return [
+            week
+            for week in weeks
+            if week >= window_start and week + WEEK - SECOND <= window_end
+        ]
+
+    def _roll_up_commits(self, repo_full_name: str, week: datetime.datetime) -> None:
+        """Replace the rollup of a week by the counts of its stored commits, with _lock held"""
+        week_key = week.strftime(WEEK_FORMAT)
+        self._connection.execute(
+            "DELETE FROM weekly_commits WHERE repo = ? AND week = ?",
+            (repo_full_name, week_key),
+        )
+        # Commits without a linked user are rolled up under an empty login
+        self._connection.execute(
+            "INSERT INTO weekly_commits "
+            "SELECT repo, ?, COALESCE(login, ''), MAX(avatar_url), COUNT(*) "
+            "FROM commits WHERE repo = ? AND committed_at BETWEEN ? AND ? "
+            "GROUP BY login",
+            (
+                week_key,
+                repo_full_name,
+                week.strftime(DATE_FORMAT),
+                (week + WEEK - SECOND).strftime(DATE_FORMAT),
+            ),
+        )
+        self._connection.execute(
+            "INSERT OR REPLACE INTO weeks VALUES (?, ?)",
+            (repo_full_name, week_key),
+        )
+
+    def _count(
+        self,
+        repo_full_name: str,
+        since: datetime.datetime,
+        until: datetime.datetime,
+        weeks: list,
+    ) -> tuple[dict, int]:
+        """
+        Count the commits of each author in a range, skipping bots and unlinked authors.
+
+        The rolled up weeks inside the range are summed, the rest of the
+        range is counted from its commits. Each author also gets the commits
+        of each week under "weeks", like in the scan. Runs with _lock held.
+        """
+        rolled_up = [
+            week for week in weeks if since <= week and week + WEEK - SECOND <= until
+        ]
+        rows = []
+        if rolled_up:
+            rows += self._connection.execute(
+                "SELECT login, week, MAX(avatar_url), SUM(commits) "
+                "FROM weekly_commits WHERE repo = ? AND week BETWEEN ? AND ? "
+                "GROUP BY login, week",
+                (
+                    repo_full_name,
+                    rolled_up[0].strftime(WEEK_FORMAT),
+                    rolled_up[-1].strftime(WEEK_FORMAT),
+                ),
+            ).fetchall()
+        for gap_since, gap_until in _gaps(
+            since, until, [(week, week + WEEK - SECOND) for week in rolled_up]
+        ):
+            # The week of a commit starts on the Sunday at most 6 days before it
+            rows += self._connection.execute(
+                "SELECT login, DATE(committed_at, '-6 days', 'weekday 0'), "
+                "MAX(avatar_url), COUNT(*) FROM commits "
+                "WHERE repo = ? AND committed_at BETWEEN ? AND ? GROUP BY 1, 2",
+                (
+                    repo_full_name,
+                    gap_since.strftime(DATE_FORMAT),
+                    gap_until.strftime(DATE_FORMAT),
+                ),
+            ).fetchall()
+
+        contributor_data: dict = {}
+        for login, week, avatar_url, count in rows:
+            if not login or "[bot]" in login:
+                continue
+            data = contributor_data.setdefault(
+                login, {"avatar_url": avatar_url, "contribution_count": 0, "weeks": {}}
+            )
+            data["contribution_count"] += count
+            data["weeks"][week] = data["weeks"].get(week, 0) + count
+        return contributor_data, sum(count for _, _, _, count in rows)
+
+
+def week_start(date: datetime.datetime) -> datetime.datetime:
+    """Return midnight UTC of the Sunday starting the week of a date"""
+    midnight = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight - datetime.timedelta(days=(date.weekday() + 1) % 7)
+
+
+def week_starts(start_date: str, end_date: str) -> list:
+    """
+    Return the start dates of the weeks a date range touches.
+
+    Args:
+        start_date (str): The first day of the range (YYYY-MM-DD)
+        end_date (str): The last day of the range (YYYY-MM-DD)
+
+    Returns:
+        weeks (list): The Sundays starting each week (YYYY-MM-DD), oldest first,
+            an empty list without a date range
+    """
+    if not start_date or not end_date:
+        return []
+    week = week_start(_parse(start_date, WEEK_FORMAT))
+    last_week = week_start(_parse(end_date, WEEK_FORMAT))
+    weeks = []
+    while week <= last_week:
+        weeks.append(week.strftime(WEEK_FORMAT))
+        week += WEEK
+    return weeks
+
+
+def _merge(ranges: list) -> list:
+    """Merge overlapping and adjacent (since, until) ranges, oldest first"""
+    merged: list = []
+    for since, until in sorted(ranges):
+        if merged and since <= merged[-1][1] + SECOND:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], until))
+        else:
+            merged.append((since, until))
+    return merged
+
+
+def _gaps(since: datetime.datetime, until: datetime.datetime, covered: list) -> list:
+    """Return the parts of a range outside sorted, disjoint covered ranges"""
+    gaps = []
+    cursor = since
+    for covered_since, covered_until in covered:
+        if covered_since > cursor:
+            gaps.append((cursor, covered_since - SECOND))
+        cursor = max(cursor, covered_until + SECOND)
+    if cursor <= until:
+        gaps.append((cursor, until))
+    return gaps
+
+
+def _parse(date: str, date_format: str) -> datetime.datetime:
+    """Parse a stored date as UTC"""
+    return datetime.datetime.strptime(date, date_format).replace(
+        tzinfo=datetime.timezone.utc
+    )
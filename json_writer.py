@@ -2,6 +2,8 @@
 
 import json
 
+import history
+
 
 def write_to_json(
     contributors,
@@ -12,6 +14,8 @@ def write_to_json(
     repository_list,
     sponsor_info,
     link_to_profile,
+    time_series=False,
+    analytics=None,
 ):
     """Write data to a JSON file.
 
@@ -24,6 +28,8 @@ def write_to_json(
         repository_list (list): A list of repositories for which the contributors are being listed.
         sponsor_info (str): A string indicating whether sponsor information should be included.
         link_to_profile (str): A string indicating whether a link to the contributor's profile should be included.
+        time_series (bool): Whether to include the weekly commits of each contributor.
+        analytics (dict): The concentration statistics of the contributors, if any.
 
     Returns:
         None
@@ -70,9 +76,38 @@ def write_to_json(
         "repository_list": repository_list,
         "sponsor_info": sponsor_info,
         "link_to_profile": link_to_profile,
-        "contributors": [contributor.__dict__ for contributor in contributors],
+        "contributors": [
+            {
+                key: value
+                for key, value in contributor.__dict__.items()
+                if key != "repository_counts"
+                and (time_series or key != "weekly_commits")
+            }
+            for contributor in contributors
+        ],
     }
+    if time_series:
+        # The start date of the week each entry of weekly_commits counts
+        data["weeks"] = history.week_starts(start_date, end_date)
+    if analytics is not None:
+        data["analytics"] = analytics
 
     # Write data to a JSON file
     with open(filename, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4)
+
+
+def write_delta_to_json(delta, filename, previous_filename):
+    """Write the changes since a previous report to a JSON file.
+
+    Args:
+        delta (dict): The changes from snapshot.diff.
+        filename (str): The name of the JSON file.
+        previous_filename (str): The previous report the changes are relative to.
+
+    Returns:
+        None
+    """
+    data = {"previous": previous_filename, **delta}
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
@@ -3,6 +3,9 @@
 
 import os
 
+# The bars of the weekly commits sparkline, from no commits to the busiest week
+SPARK_BARS = "▁▂▃▄▅▆▇█"
+
 
 def _is_truthy(value) -> bool:
     if isinstance(value, str):
@@ -21,6 +24,9 @@ def write_to_markdown(
     link_to_profile,
     ghe,
     show_avatar=False,
+    time_series=False,
+    analytics=None,
+    delta=None,
 ):
     """
     This function writes a list of collaborators to a markdown file in table format
@@ -49,6 +55,12 @@ def write_to_markdown(
         ghe (str): The GitHub Enterprise instance URL, if applicable.
         show_avatar (str): True if the user wants to show profile images in
                             the report
+        time_series (bool): True if the user wants the weekly commits of each
+                            contributor shown in the report
+        analytics (dict): The concentration statistics of the contributors to
+                          show in the report, if any
+        delta (dict): The changes since a previous report to show in the
+                      report, if any
 
     Returns:
         None
@@ -65,6 +77,7 @@ def write_to_markdown(
         link_to_profile,
         ghe,
         show_avatar,
+        time_series,
     )
 
     # Put together the summary table including # of new contributions,
@@ -72,6 +85,10 @@ def write_to_markdown(
     summary_table = get_summary_table(
         collaborators, start_date, end_date, total_contributions
     )
+    if analytics:
+        summary_table += get_analytics_table(analytics, start_date, end_date)
+    if delta is not None:
+        summary_table += get_delta_table(delta)
 
     # Generate the markdown content once
     content = generate_markdown_content(
@@ -197,6 +214,75 @@ def get_summary_table(collaborators, start_date, end_date, total_contributions):
     return summary_table
 
 
+def get_analytics_table(analytics, start_date, end_date):
+    """
+    This function returns a string containing markdown tables of the concentration statistics.
+
+    Args:
+        analytics (dict): The concentration statistics from analytics.summarize.
+        start_date (str): The start date of the date range for the contributor list.
+        end_date (str): The end date of the date range for the contributor list.
+
+    Returns:
+        analytics_table (str): A string containing a markdown table of the overall
+            statistics and one of the statistics of each repository.
+
+    """
+    percentiles = analytics["percentiles"]
+    columns = [f"Top {analytics['top_contributors']} Share", "Gini Coefficient"]
+    columns += [f"{name[1:]}th Percentile" for name in percentiles]
+    analytics_table = "| " + " | ".join(columns) + " |\n"
+    analytics_table += "| " + " | ".join(["---"] * len(columns)) + " |\n"
+    values = [f"{analytics['top_share']}%", str(analytics["gini"])]
+    values += [str(value) for value in percentiles.values()]
+    analytics_table += "| " + " | ".join(values) + " |\n\n"
+
+    if not analytics["repositories"]:
+        return analytics_table
+    if start_date and end_date:
+        analytics_table += "| Repository | Contributors | Bus Factor | % New Contributors |\n| --- | --- | --- | --- |\n"
+    else:
+        analytics_table += (
+            "| Repository | Contributors | Bus Factor |\n| --- | --- | --- |\n"
+        )
+    for name, repository in analytics["repositories"].items():
+        row = f"| {name} | {repository['contributors']} | {repository['bus_factor']} |"
+        if start_date and end_date:
+            row += f" {repository['new_contributor_rate']}% |"
+        analytics_table += row + "\n"
+    return analytics_table + "\n"
+
+
+def get_delta_table(delta):
+    """
+    This function returns a string containing markdown tables of the changes since a previous report.
+
+    Args:
+        delta (dict): The changes from snapshot.diff.
+
+    Returns:
+        delta_table (str): A string containing a markdown table counting the
+            changes and one listing the contributors that changed.
+
+    """
+    delta_table = "| Appeared Contributors | Vanished Contributors | Changed Contribution Counts |\n| --- | --- | --- |\n"
+    delta_table += f"| {len(delta['appeared'])} | {len(delta['vanished'])} | {len(delta['changed'])} |\n\n"
+    if not any(delta.values()):
+        return delta_table
+
+    delta_table += "| Username | Change | Previous Contribution Count | Contribution Count |\n| --- | --- | --- | --- |\n"
+    for contributor in delta["appeared"]:
+        delta_table += f"| {contributor['username']} | appeared | 0 | {contributor['contribution_count']} |\n"
+    for contributor in delta["vanished"]:
+        delta_table += f"| {contributor['username']} | vanished | {contributor['contribution_count']} | 0 |\n"
+    for contributor in delta["changed"]:
+        delta_table += (
+            f"| {contributor['username']} | {contributor['change']:+d} | "
+            f"{contributor['previous_count']} | {contributor['contribution_count']} |\n"
+        )
+    return delta_table + "\n"
+
+
 def get_contributor_table(
     collaborators,
     start_date,
@@ -207,6 +293,7 @@ def get_contributor_table(
     link_to_profile,
     ghe,
     show_avatar=False,
+    time_series=False,
 ):
     """
     This function returns a string containing a markdown table of the contributors and the total contribution count.
@@ -221,6 +308,7 @@ def get_contributor_table(
         sponsor_info (str): True if the user wants the sponsor_url shown in the report
         link_to_profile (str): True if the user wants the username linked to Github profile in the report
         show_avatar (str): True if the user wants to show profile images in the report
+        time_series (bool): True if the user wants the weekly commits of each contributor shown in the report
 
     Returns:
         table (str): A string containing a markdown table of the contributors and the total contribution count.
@@ -240,6 +328,8 @@ def get_contributor_table(
         columns += ["New Contributor"]
     if sponsor_info:
         columns += ["Sponsor URL"]
+    if time_series and start_date and end_date:
+        columns += ["Weekly Commits"]
     if start_date and end_date:
         columns += [f"Commits between {start_date} and {end_date}"]
     else:
@@ -288,7 +378,28 @@ def get_contributor_table(
                 row += " not sponsorable |"
             else:
                 row += f" [Sponsor Link]({collaborator.sponsor_info}) |"
+        if "Weekly Commits" in columns:
+            row += f" {get_sparkline(collaborator.weekly_commits or [])} |"
         row += f" {commit_urls} |\n"
 
         table += row
     return table, total_contributions
+
+
+def get_sparkline(weekly_commits):
+    """
+    This function returns a sparkline of the weekly commits of a contributor,
+    one bar per week scaled to their busiest week.
+
+    Args:
+        weekly_commits (list): The commits of the contributor in each week, oldest first.
+
+    Returns:
+        sparkline (str): One bar per week, empty if there are no weeks.
+
+    """
+    busiest = max(weekly_commits, default=0) or 1
+    return "".join(
+        SPARK_BARS[round(commits / busiest * (len(SPARK_BARS) - 1))]
+        for commits in weekly_commits
+    )
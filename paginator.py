@@ -0,0 +1,234 @@
+# pylint: disable=abstract-method
+"""This module contains a session that prefetches paginated GitHub API responses."""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlparse, urlunparse
+
+import github3
+import requests
+
+try:
+    import orjson
+
+    _loads = orjson.loads  # pylint: disable=no-member
+except ImportError:  # pragma: no cover
+    _loads = json.loads
+
+# How many pages ahead of the page being consumed are fetched in the background
+PREFETCH_DEPTH = 4
+# How many listings keep their prefetched pages, enough for every repository
+# and time slice read at once; the least recently read one is dropped first
+PREFETCH_LISTINGS = 64
+PREFETCH_WORKERS = 8
+# Search results are not prefetched: the search rate limit only allows a few
+# requests a minute, and callers often drop a search after its first page
+UNPREFETCHED_PATH = "/search/"
+
+
+class PrefetchingSession(github3.session.GitHubSession):
+    """
+    A github3 session that fetches the next pages of a listing ahead of time.
+
+    Every paginated GET response carries a Link header. When it has a
+    rel="last" link, the following page numbers up to `depth` pages ahead are
+    requested in parallel. Otherwise the rel="next" page is requested in the
+    background while the caller processes the current page. github3 iterators
+    then find the page they ask for already in flight or finished, so the run
+    no longer sits idle for one round trip per page. A page that has not
+    started yet when it is asked for is fetched by the caller instead of
+    waiting for a pool thread. Search results are fetched one page at a
+    time, as they are asked for.
+
+    The pages fetched ahead are kept per listing, the pages of one endpoint
+    and query, so the listings read at the same time never evict each
+    other's pages. A caller that stops reading early can pass prefetch_pages
+    with the first page of a listing to fetch no page after that one.
+
+    Attributes:
+        depth (int): The maximum number of pages fetched ahead of the caller
+    """
+
+    def __init__(self, depth: int = PREFETCH_DEPTH, **kwargs):
+        """Initialize the session and its prefetch pool"""
+        super().__init__(**kwargs)
+        self.depth = depth
+        # Maps each listing to its "pages", a dict of page keys to Futures,
+        # and the "last_page" fetched ahead for it
+        self._listings: OrderedDict[str, dict] = OrderedDict()
+        self._prefetch_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch"
+        )
+
+    def request(self, *args, **kwargs):
+        """Serve GET requests from the prefetched pages when possible."""
+        prefetch_pages = kwargs.pop("prefetch_pages", None)
+        if len(args) != 2 or args[0].upper() != "GET" or self.depth < 1:
+            return super().request(*args, **kwargs)
+        method, url = args
+
+        key = _page_key(url, kwargs.get("params"))
+        listing_key = _listing_key(key)
+        with self._prefetch_lock:
+            listing = self._listings.get(listing_key)
+            future = listing["pages"].pop(key, None) if listing else None
+
+        response = None
+        # A page still queued behind other listings' pages is fetched by the
+        # caller instead, so the pool never caps the requests in flight
+        if future is not None and not future.cancel():
+            try:
+                response = future.result()
+            except requests.exceptions.RequestException:
+                response = None
+        if response is None:
+            response = super().request(method, url, **kwargs)
+
+        if response.status_code == 200 and UNPREFETCHED_PATH not in urlparse(url).path:
+            self._schedule_prefetch(
+                listing_key, response, kwargs.get("headers"), prefetch_pages
+            )
+        return response
+
+    def _schedule_prefetch(
+        self, listing_key: str, response, headers, prefetch_pages: int | None
+    ) -> None:
+        """Start background requests for the pages of a listing following this response."""
+        next_url = response.links.get("next", {}).get("url")
+        if not next_url:
+            # The listing is read to its end
+            with self._prefetch_lock:
+                self._listings.pop(listing_key, None)
+            return
+        last_url = response.links.get("last", {}).get("url")
+        next_page = _page_number(next_url)
+        last_page = _page_number(last_url) if last_url else None
+
+        with self._prefetch_lock:
+            listing = self._listings.pop(listing_key, None) or {
+                "pages": {},
+                "last_page": None,
+            }
+            if prefetch_pages is not None:
+                listing["last_page"] = prefetch_pages
+            self._listings[listing_key] = listing
+            page_urls = [next_url]
+            if next_page is not None:
+                final_page = next_page if last_page is None else last_page
+                final_page = min(final_page, next_page + self.depth - 1)
+                if listing["last_page"] is not None:
+                    final_page = min(final_page, listing["last_page"])
+                page_urls = [
+                    _with_page(next_url, page)
+                    for page in range(next_page, final_page + 1)
+                ]
+            for page_url in page_urls:
+                key = _page_key(page_url, None)
+                if key in listing["pages"]:
+                    continue
+                listing["pages"][key] = self._executor.submit(
+                    super().request, "GET", page_url, headers=headers
+                )
+            while len(self._listings) > PREFETCH_LISTINGS:
+                _, stale = self._listings.popitem(last=False)
+                for future in stale["pages"].values():
+                    future.cancel()
+
+
+def iter_json_pages(
+    session,
+    url: str,
+    params: dict | None = None,
+    rate_limit_waits: int = 0,
+    prefetch_pages: int | None = None,
+):
+    """
+    Yield the decoded JSON body of every page of a paginated endpoint.
+
+    Bodies are decoded with orjson when it is installed and are never turned
+    into github3 model objects, so each page can be dropped as soon as the
+    caller moves on to the next one.
+
+    Args:
+        session: The github3 session to send the requests with
+        url (str): The url of the first page
+        params (dict): The query parameters of the first page
+        rate_limit_waits (int): How many times a page refused by a rate limit
+            is requested again once the limit resets, before giving up
+        prefetch_pages (int): The last page a PrefetchingSession may fetch
+            ahead, for callers that stop reading early
+
+    Yields:
+        The decoded JSON body of each page
+    """
+    # Only the first page tells the session how far to prefetch the listing
+    first_kwargs = {} if prefetch_pages is None else {"prefetch_pages": prefetch_pages}
+    while url:
+        response = session.get(url, params=params, **first_kwargs)
+        first_kwargs = {}
+        for _ in range(rate_limit_waits):
+            wait = _rate_limit_wait(response)
+            if wait is None:
+                break
+            print(f"Rate limit reached, waiting {wait:.0f} seconds for it to reset")
+            time.sleep(wait)
+            response = session.get(url, params=params)
+        if response.status_code != 200:
+            raise github3.exceptions.error_for(response)
+        yield _loads(response.content)
+        url = response.links.get("next", {}).get("url")
+        params = None  # the next link already carries the params
+
+
+def _rate_limit_wait(response) -> float | None:
+    """Return how long to wait before a rate limited request is sent again, None if it was not."""
+    if response.status_code not in (403, 429):
+        return None
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return float(retry_after)
+    reset = response.headers.get("X-RateLimit-Reset", "")
+    if response.headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        # A second more, so the clocks of the runner and GitHub need not agree
+        return max(int(reset) - time.time(), 0) + 1
+    return None
+
+
+def _page_key(url: str, params: dict | None) -> str:
+    """Return a key identifying the page a GET request with these params would hit."""
+    parsed = urlparse(url)
+    query = parse_qsl(parsed.query, keep_blank_values=True)
+    if params:
+        query += [
+            (key, str(value)) for key, value in params.items() if value is not None
+        ]
+    return f"{parsed.netloc}{parsed.path}?{urlencode(sorted(query))}"
+
+
+def _listing_key(page_key: str) -> str:
+    """Return the key shared by every page of a listing, its page key without the page."""
+    location, _, query = page_key.partition("?")
+    query = urlencode(
+        [(key, value) for key, value in parse_qsl(query) if key != "page"]
+    )
+    return f"{location}?{query}"
+
+
+def _page_number(url: str) -> int | None:
+    """Return the page query parameter of a url, if it has one."""
+    pages = parse_qs(urlparse(url).query).get("page")
+    if not pages or not pages[0].isdigit():
+        return None
+    return int(pages[0])
+
+
+def _with_page(url: str, page: int) -> str:
+    """Return the url with its page query parameter replaced."""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    query["page"] = [str(page)]
+    return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
@@ -0,0 +1,92 @@
+"""This module contains a function that writes data to Parquet files."""
+
+from itertools import islice
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+# How many rows are converted to columns and written at once
+BATCH_SIZE = 10000
+
+
+def require_pyarrow():
+    """Raise a ValueError if pyarrow, which writes the Parquet files, is not installed."""
+    if pyarrow is None:
+        raise ValueError("OUTPUT_FORMATS parquet requires the pyarrow package")
+
+
+def write_to_parquet(contributors, filename, repositories_filename):
+    """Write data to Parquet files.
+
+    The columns are typed and the logins and repository names are
+    dictionary encoded, since each of them repeats on many rows. Rows are
+    converted and written BATCH_SIZE at a time, so only one batch is held
+    in columns at once.
+
+    Args:
+        contributors (list): A list of Contributor objects.
+        filename (str): The name of the Parquet file with one row per contributor.
+        repositories_filename (str): The name of the Parquet file with one row
+            per contributor and repository they contributed to.
+
+    Returns:
+        None
+    """
+    require_pyarrow()
+    login = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+    contributor_schema = pyarrow.schema(
+        [
+            ("username", login),
+            ("new_contributor", pyarrow.bool_()),
+            ("avatar_url", pyarrow.string()),
+            ("contribution_count", pyarrow.int64()),
+            ("sponsor_info", pyarrow.string()),
+        ]
+    )
+    _write_batches(
+        filename,
+        contributor_schema,
+        (
+            (
+                contributor.username,
+                bool(contributor.new_contributor),
+                contributor.avatar_url,
+                contributor.contribution_count,
+                contributor.sponsor_info or None,
+            )
+            for contributor in contributors
+        ),
+    )
+
+    repository_schema = pyarrow.schema(
+        [
+            ("username", login),
+            ("repository", pyarrow.dictionary(pyarrow.int32(), pyarrow.string())),
+            ("contribution_count", pyarrow.int64()),
+        ]
+    )
+    _write_batches(
+        repositories_filename,
+        repository_schema,
+        (
+            (contributor.username, repository, count)
+            for contributor in contributors
+            for repository, count in sorted(
+                (contributor.repository_counts or {}).items()
+            )
+        ),
+    )
+
+
+def _write_batches(filename, schema, rows):
+    """Write rows to a Parquet file BATCH_SIZE at a time"""
+    with pyarrow.parquet.ParquetWriter(filename, schema) as writer:
+        while batch := list(islice(rows, BATCH_SIZE)):
+            columns = [
+                pyarrow.array(values, type=field.type)
+                for values, field in zip(zip(*batch), schema)
+            ]
+            writer.write_batch(pyarrow.record_batch(columns, schema=schema))
@@ -0,0 +1,167 @@
+"""Build the reports of a run again from its event log, without any API requests."""
+
+import os
+
+import contributor_stats
+import contributors
+import env
+import events
+
+
+def get_env_vars() -> (
+    tuple[str, str, list[str], str, bool, bool, bool, bool, list[str]]
+):
+    """
+    Get the environment variables for replaying an event log.
+
+    Only the options that shape the reports are read, so no token is needed.
+
+    Returns:
+        event_log_path (str): The event log written by a run with EVENT_LOG
+        organization (str): Only report on the repositories of this organization
+        repository_list (list[str]): Only report on these repositories
+        output_filename (str): The output filename for the markdown report
+        link_to_profile (bool): Whether to link username to Github profile in markdown output
+        show_avatar (bool): Whether to show profile images in the markdown output
+        time_series (bool): Whether to add each contributor's weekly commit counts to the output
+        contributor_analytics (bool): Whether to add concentration statistics of the contributors to the output
+        output_formats (list[str]): The formats to also write the contributors in, csv or parquet
+    """
+    event_log_path = os.getenv("EVENT_LOG", "").strip()
+    if not event_log_path:
+        raise ValueError("EVENT_LOG environment variable not set")
+    repositories_str = os.getenv("REPOSITORY", "")
+    return (
+        event_log_path,
+        os.getenv("ORGANIZATION", "").strip(),
+        [
+            repository.strip()
+            for repository in repositories_str.split(",")
+            if repository.strip()
+        ],
+        env.validate_output_filename(os.getenv("OUTPUT_FILENAME", "contributors.md")),
+        env.get_bool_env_var("LINK_TO_PROFILE", False),
+        env.get_bool_env_var("SHOW_AVATAR", False),
+        env.get_bool_env_var("TIME_SERIES", False),
+        env.get_bool_env_var("CONTRIBUTOR_ANALYTICS", False),
+        env.get_output_formats("OUTPUT_FORMATS"),
+    )
+
+
+def main():
+    """Rebuild the contributors of a logged run and write its reports"""
+    (
+        event_log_path,
+        organization,
+        repository_list,
+        output_filename,
+        link_to_profile,
+        show_avatar,
+        time_series,
+        contributor_analytics,
+        output_formats,
+    ) = get_env_vars()
+
+    run, logged_events = events.read_events(event_log_path)
+    # Without a subset of its own, the replay reports on what the run fetched
+    if not organization and not repository_list:
+        organization = run["organization"]
+        repository_list = run["repository_list"]
+    if repository_list:
+        logged_events = [
+            event for event in logged_events if event["repository"] in repository_list
+        ]
+    elif organization:
+        logged_events = [
+            event
+            for event in logged_events
+            if event["repository"].startswith(f"{organization}/")
+        ]
+
+    start_date, end_date, ghe = run["start_date"], run["end_date"], run["ghe"]
+    replayed = rebuild_contributors(logged_events, start_date, end_date, ghe)
+    if start_date and end_date:
+        returning_contributors = rebuild_contributors(
+            logged_events, "2008-02-29", start_date, ghe
+        )
+        for contributor in replayed:
+            contributor.new_contributor = contributor_stats.is_new_contributor(
+                contributor.username, returning_contributors
+            )
+
+    contributors.write_reports(
+        replayed,
+        output_filename,
+        "contributors.json",
+        start_date,
+        end_date,
+        organization,
+        repository_list,
+        False,
+        link_to_profile,
+        ghe,
+        show_avatar,
+        time_series,
+        contributor_analytics,
+        output_formats,
+    )
+
+
+def rebuild_contributors(
+    logged_events: list, start_date: str, end_date: str, ghe: str
+) -> list:
+    """
+    Rebuild the merged contributors of one date range from its events.
+
+    Args:
+        logged_events (list): The events read from the event log
+        start_date (str): The start date the contributors were fetched for
+        end_date (str): The end date the contributors were fetched for
+        ghe (str): The GitHub Enterprise URL, if applicable.
+
+    Returns:
+        contributors (list): A list of ContributorStats objects
+    """
+    repo_contributor_data: dict = {}
+    for event in logged_events:
+        if (event["since"], event["until"]) != (start_date, end_date):
+            continue
+        data = repo_contributor_data.setdefault(event["repository"], {}).setdefault(
+            event["login"],
+            {"avatar_url": event["avatar_url"], "contribution_count": 0, "weeks": {}},
+        )
+        data["contribution_count"] += event["commits"]
+        if event["week"]:
+            data["weeks"][event["week"]] = (
+                data["weeks"].get(event["week"], 0) + event["commits"]
+            )
+
+    if start_date and end_date:
+        repo_contributors = [
+            contributors.build_contributors(
+                repo_full_name, contributor_data, start_date, end_date, ghe
+            )
+            for repo_full_name, contributor_data in repo_contributor_data.items()
+        ]
+    else:
+        endpoint = ghe if ghe else "https://github.com"
+        repo_contributors = [
+            [
+                contributor_stats.ContributorStats(
+                    login,
+                    False,
+                    data["avatar_url"],
+                    data["contribution_count"],
+                    f"{endpoint}/{repo_full_name}/commits?author={login}",
+                    "",
+                    repository_counts={repo_full_name: data["contribution_count"]},
+                )
+                for login, data in contributor_data.items()
+            ]
+            for repo_full_name, contributor_data in repo_contributor_data.items()
+        ]
+    return contributor_stats.merge_contributors(repo_contributors)
+
+
+if __name__ == "__main__":
+    main()
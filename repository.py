@@ -0,0 +1,151 @@
+"""This module contains a lightweight handle for a repository known only by its name."""
+
+import sys
+
+import github3
+import paginator
+
+# The statistics endpoint only lists this many authors, the most active ones
+STATS_MAX_AUTHORS = 100
+
+
+class RepositoryHandle:
+    """
+    A repository built from its "owner/name" string without any API request.
+
+    It lists commits and contributors directly from their endpoints, so
+    contributor data can be fetched without first requesting the repository
+    itself. The full repository metadata is only requested the first time
+    the metadata attribute is read.
+
+    Attributes:
+        full_name (str): The "owner/name" of the repository
+        owner (str): The owner of the repository
+        name (str): The name of the repository
+    """
+
+    def __init__(
+        self, github_connection: object, full_name: str, metadata: object = None
+    ):
+        """Initialize the handle, optionally with metadata that is already known"""
+        self.full_name = full_name
+        self.owner, self.name = full_name.split("/")
+        self._github_connection = github_connection
+        self._metadata = metadata
+
+    def __repr__(self) -> str:
+        """Return the representation of the repository handle"""
+        return f"RepositoryHandle(full_name={self.full_name})"
+
+    @property
+    def metadata(self) -> object:
+        """The github3 Repository object, requested on first access"""
+        if self._metadata is None:
+            self._metadata = self._github_connection.repository(self.owner, self.name)
+        return self._metadata
+
+    @property
+    def listing(self) -> dict:
+        """The raw JSON the repository was listed with, empty when it is not known"""
+        if self._metadata is None:
+            return {}
+        return self._metadata.as_dict()
+
+    def commits(self, since: str | None = None, until: str | None = None):
+        """Iterate over the commits of the default branch, optionally between two dates"""
+        params = {}
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        return self._iter("commits", github3.repos.commit.ShortCommit, params)
+
+    def commit_authors(
+        self,
+        since: str | None = None,
+        until: str | None = None,
+        prefetch_pages: int | None = None,
+    ):
+        """
+        Yield the author of every commit, read straight from the raw page JSON.
+
+        This skips building github3 commit and user models, which dominates
+        the CPU time of scanning large repositories. Logins are interned since
+        the same few authors repeat across thousands of commits.
+
+        Args:
+            since (str): Only commits after this ISO 8601 date
+            until (str): Only commits before this ISO 8601 date
+            prefetch_pages (int): The last page fetched ahead, for callers
+                that stop reading early
+
+        Yields:
+            (login, avatar_url, committed_date, sha) tuples, where login and
+            avatar_url are None for commits without a linked GitHub user
+        """
+        params: dict = {"per_page": 100}
+        if since:
+            params["since"] = since
+        if until:
+            params["until"] = until
+        url = self._github_connection.session.build_url(
+            "repos", self.owner, self.name, "commits"
+        )
+        for page in paginator.iter_json_pages(
+            self._github_connection.session,
+            url,
+            params,
+            prefetch_pages=prefetch_pages,
+        ):
+            for commit in page:
+                author = commit["author"]
+                committed_date = commit["commit"]["committer"]["date"]
+                if author:
+                    login = sys.intern(author["login"])
+                    yield login, author["avatar_url"], committed_date, commit["sha"]
+                else:
+                    yield None, None, committed_date, commit["sha"]
+
+    def contributor_statistics(self) -> list | None:
+        """
+        Return the all-time commit count of each author from the statistics endpoint.
+
+        GitHub computes the statistics in the background and answers 202
+        until they are ready.
+
+        Returns:
+            (login, avatar_url, commits) tuples, or None while the statistics
+            are being computed
+        """
+        url = self._github_connection.session.build_url(
+            "repos", self.owner, self.name, "stats", "contributors"
+        )
+        response = self._github_connection.session.get(url)
+        if response.status_code == 202:
+            return None
+        if response.status_code == 204:
+            return []
+        if response.status_code != 200:
+            raise github3.exceptions.error_for(response)
+        return [
+            (
+                sys.intern(author["author"]["login"]),
+                author["author"]["avatar_url"],
+                author["total"],
+            )
+            for author in response.json()
+            if author["author"]
+        ]
+
+    def contributors(self):
+        """Iterate over the all-time contributors of the repository"""
+        return self._iter("contributors", github3.users.Contributor, {})
+
+    def _iter(self, endpoint: str, cls: type, params: dict):
+        """Return a github3 iterator over a paginated endpoint of this repository"""
+        url = self._github_connection.session.build_url(
+            "repos", self.owner, self.name, endpoint
+        )
+        return github3.structs.GitHubIterator(
+            -1, url, cls, self._github_connection, params
+        )
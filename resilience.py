@@ -0,0 +1,83 @@
+"""This module contains the backoff and circuit breaker used when GitHub fails."""
+
+import random
+import threading
+import time
+
+# The first retry waits up to this many seconds, doubling with each attempt
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+# Consecutive failures of a host that open its circuit
+FAILURE_THRESHOLD = 5
+# How long an open circuit pauses the requests to its host, doubling each
+# time it opens again without a success in between
+OPEN_SECONDS = 15.0
+MAX_OPEN_SECONDS = 240.0
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Return how long to wait before retrying, in seconds.
+
+    The delay is drawn at random below an exponentially growing cap ("full
+    jitter"), so workers that failed together do not retry together.
+
+    Args:
+        attempt (int): The number of the retry, starting at 1
+
+    Returns:
+        float: The number of seconds to wait
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Pauses the requests to a host that keeps failing.
+
+    After FAILURE_THRESHOLD connection errors or server errors in a row, the
+    circuit of the host opens and every request to it waits until the pause
+    is over instead of adding load to a service that is down. The first
+    request after the pause probes the host: another failure opens the
+    circuit again for twice as long, a success closes it.
+    """
+
+    def __init__(self):
+        """Initialize the breaker with every circuit closed"""
+        # host -> {"failures": int, "open_until": float, "open_seconds": float}
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host: str) -> None:
+        """Wait until the circuit of a host lets requests through"""
+        with self._lock:
+            pause = self._state(host)["open_until"] - time.monotonic()
+        if pause > 0:
+            print(f"{host} keeps failing, pausing its requests for {pause:.0f}s")
+            time.sleep(pause)
+
+    def record(self, host: str, failed: bool) -> None:
+        """Record the outcome of a request to a host"""
+        with self._lock:
+            state = self._state(host)
+            if not failed:
+                state["failures"] = 0
+                state["open_seconds"] = OPEN_SECONDS
+                return
+            state["failures"] += 1
+            if state["failures"] >= FAILURE_THRESHOLD:
+                state["open_until"] = time.monotonic() + state["open_seconds"]
+                state["open_seconds"] = min(state["open_seconds"] * 2, MAX_OPEN_SECONDS)
+                # The probe after the pause decides on its own
+                state["failures"] = FAILURE_THRESHOLD - 1
+
+    def is_open(self, host: str) -> bool:
+        """Check if the requests to a host are paused"""
+        with self._lock:
+            return self._state(host)["open_until"] > time.monotonic()
+
+    def _state(self, host: str) -> dict:
+        """Return the circuit of a host, with _lock held"""
+        return self._hosts.setdefault(
+            host, {"failures": 0, "open_until": 0.0, "open_seconds": OPEN_SECONDS}
+        )
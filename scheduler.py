@@ -0,0 +1,65 @@
+"""This module orders repositories so that the most expensive ones are fetched first."""
+
+import cache
+
+# The commit counts of the previous run, kept in the cache directory
+COSTS_FILENAME = "repository_costs.json"
+# A rough number of commits per KB of repository size, to estimate the cost
+# of repositories the previous run did not count
+COMMITS_PER_KB = 0.25
+
+
+def load_costs(cache_dir: str) -> dict:
+    """
+    Load the commit counts recorded for each repository by the previous run.
+
+    Args:
+        cache_dir (str): The cache directory, nothing is loaded when empty
+
+    Returns:
+        costs (dict): Maps each "owner/name" to its commit count
+    """
+    return cache.load(cache_dir, COSTS_FILENAME)
+
+
+def save_costs(cache_dir: str, costs: dict) -> None:
+    """
+    Record the commit counts of each repository for the next run.
+
+    Args:
+        cache_dir (str): The cache directory, nothing is saved when empty
+        costs (dict): Maps each "owner/name" to its commit count
+    """
+    cache.save(cache_dir, COSTS_FILENAME, costs)
+
+
+def order_by_cost(repos: list, costs: dict) -> list:
+    """
+    Order repositories from the most to the least expensive to fetch.
+
+    When repositories are fetched concurrently, the run ends when the
+    slowest one does. Starting the biggest ones first keeps them from being
+    picked up last, after every other worker has gone idle.
+
+    The cost of a repository is its commit count in the previous run or,
+    for a repository that run did not count, an estimate from its size in
+    the organization listing, so a new monorepo still starts early. Equal
+    costs are ordered by how recently the repositories were pushed to.
+    Repositories without any of these keep their original order at the end.
+
+    Args:
+        repos (list): The RepositoryHandle objects to order
+        costs (dict): The commit counts recorded by the previous run
+
+    Returns:
+        repos (list): The same repositories, most expensive first
+    """
+
+    def estimated_cost(repo) -> tuple:
+        listing = repo.listing
+        cost = costs.get(repo.full_name)
+        if cost is None:
+            cost = (listing.get("size") or 0) * COMMITS_PER_KB
+        return cost, listing.get("pushed_at") or ""
+
+    return sorted(repos, key=estimated_cost, reverse=True)
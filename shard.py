@@ -0,0 +1,106 @@
+"""This module splits a run into shards and combines their partial results."""
+
+import glob
+import hashlib
+import json
+import os
+
+import contributor_stats
+
+# The partial result each shard writes, to be collected by the reduce step
+PARTIAL_FILENAME = "contributors-shard-{index}.json"
+
+
+def in_shard(repo_full_name: str, shard_index: int, shard_count: int) -> bool:
+    """
+    Check if a repository belongs to a shard.
+
+    Repositories are assigned by a hash of their name, so every job of a
+    matrix computes the same assignment without talking to the others, and
+    the assignment stays the same when repositories are added or removed.
+
+    Args:
+        repo_full_name (str): The "owner/name" of the repository
+        shard_index (int): The index of the shard, from 0 to shard_count - 1
+        shard_count (int): The number of shards the run is split into
+
+    Returns:
+        bool: True if the repository is processed by this shard
+    """
+    digest = hashlib.sha256(repo_full_name.lower().encode("utf-8")).hexdigest()
+    return int(digest, 16) % shard_count == shard_index
+
+
+def write_partial(
+    shard_index: int, contributors: list, returning_contributors: list
+) -> str:
+    """
+    Write the partial result of a shard.
+
+    Args:
+        shard_index (int): The index of the shard
+        contributors (list): The ContributorStats objects of the date range
+        returning_contributors (list): The ContributorStats objects from
+            before the date range
+
+    Returns:
+        filename (str): The name of the file written
+    """
+    filename = PARTIAL_FILENAME.format(index=shard_index)
+    data = {
+        "shard_index": shard_index,
+        "contributors": [contributor.__dict__ for contributor in contributors],
+        "returning_contributors": [
+            contributor.__dict__ for contributor in returning_contributors
+        ],
+    }
+    with open(filename, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    return filename
+
+
+def read_partials(directory: str, shard_count: int) -> tuple[list, list]:
+    """
+    Combine the partial results of every shard.
+
+    Partial files are searched recursively, so downloaded artifacts can be
+    used as they are. Contributors found in several shards are merged the
+    same way contributors found in several repositories are.
+
+    Args:
+        directory (str): The directory holding the partial results
+        shard_count (int): The number of shards the run was split into
+
+    Returns:
+        contributors (list): The merged ContributorStats objects of the date range
+        returning_contributors (list): The merged ContributorStats objects from
+            before the date range
+    """
+    partials = {}
+    pattern = os.path.join(directory, "**", PARTIAL_FILENAME.format(index="*"))
+    for filename in glob.glob(pattern, recursive=True):
+        with open(filename, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        partials[data["shard_index"]] = data
+
+    missing = sorted(set(range(shard_count)) - set(partials))
+    if missing:
+        raise ValueError(f"Missing the partial results of shards {missing}")
+
+    contributors = []
+    returning_contributors = []
+    for index in sorted(partials):
+        data = partials[index]
+        contributors.append(_load_contributors(data["contributors"]))
+        returning_contributors.append(
+            _load_contributors(data["returning_contributors"])
+        )
+    return (
+        contributor_stats.merge_contributors(contributors),
+        contributor_stats.merge_contributors(returning_contributors),
+    )
+
+
+def _load_contributors(saved: list) -> list:
+    """Rebuild ContributorStats objects from their saved attributes"""
+    return [contributor_stats.ContributorStats(**data) for data in saved]
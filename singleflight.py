@@ -0,0 +1,87 @@
+"""This module makes identical API requests of a run share one response."""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Hashable
+
+# Upper bound of completed responses kept for the rest of the run
+MEMO_SIZE = 128
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key and memoizes their results.
+
+    The first call with a key runs; calls with the same key arriving while
+    it is in flight wait for it and get its result instead of running again.
+    Results the caller marks as reusable are then kept for the rest of the
+    run in a least recently used cache of up to max_entries results.
+
+    Attributes:
+        max_entries (int): The number of completed results kept
+        metrics (dict): The calls "coalesced" with one in flight and the
+            calls served from the "memoized" results
+    """
+
+    def __init__(self, max_entries: int = MEMO_SIZE):
+        """Initialize with nothing in flight and nothing memoized"""
+        self.max_entries = max_entries
+        self.metrics = {"coalesced": 0, "memoized": 0}
+        self._in_flight: dict[Hashable, Future] = {}
+        self._memo: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        call: Callable[[], object],
+        reusable: Callable[[object], bool] = lambda _: True,
+    ) -> tuple[object, bool]:
+        """
+        Run a call unless an identical one is in flight or memoized.
+
+        Args:
+            key (Hashable): Identifies calls that return the same result
+            call (Callable): Returns the result
+            reusable (Callable): Tells if a result may be memoized
+
+        Returns:
+            tuple: The result and whether it is shared with another call
+        """
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.metrics["memoized"] += 1
+                return self._memo[key], True
+            waiting = self._in_flight.get(key)
+            if waiting is None:
+                future: Future = Future()
+                self._in_flight[key] = future
+            else:
+                self.metrics["coalesced"] += 1
+        if waiting is not None:
+            return waiting.result(), True
+
+        try:
+            result = call()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if self.max_entries > 0 and reusable(result):
+                self._memo[key] = result
+                while len(self._memo) > self.max_entries:
+                    self._memo.popitem(last=False)
+        future.set_result(result)
+        return result, False
+
+    def summary(self) -> str:
+        """Return the run metrics as a line of text"""
+        return (
+            f"{self.metrics['coalesced']} requests coalesced, "
+            f"{self.metrics['memoized']} served from memory"
+        )
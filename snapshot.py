@@ -0,0 +1,141 @@
+"""This module compares the contributors of a run with a previous JSON report."""
+
+import json
+
+# How many characters of the previous report are read at a time
+CHUNK_SIZE = 1 << 16
+
+_DECODER = json.JSONDecoder()
+
+
+def load_previous_counts(filename: str) -> dict:
+    """
+    Read the contribution count of each contributor of a previous JSON report.
+
+    The report is parsed as a stream, one contributor at a time, so only
+    the usernames and their counts are held in memory, not the whole file.
+
+    Args:
+        filename (str): The contributors.json written by an earlier run
+
+    Returns:
+        previous_counts (dict): Maps each username to its contribution count,
+            in the order of the report
+    """
+    previous_counts = {}
+    with open(filename, "r", encoding="utf-8") as f:
+        reader = _StreamReader(f)
+        reader.expect("{")
+        while reader.peek() != "}":
+            key = reader.value()
+            reader.expect(":")
+            if key == "contributors":
+                reader.expect("[")
+                while reader.peek() != "]":
+                    contributor = reader.value()
+                    previous_counts[contributor["username"]] = contributor[
+                        "contribution_count"
+                    ]
+                    if reader.peek() == ",":
+                        reader.expect(",")
+                reader.expect("]")
+            else:
+                reader.value()
+            if reader.peek() == ",":
+                reader.expect(",")
+    return previous_counts
+
+
+def diff(previous_counts: dict, contributors: list) -> dict:
+    """
+    Compare the contributors of a run with the counts of a previous report.
+
+    Every contributor is looked up once in the index of the previous
+    report and removed from it, so whoever is left in the index vanished.
+
+    Args:
+        previous_counts (dict): Maps each username of the previous report to
+            its contribution count, from load_previous_counts
+        contributors (list): The merged ContributorStats objects of the run
+
+    Returns:
+        delta (dict): The keys 'appeared' and 'vanished', lists of dicts with
+            the keys 'username' and 'contribution_count', and 'changed', a
+            list of dicts with the keys 'username', 'previous_count',
+            'contribution_count' and 'change'
+    """
+    remaining = dict(previous_counts)
+    appeared, changed = [], []
+    for contributor in contributors:
+        previous_count = remaining.pop(contributor.username, None)
+        if previous_count is None:
+            appeared.append(
+                {
+                    "username": contributor.username,
+                    "contribution_count": contributor.contribution_count,
+                }
+            )
+        elif previous_count != contributor.contribution_count:
+            changed.append(
+                {
+                    "username": contributor.username,
+                    "previous_count": previous_count,
+                    "contribution_count": contributor.contribution_count,
+                    "change": contributor.contribution_count - previous_count,
+                }
+            )
+    vanished = [
+        {"username": username, "contribution_count": count}
+        for username, count in remaining.items()
+    ]
+    return {"appeared": appeared, "vanished": vanished, "changed": changed}
+
+
+class _StreamReader:
+    """Decode the JSON values of a file one at a time, reading it in chunks"""
+
+    def __init__(self, f):
+        self._file = f
+        self._buffer = ""
+        self._position = 0
+
+    def peek(self) -> str:
+        """Return the next character that is not whitespace, without consuming it"""
+        while True:
+            while self._position < len(self._buffer):
+                if not self._buffer[self._position].isspace():
+                    return self._buffer[self._position]
+                self._position += 1
+            if not self._fill():
+                raise ValueError(f"{self._file.name} ends before the report does")
+
+    def expect(self, character: str) -> None:
+        """Consume the next character that is not whitespace, which must be character"""
+        if self.peek() != character:
+            raise ValueError(f"{self._file.name} is not a contributors JSON report")
+        self._position += 1
+
+    def value(self):
+        """Decode and consume the next value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may go on in the next chunk
+            if end < len(self._buffer) or not self._fill():
+                self._position = end
+                return value
+
+    def _fill(self) -> bool:
+        """Read the next chunk into the buffer, False at the end of the file"""
+        chunk = self._file.read(CHUNK_SIZE)
+        if not chunk:
+            return False
+        unread = self._position
+        self._buffer = self._buffer[unread:] + chunk
+        self._position = 0
+        return True
@@ -0,0 +1,124 @@
+"""Test cases for the analytics module."""
+
+import random
+import unittest
+
+import analytics
+from contributor_stats import ContributorStats
+
+
+def contributor(username, repository_counts, new_contributor=False):
+    """Return a ContributorStats with the given counts per repository"""
+    stats = ContributorStats(
+        username,
+        False,
+        "url",
+        sum(repository_counts.values()),
+        "commit_url",
+        "",
+        repository_counts=repository_counts,
+    )
+    stats.new_contributor = new_contributor
+    return stats
+
+
+class TestSummarize(unittest.TestCase):
+    """
+    Test case for the summarize function.
+    """
+
+    def test_summarize(self):
+        """Test the overall and per repository statistics."""
+        contributors = [
+            contributor("user1", {"org/repo1": 4, "org/repo2": 1}),
+            contributor("user2", {"org/repo1": 3}),
+            contributor("user3", {"org/repo1": 3}, new_contributor=True),
+            contributor("user4", {"org/repo2": 4, "org/repo3": 0}, True),
+        ]
+
+        self.assertEqual(
+            analytics.summarize(contributors),
+            {
+                "top_contributors": 10,
+                "top_share": 100.0,
+                "gini": 0.117,
+                "percentiles": {"p50": 3.5, "p90": 4.7, "p99": 4.97},
+                "repositories": {
+                    "org/repo1": {
+                        "contributors": 3,
+                        "bus_factor": 2,
+                        "new_contributor_rate": 33.33,
+                    },
+                    "org/repo2": {
+                        "contributors": 2,
+                        "bus_factor": 1,
+                        "new_contributor_rate": 50.0,
+                    },
+                },
+            },
+        )
+
+    def test_summarize_top_share(self):
+        """Test the top share adds up only the busiest contributors."""
+        contributors = [
+            contributor(f"user{number}", {"org/repo": 1}) for number in range(11)
+        ]
+
+        summary = analytics.summarize(contributors)
+
+        self.assertEqual(summary["top_share"], 90.91)
+        self.assertEqual(summary["gini"], 0.0)
+        self.assertEqual(summary["repositories"]["org/repo"]["bus_factor"], 6)
+
+    def test_summarize_without_contributors(self):
+        """Test an empty run has empty statistics."""
+        self.assertEqual(
+            analytics.summarize([]),
+            {
+                "top_contributors": 10,
+                "top_share": 0.0,
+                "gini": 0.0,
+                "percentiles": {"p50": 0.0, "p90": 0.0, "p99": 0.0},
+                "repositories": {},
+            },
+        )
+
+    @unittest.skipIf(analytics.numpy is None, "numpy is not installed")
+    def test_arrays_and_lists_agree(self):
+        """Test the numpy and plain Python statistics are the same."""
+        generator = random.Random(46)
+        repository_count = 20
+        rows, columns, counts = [], [], []
+        totals = []
+        for row in range(300):
+            repositories = generator.sample(
+                range(repository_count), generator.randint(1, 4)
+            )
+            total = 0
+            for column in repositories:
+                count = generator.choice([1, 1, 2, 3, 5, 8, 40])
+                rows.append(row)
+                columns.append(column)
+                counts.append(count)
+                total += count
+            totals.append(total)
+        new = [generator.random() < 0.2 for _ in totals]
+        arguments = (totals, new, rows, columns, counts, repository_count)
+
+        from_arrays = analytics._summarize_arrays(  # pylint: disable=protected-access
+            *arguments
+        )
+        from_lists = analytics._summarize_lists(  # pylint: disable=protected-access
+            *arguments
+        )
+
+        for array_values, list_values in zip(from_arrays[2:], from_lists[2:]):
+            self.assertEqual(len(array_values), len(list_values))
+            for array_value, list_value in zip(array_values, list_values):
+                self.assertAlmostEqual(float(array_value), float(list_value))
+        self.assertAlmostEqual(float(from_arrays[0]), float(from_lists[0]))
+        self.assertAlmostEqual(float(from_arrays[1]), float(from_lists[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
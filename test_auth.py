@@ -1,27 +1,40 @@
 """Test cases for the auth module."""
 
+import datetime
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import auth
+import paginator
 import requests
 
+API_URL = "https://api.github.com/repos/owner/repo/commits"
+INSTALLATION_TOKEN = {
+    "token": "installation_token",
+    "expires_at": "2099-01-01T00:00:00Z",
+}
+
 
 class TestAuth(unittest.TestCase):
     """
     Test case for the auth module.
     """
 
-    @patch("github3.login")
-    def test_auth_to_github_with_token(self, mock_login):
+    @patch("github3.github.GitHub")
+    def test_auth_to_github_with_token(self, mock_gh):
         """
         Test the auth_to_github function when the token is provided.
         """
-        mock_login.return_value = "Authenticated to GitHub.com"
+        mock_gh.return_value = "Authenticated to GitHub.com"
 
         result = auth.auth_to_github("token", "", "", b"", "", False)
 
         self.assertEqual(result, "Authenticated to GitHub.com")
+        _, kwargs = mock_gh.call_args
+        self.assertEqual(kwargs["token"], "token")
+        self.assertIsInstance(kwargs["session"], paginator.PrefetchingSession)
 
     def test_auth_to_github_without_token(self):
         """
@@ -54,11 +67,16 @@ class TestAuth(unittest.TestCase):
         Test the auth_to_github function when the GitHub Enterprise URL is provided and the app was created in GitHub Enterprise URL.
         """
         mock = mock_ghe.return_value
-        mock.login_as_app_installation = MagicMock(return_value=True)
-        result = auth.auth_to_github(
-            "", "123", "123", b"123", "https://github.example.com", True
+        with patch(
+            "auth._create_installation_token", return_value=INSTALLATION_TOKEN
+        ) as mock_create:
+            result = auth.auth_to_github(
+                "", "123", "123", b"123", "https://github.example.com", True
+            )
+        mock_create.assert_called_once_with(
+            "https://github.example.com", "123", b"123", "123"
         )
-        mock.login_as_app_installation.assert_called_once()
+        self.assertIsInstance(mock.session.auth, auth.AppInstallationTokenManager)
         self.assertEqual(result, mock)
 
     @patch("github3.github.GitHub")
@@ -67,58 +85,40 @@ class TestAuth(unittest.TestCase):
         Test the auth_to_github function when app credentials are provided
         """
         mock = mock_gh.return_value
-        mock.login_as_app_installation = MagicMock(return_value=True)
-        result = auth.auth_to_github(
-            "", "123", "123", b"123", "https://github.example.com", False
-        )
-        mock.login_as_app_installation.assert_called_once()
+        with patch(
+            "auth._create_installation_token", return_value=INSTALLATION_TOKEN
+        ) as mock_create:
+            result = auth.auth_to_github(
+                "", "123", "123", b"123", "https://github.example.com", False
+            )
+        # the app is not enterprise only, so the token comes from github.com
+        mock_create.assert_called_once_with("", "123", b"123", "123")
+        self.assertIsInstance(mock.session.auth, auth.AppInstallationTokenManager)
         self.assertEqual(result, mock)
 
-    @patch("github3.apps.create_jwt_headers", MagicMock(return_value="gh_token"))
-    @patch("requests.post")
-    def test_get_github_app_installation_token(self, mock_post):
-        """
-        Test the get_github_app_installation_token function.
-        """
-        dummy_token = "dummytoken"
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {"token": dummy_token}
-        mock_post.return_value = mock_response
-
-        result = auth.get_github_app_installation_token(
-            b"ghe", "gh_private_token", "gh_app_id", "gh_installation_id"
-        )
-
-        self.assertEqual(result, dummy_token)
-
-    @patch("github3.apps.create_jwt_headers", MagicMock(return_value="gh_token"))
-    @patch("auth.requests.post")
-    def test_get_github_app_installation_token_request_failure(self, mock_post):
+    @patch("github3.github.GitHub")
+    def test_auth_to_github_with_app_uses_given_token_manager(self, mock_gh):
         """
-        Test the get_github_app_installation_token function returns None when the request fails.
+        Test the auth_to_github function authenticates with the given token manager
+        and raises when it cannot mint a token.
         """
-        # Mock the post request to raise a RequestException
-        mock_post.side_effect = requests.exceptions.RequestException("Request failed")
-
-        # Call the function with test data
-        result = auth.get_github_app_installation_token(
-            ghe="https://api.github.com",
-            gh_app_id=12345,
-            gh_app_private_key_bytes=b"private_key",
-            gh_app_installation_id=678910,
-        )
+        token_manager = MagicMock()
+        token_manager.token.return_value = "installation_token"
+        result = auth.auth_to_github("", "123", "123", b"123", "", False, token_manager)
+        self.assertIs(result.session.auth, token_manager)
 
-        # Assert that the result is None
-        self.assertIsNone(result)
+        token_manager.token.return_value = None
+        with self.assertRaises(ValueError):
+            auth.auth_to_github("", "123", "123", b"123", "", False, token_manager)
+        mock_gh.assert_called()
 
-    @patch("github3.login")
-    def test_auth_to_github_invalid_credentials(self, mock_login):
+    @patch("github3.github.GitHub")
+    def test_auth_to_github_invalid_credentials(self, mock_gh):
         """
         Test the auth_to_github function raises correct ValueError
         when credentials are present but incorrect.
         """
-        mock_login.return_value = None
+        mock_gh.return_value = None
         with self.assertRaises(ValueError) as context_manager:
             auth.auth_to_github("not_a_valid_token", "", "", b"", "", False)
 
@@ -129,5 +129,188 @@ class TestAuth(unittest.TestCase):
         )
 
 
+class TestAppInstallationTokenManager(unittest.TestCase):
+    """
+    Test case for the AppInstallationTokenManager class.
+    """
+
+    def setUp(self):
+        self.manager = auth.AppInstallationTokenManager("", 123, b"key", 456)
+
+    @patch("auth._create_installation_token")
+    def test_token_is_reused_until_close_to_expiry(self, mock_create):
+        """Test one token is minted and reused while it is valid."""
+        mock_create.return_value = INSTALLATION_TOKEN
+
+        self.assertEqual(self.manager.token(), "installation_token")
+        self.assertEqual(self.manager.token(), "installation_token")
+        mock_create.assert_called_once_with("", 123, b"key", 456)
+
+    @patch("auth._create_installation_token")
+    def test_token_is_refreshed_before_expiry(self, mock_create):
+        """Test a token expiring within the refresh margin is replaced."""
+        expires_soon = datetime.datetime.now(
+            datetime.timezone.utc
+        ) + datetime.timedelta(minutes=1)
+        mock_create.side_effect = [
+            {"token": "old", "expires_at": expires_soon.isoformat()},
+            {"token": "new", "expires_at": "2099-01-01T00:00:00Z"},
+        ]
+
+        self.assertEqual(self.manager.token(), "old")
+        self.assertEqual(self.manager.token(), "new")
+        self.assertEqual(mock_create.call_count, 2)
+
+    @patch("auth._create_installation_token", return_value=None)
+    def test_token_is_none_when_minting_fails(self, _mock_create):
+        """Test the manager returns None when no token could be minted."""
+        self.assertIsNone(self.manager.token())
+
+    @patch("github3.apps.create_jwt_headers", MagicMock(return_value="gh_token"))
+    @patch("auth.transport.session")
+    def test_token_is_requested_for_the_installation(self, mock_session):
+        """Test the token is minted from the access tokens of the installation."""
+        mock_post = mock_session.return_value.post
+        mock_post.return_value.json.return_value = INSTALLATION_TOKEN
+
+        self.assertEqual(self.manager.token(), "installation_token")
+        self.assertEqual(
+            mock_post.call_args.args[0],
+            "https://api.github.com/app/installations/456/access_tokens",
+        )
+
+    @patch("github3.apps.create_jwt_headers", MagicMock(return_value="gh_token"))
+    @patch("auth.transport.session")
+    def test_token_is_none_when_the_request_fails(self, mock_session):
+        """Test a failed token request is reported as no token."""
+        mock_session.return_value.post.side_effect = (
+            requests.exceptions.RequestException("Request failed")
+        )
+
+        self.assertIsNone(self.manager.token())
+
+    @patch("auth._create_installation_token", return_value=INSTALLATION_TOKEN)
+    def test_call_sets_authorization_header(self, _mock_create):
+        """Test the manager authenticates requests with the current token."""
+        request = MagicMock()
+        request.headers = {}
+
+        self.assertIs(self.manager(request), request)
+        self.assertEqual(request.headers["Authorization"], "token installation_token")
+
+    @patch("auth._create_installation_token", return_value=INSTALLATION_TOKEN)
+    def test_get_github_app_installation_token(self, mock_create):
+        """Test the one-off token function mints its token through a manager."""
+        self.assertEqual(
+            auth.get_github_app_installation_token("", 123, b"key", 456),
+            "installation_token",
+        )
+        mock_create.assert_called_once_with("", 123, b"key", 456)
+
+    @patch("auth._create_installation_token")
+    def test_concurrent_callers_share_one_refresh(self, mock_create):
+        """Test concurrent callers wait for one refresh instead of minting their own."""
+        mock_create.return_value = INSTALLATION_TOKEN
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: self.manager.token(), range(32)))
+
+        self.assertEqual(set(tokens), {"installation_token"})
+        mock_create.assert_called_once()
+
+
+class TestCredentialPool(unittest.TestCase):
+    """
+    Test case for the CredentialPool class.
+    """
+
+    def make_response(self, url, remaining, resource="core", reset=None):
+        """Build a response carrying rate limit headers."""
+        response = MagicMock()
+        response.url = url
+        response.headers = {
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset or time.time() + 3600),
+            "X-RateLimit-Resource": resource,
+        }
+        return response
+
+    def authenticate(self, pool, url):
+        """Send a fake request through the pool and return it."""
+        request = requests.Request("GET", url).prepare()
+        return pool(request)
+
+    def test_blank_tokens_are_dropped(self):
+        """Test the pool strips tokens and drops empty entries."""
+        pool = auth.CredentialPool([" token1", "token2 ", ""])
+        self.assertEqual(pool.credentials, ["token1", "token2"])
+
+    def test_requests_are_spread_before_rate_limits_are_known(self):
+        """Test concurrent requests alternate between fresh credentials."""
+        pool = auth.CredentialPool(["token1", "token2"])
+        headers = [
+            self.authenticate(pool, API_URL).headers["Authorization"] for _ in range(4)
+        ]
+        self.assertEqual(
+            headers, ["token token1", "token token2", "token token1", "token token2"]
+        )
+
+    def test_credential_with_most_quota_is_picked(self):
+        """Test reported rate limits steer requests to the fullest credential."""
+        pool = auth.CredentialPool(["token1", "token2"])
+        first = self.authenticate(pool, API_URL)
+        first.hooks["response"][0](self.make_response(API_URL, 10))
+        second = self.authenticate(pool, API_URL)
+        second.hooks["response"][0](self.make_response(API_URL, 4000))
+
+        for _ in range(3):
+            request = self.authenticate(pool, API_URL)
+            self.assertEqual(request.headers["Authorization"], "token token2")
+
+    def test_rate_limits_are_tracked_per_resource(self):
+        """Test an exhausted search budget does not affect core requests."""
+        pool = auth.CredentialPool(["token1", "token2"])
+        search_url = "https://api.github.com/search/commits"
+        request = self.authenticate(pool, search_url)
+        request.hooks["response"][0](self.make_response(search_url, 0, "search"))
+
+        self.assertEqual(
+            self.authenticate(pool, search_url).headers["Authorization"],
+            "token token2",
+        )
+        self.assertEqual(
+            self.authenticate(pool, API_URL).headers["Authorization"], "token token1"
+        )
+
+    def test_rate_limit_resets(self):
+        """Test a credential is used again once its rate limit window has reset."""
+        pool = auth.CredentialPool(["token1", "token2"])
+        request = self.authenticate(pool, API_URL)
+        request.hooks["response"][0](
+            self.make_response(API_URL, 0, reset=time.time() - 1)
+        )
+
+        self.assertEqual(
+            self.authenticate(pool, API_URL).headers["Authorization"], "token token1"
+        )
+
+    def test_token_resolves_app_installations(self):
+        """Test token returns the current token of a pooled App installation."""
+        token_manager = MagicMock()
+        token_manager.token.return_value = "installation_token"
+        pool = auth.CredentialPool([token_manager])
+
+        self.assertEqual(pool.token(), "installation_token")
+
+    @patch("github3.github.GitHub")
+    def test_auth_to_github_pools_comma_separated_tokens(self, mock_gh):
+        """Test auth_to_github authenticates with a pool for several tokens."""
+        result = auth.auth_to_github("token1,token2", "", "", b"", "", False)
+
+        self.assertIsInstance(result.session.auth, auth.CredentialPool)
+        self.assertEqual(result.session.auth.credentials, ["token1", "token2"])
+        mock_gh.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,47 @@
+"""Test cases for the cache module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import cache
+
+
+class TestCache(unittest.TestCase):
+    """
+    Test case for the cache module.
+    """
+
+    def setUp(self):
+        self.cache_dir = os.path.join(tempfile.mkdtemp(), "cache")
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.cache_dir))
+
+    def test_save_and_load(self):
+        """Test a saved document is loaded by the next run."""
+        self.assertEqual(cache.load(self.cache_dir, "data.json"), {})
+
+        cache.save(self.cache_dir, "data.json", {"org/repo": "stats"})
+
+        self.assertEqual(cache.load(self.cache_dir, "data.json"), {"org/repo": "stats"})
+        self.assertEqual(os.listdir(self.cache_dir), ["data.json"])
+
+    def test_load_corrupt_document(self):
+        """Test a corrupt document is ignored."""
+        os.makedirs(self.cache_dir)
+        with open(
+            os.path.join(self.cache_dir, "data.json"), "w", encoding="utf-8"
+        ) as cache_file:
+            cache_file.write("{")
+
+        self.assertEqual(cache.load(self.cache_dir, "data.json"), {})
+
+    def test_without_cache_dir(self):
+        """Test nothing is loaded or saved without a cache directory."""
+        cache.save("", "data.json", {"org/repo": "stats"})
+
+        self.assertEqual(cache.load("", "data.json"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
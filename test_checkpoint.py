@@ -0,0 +1,105 @@
+"""Test cases for the checkpoint module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from checkpoint import Checkpoint
+from contributor_stats import ContributorStats
+
+
+class TestCheckpoint(unittest.TestCase):
+    """
+    Test case for the Checkpoint class.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.checkpoint = Checkpoint(
+            self.directory, "org", [], "2022-01-01", "2022-12-31"
+        )
+
+    def test_same_parameters_share_a_directory(self):
+        """Test runs with the same parameters resume the same progress."""
+        same = Checkpoint(self.directory, "org", [], "2022-01-01", "2022-12-31")
+        other = Checkpoint(self.directory, "org", [], "2021-01-01", "2022-12-31")
+
+        self.assertEqual(same.path, self.checkpoint.path)
+        self.assertNotEqual(other.path, self.checkpoint.path)
+        self.assertTrue(os.path.isdir(self.checkpoint.path))
+
+    def test_remove(self):
+        """Test a removed checkpoint starts the next run over."""
+        self.checkpoint.save_contributors("org/repo", [])
+        self.checkpoint.remove()
+
+        self.assertFalse(os.path.exists(self.checkpoint.path))
+        restarted = Checkpoint(self.directory, "org", [], "2022-01-01", "2022-12-31")
+        self.assertIsNone(restarted.load_contributors("org/repo"))
+
+    def test_load_contributors_of_unfinished_repository(self):
+        """Test a repository without saved contributors loads as None."""
+        self.assertIsNone(self.checkpoint.load_contributors("org/repo"))
+
+    def test_save_and_load_contributors(self):
+        """Test saved contributors are loaded back as ContributorStats."""
+        contributors = [
+            ContributorStats("user", False, "avatar", 3, "commit_url", ""),
+        ]
+        self.checkpoint.save_contributors("org/repo", contributors)
+
+        self.assertEqual(self.checkpoint.load_contributors("org/repo"), contributors)
+        self.assertEqual(self.checkpoint.load_contributors("org/other"), None)
+        self.assertEqual(sorted(os.listdir(self.checkpoint.path)), ["org%2Frepo.json"])
+
+    def test_save_and_load_slices(self):
+        """Test saved time slices are loaded back in order."""
+        self.checkpoint.save_slice(
+            "org/repo",
+            "2022-06-01T00:00:00+00:00",
+            "2022-12-31T00:00:00+00:00",
+            {"user": {"avatar_url": "avatar", "contribution_count": 2}},
+            2,
+        )
+        self.checkpoint.save_slice(
+            "org/repo", "2022-01-01T00:00:00+00:00", "2022-05-31T23:59:59+00:00", {}, 0
+        )
+
+        self.assertEqual(
+            self.checkpoint.load_slices("org/repo"),
+            [
+                (
+                    "2022-06-01T00:00:00+00:00",
+                    "2022-12-31T00:00:00+00:00",
+                    {"user": {"avatar_url": "avatar", "contribution_count": 2}},
+                    2,
+                ),
+                (
+                    "2022-01-01T00:00:00+00:00",
+                    "2022-05-31T23:59:59+00:00",
+                    {},
+                    0,
+                ),
+            ],
+        )
+        self.assertEqual(self.checkpoint.load_slices("org/other"), [])
+
+    def test_load_slices_skips_truncated_line(self):
+        """Test a slice cut off by a killed run is fetched again."""
+        self.checkpoint.save_slice(
+            "org/repo", "2022-01-01T00:00:00+00:00", "2022-12-31T00:00:00+00:00", {}, 0
+        )
+        with open(
+            os.path.join(self.checkpoint.path, "org%2Frepo.slices"),
+            "a",
+            encoding="utf-8",
+        ) as slices_file:
+            slices_file.write('{"since": "2021')
+
+        self.assertEqual(len(self.checkpoint.load_slices("org/repo")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
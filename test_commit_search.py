@@ -0,0 +1,136 @@
+"""Test cases for the commit_search module."""
+
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+import commit_search
+
+
+def make_item(repo, login, date):
+    """Build a commit search result item."""
+    return {
+        "repository": {"full_name": repo},
+        "author": {"login": login, "avatar_url": f"avatar_{login}"} if login else None,
+        "commit": {"committer": {"date": date}},
+    }
+
+
+class TestCommitSearch(unittest.TestCase):
+    """
+    Test case for the commit_search module.
+    """
+
+    def setUp(self):
+        self.github_connection = MagicMock()
+        self.github_connection.session.build_url.return_value = (
+            "https://api.github.com/search/commits"
+        )
+        self.start = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+        self.end = datetime.datetime(2022, 1, 3, tzinfo=datetime.timezone.utc)
+
+    @patch("commit_search.paginator.iter_json_pages")
+    def test_streams_all_pages_of_small_window(self, mock_iter_json_pages):
+        """Test a window under the result limit is read with one query."""
+        mock_iter_json_pages.return_value = iter(
+            [
+                {
+                    "total_count": 2,
+                    "items": [
+                        make_item("org/a", "user1", "2022-01-01T10:00:00.000-08:00")
+                    ],
+                },
+                {
+                    "total_count": 2,
+                    "items": [
+                        make_item("org/b", None, "2022-01-02T23:30:00.000+02:00")
+                    ],
+                },
+            ]
+        )
+
+        result = list(
+            commit_search.iter_org_commit_authors(
+                self.github_connection, "org", self.start, self.end
+            )
+        )
+
+        self.assertEqual(
+            result,
+            [
+                ("org/a", "user1", "avatar_user1", "2022-01-01T18:00:00Z"),
+                ("org/b", None, None, "2022-01-02T21:30:00Z"),
+            ],
+        )
+        mock_iter_json_pages.assert_called_once_with(
+            self.github_connection.session,
+            "https://api.github.com/search/commits",
+            {
+                "q": "org:org committer-date:2022-01-01T00:00:00Z..2022-01-03T00:00:00Z",
+                "per_page": 100,
+            },
+            rate_limit_waits=commit_search.SEARCH_RATE_LIMIT_WAITS,
+        )
+
+    @patch("commit_search.paginator.iter_json_pages")
+    def test_splits_window_over_result_limit(self, mock_iter_json_pages):
+        """Test a window over the result limit is split into disjoint halves."""
+        queries = []
+
+        def iter_json_pages(_session, _url, params, **_kwargs):
+            queries.append(params["q"])
+            total_count = 3 if len(queries) == 1 else 1
+            yield {
+                "total_count": total_count,
+                "items": [make_item("org/a", "user1", "2022-01-01T00:00:00Z")],
+            }
+
+        mock_iter_json_pages.side_effect = iter_json_pages
+
+        with patch.object(commit_search, "SEARCH_RESULT_LIMIT", 2):
+            result = list(
+                commit_search.iter_org_commit_authors(
+                    self.github_connection, "org", self.start, self.end
+                )
+            )
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(
+            sorted(queries[1:]),
+            [
+                "org:org committer-date:2022-01-01T00:00:00Z..2022-01-02T00:00:00Z",
+                "org:org committer-date:2022-01-02T00:00:01Z..2022-01-03T00:00:00Z",
+            ],
+        )
+
+    @patch("paginator.time.sleep")
+    def test_waits_for_search_rate_limit(self, mock_sleep):
+        """Test a search refused by the rate limit is sent again once it resets."""
+        limited = MagicMock(status_code=403, content=b"{}")
+        limited.headers = {
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "1060",
+        }
+        page = MagicMock(
+            status_code=200,
+            content=b'{"total_count": 1, "items": [{"repository": '
+            b'{"full_name": "org/a"}, "author": null, '
+            b'"commit": {"committer": {"date": "2022-01-01T10:00:00.000+00:00"}}}]}',
+        )
+        page.links = {}
+        self.github_connection.session.get.side_effect = [limited, page]
+
+        with patch("paginator.time.time", return_value=1000):
+            result = list(
+                commit_search.iter_org_commit_authors(
+                    self.github_connection, "org", self.start, self.end
+                )
+            )
+
+        self.assertEqual(result, [("org/a", None, None, "2022-01-01T10:00:00Z")])
+        self.assertEqual(self.github_connection.session.get.call_count, 2)
+        mock_sleep.assert_called_once_with(61)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,311 @@
+"""Test cases for the concurrency module."""
+
+import http.server
+import threading
+import time
+import unittest
+from unittest.mock import ANY, MagicMock, patch
+
+import concurrency
+import requests
+import singleflight
+import transport
+from requests.adapters import HTTPAdapter
+
+
+def make_response(status_code=200, headers=None):
+    """Return a mock response with a status code and headers"""
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+def make_limiter():
+    """Return a mock limiter that never reports a throttled response"""
+    limiter = MagicMock()
+    limiter.release.return_value = False
+    return limiter
+
+
+class ThrottlingHandler(http.server.BaseHTTPRequestHandler):
+    """Answer the first request with a secondary rate limit and the next ones with 200"""
+
+    statuses = [429, 200]
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Send the next status of the handler"""
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        body = b"[]"
+        self.send_response(status)
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Keep the test output quiet"""
+
+
+class SlowHandler(ThrottlingHandler):
+    """Answer every request with 200 after a delay"""
+
+    delay = 0.0
+    statuses = [200]
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Wait, then send the response"""
+        time.sleep(self.delay)
+        super().do_GET()
+
+
+def serve(handler):
+    """Start a local HTTP server in a thread and return it"""
+    server = http.server.HTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    """
+    Test case for the AdaptiveConcurrencyLimiter class.
+    """
+
+    def test_healthy_responses_raise_the_limit(self):
+        """Test fast successful responses grow the limit up to its maximum."""
+        limiter = concurrency.AdaptiveConcurrencyLimiter(6, initial_limit=2)
+        for _ in range(4):
+            limiter.acquire()
+            limiter.release(make_response())
+
+        self.assertGreater(limiter.limit, 3)
+        for _ in range(100):
+            limiter.acquire()
+            limiter.release(make_response())
+        self.assertEqual(limiter.limit, 6)
+        self.assertEqual(limiter.metrics["peak_limit"], 6)
+        self.assertEqual(limiter.metrics["requests"], 104)
+
+    def test_slow_and_failed_responses_hold_the_limit(self):
+        """Test slow responses, server errors and connection failures do not grow the limit."""
+        limiter = concurrency.AdaptiveConcurrencyLimiter(6, initial_limit=2)
+        for response, seconds in (
+            (make_response(), 10),
+            (make_response(502), 0),
+            (None, 0),
+        ):
+            limiter.acquire()
+            limiter.release(response, seconds)
+
+        self.assertEqual(limiter.limit, 2)
+
+    @patch("concurrency.time.monotonic", return_value=100.0)
+    def test_throttled_response_halves_the_limit_and_pauses(self, _):
+        """Test a secondary rate limit halves the limit once and pauses new requests."""
+        limiter = concurrency.AdaptiveConcurrencyLimiter(32, initial_limit=8)
+        for _ in range(2):
+            limiter.acquire()
+        limiter.release(make_response(403, headers={"Retry-After": "30"}))
+        limiter.release(make_response(429))
+
+        self.assertEqual(limiter.limit, 4)
+        self.assertEqual(limiter.metrics["throttled"], 2)
+        self.assertEqual(
+            limiter._paused_until,  # pylint: disable=protected-access
+            100.0 + concurrency.DEFAULT_RETRY_AFTER,
+        )
+
+    def test_forbidden_without_retry_after_is_not_throttling(self):
+        """Test a plain 403 permission error does not decrease the limit."""
+        limiter = concurrency.AdaptiveConcurrencyLimiter(32, initial_limit=8)
+        limiter.acquire()
+        limiter.release(make_response(403))
+
+        self.assertEqual(limiter.metrics["throttled"], 0)
+        self.assertGreater(limiter.limit, 8)
+
+    def test_acquire_waits_for_a_free_slot(self):
+        """Test no more requests than the limit are in flight at once."""
+        limiter = concurrency.AdaptiveConcurrencyLimiter(1, initial_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def second_request():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=second_request)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+        limiter.release(make_response())
+        self.assertTrue(acquired.wait(5))
+        thread.join()
+
+    def test_summary(self):
+        """Test the run metrics line."""
+        limiter = concurrency.AdaptiveConcurrencyLimiter(32, initial_limit=4)
+
+        self.assertEqual(
+            limiter.summary(),
+            "0 API requests, concurrency limit 4.0 (peak 4.0), throttled 0 times",
+        )
+
+
+class TestThrottledAdapter(unittest.TestCase):
+    """
+    Test case for the ThrottledAdapter class.
+    """
+
+    def test_send_goes_through_the_limiter(self):
+        """Test each request is sent between acquiring and releasing the limiter."""
+        limiter = make_limiter()
+        breaker = MagicMock()
+        adapter = concurrency.ThrottledAdapter(limiter, breaker)
+        request = MagicMock(url="https://api.github.com/repos/owner/repo")
+        response = make_response()
+
+        with patch.object(HTTPAdapter, "send", return_value=response) as mock_send:
+            self.assertIs(adapter.send(request, timeout=5), response)
+
+        mock_send.assert_called_once_with(request, timeout=5)
+        breaker.wait.assert_called_once_with("api.github.com")
+        limiter.acquire.assert_called_once_with()
+        limiter.release.assert_called_once_with(response, ANY)
+        breaker.record.assert_called_once_with("api.github.com", False)
+
+    def test_send_releases_on_connection_error(self):
+        """Test a failed request still frees its slot."""
+        limiter = MagicMock()
+        breaker = MagicMock()
+        adapter = concurrency.ThrottledAdapter(limiter, breaker)
+
+        with patch.object(HTTPAdapter, "send", side_effect=ConnectionError):
+            with self.assertRaises(ConnectionError):
+                adapter.send(MagicMock(url="https://api.github.com/graphql"))
+
+        limiter.release.assert_called_once_with(None, ANY)
+        breaker.record.assert_called_once_with("api.github.com", True)
+
+    def test_identical_gets_share_one_response(self):
+        """Test a repeated GET is answered from the first response, as a copy."""
+        adapter = concurrency.ThrottledAdapter(
+            make_limiter(), MagicMock(), singleflight.SingleFlight()
+        )
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"[]"  # pylint: disable=protected-access
+        request = requests.Request(
+            "GET",
+            "https://api.github.com/repos/owner/repo/contributors",
+            headers={"Authorization": "token abc"},
+        ).prepare()
+
+        with patch.object(HTTPAdapter, "send", return_value=response) as mock_send:
+            first = adapter.send(request, stream=False)
+            second = adapter.send(request.copy(), stream=False)
+
+        mock_send.assert_called_once()
+        self.assertIs(first, response)
+        self.assertIsNot(second, response)
+        self.assertEqual(second.content, b"[]")
+
+    def test_other_requests_are_not_shared(self):
+        """Test POSTs, other credentials and failed responses are sent again."""
+        adapter = concurrency.ThrottledAdapter(
+            make_limiter(), MagicMock(), singleflight.SingleFlight()
+        )
+        url = "https://api.github.com/repos/owner/repo/stats/contributors"
+        requests_sent = [
+            requests.Request("POST", url).prepare(),
+            requests.Request("POST", url).prepare(),
+            requests.Request("GET", url, headers={"Authorization": "a"}).prepare(),
+            requests.Request("GET", url, headers={"Authorization": "b"}).prepare(),
+            requests.Request("GET", url, headers={"Authorization": "b"}).prepare(),
+        ]
+
+        with patch.object(
+            HTTPAdapter, "send", return_value=make_response(202)
+        ) as mock_send:
+            for request in requests_sent:
+                adapter.send(request)
+
+        self.assertEqual(mock_send.call_count, 5)
+
+    def test_throttled_request_is_sent_again(self):
+        """Test a throttled request is paused and sent again, not left to urllib3."""
+        limiter = MagicMock()
+        limiter.release.side_effect = [True, False]
+        adapter = concurrency.ThrottledAdapter(limiter, MagicMock())
+        throttled = make_response(429, headers={"Retry-After": "1"})
+        response = make_response()
+
+        with patch.object(
+            HTTPAdapter, "send", side_effect=[throttled, response]
+        ) as mock_send:
+            self.assertIs(
+                adapter.send(MagicMock(url="https://api.github.com")), response
+            )
+
+        self.assertEqual(mock_send.call_count, 2)
+        self.assertEqual(limiter.acquire.call_count, 2)
+        throttled.close.assert_called_once_with()
+
+    def test_throttled_request_gives_up(self):
+        """Test a request throttled on every attempt returns the last response."""
+        limiter = MagicMock()
+        limiter.release.return_value = True
+        adapter = concurrency.ThrottledAdapter(limiter, MagicMock())
+        throttled = make_response(429)
+
+        with patch.object(HTTPAdapter, "send", return_value=throttled) as mock_send:
+            self.assertIs(
+                adapter.send(MagicMock(url="https://api.github.com")), throttled
+            )
+
+        self.assertEqual(mock_send.call_count, concurrency.THROTTLED_ATTEMPTS)
+
+    def test_latency_is_measured_around_the_request(self):
+        """Test slow responses hold the limit and fast ones raise it."""
+        server = serve(SlowHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        limiter = concurrency.AdaptiveConcurrencyLimiter(8)
+        session = requests.Session()
+        session.mount("http://", concurrency.ThrottledAdapter(limiter))
+        self.addCleanup(session.close)
+        url = f"http://127.0.0.1:{server.server_port}/"
+
+        with patch.object(concurrency, "LATENCY_TARGET", 0.1), patch.object(
+            SlowHandler, "delay", 0.3
+        ):
+            session.get(url, timeout=5)
+        self.assertEqual(limiter.limit, concurrency.INITIAL_LIMIT)
+
+        session.get(url, timeout=5)
+        self.assertGreater(limiter.limit, concurrency.INITIAL_LIMIT)
+
+    def test_throttling_reaches_the_limiter_through_urllib3(self):
+        """Test a 429 with Retry-After is seen by the limiter, not retried by urllib3."""
+        ThrottlingHandler.statuses = [429, 200]
+        server = serve(ThrottlingHandler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        limiter = concurrency.AdaptiveConcurrencyLimiter(8)
+        session = requests.Session()
+        session.mount(
+            "http://",
+            concurrency.ThrottledAdapter(limiter, max_retries=transport.RETRY),
+        )
+        self.addCleanup(session.close)
+
+        response = session.get(f"http://127.0.0.1:{server.server_port}/", timeout=5)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(limiter.metrics["requests"], 2)
+        self.assertEqual(limiter.metrics["throttled"], 1)
+        self.assertLess(limiter.limit, concurrency.INITIAL_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
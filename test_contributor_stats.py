@@ -3,6 +3,9 @@
 import unittest
 from unittest.mock import MagicMock, patch
 
+import contributor_stats
+import requests
+import transport
 from contributor_stats import (
     ContributorStats,
     get_sponsor_information,
@@ -115,6 +118,40 @@ class TestContributorStats(unittest.TestCase):
 
         self.assertEqual(expected_result, result)
 
+    def test_merge_contributors_adds_weekly_commits(self):
+        """
+        Test the merge_contributors function adds up the weekly commits week by week.
+        """
+        contributor1 = ContributorStats(
+            "user1", False, "url", 3, "commit_url1", "", weekly_commits=[1, 2, 0]
+        )
+        contributor2 = ContributorStats(
+            "user1", False, "url", 4, "commit_url2", "", weekly_commits=[0, 1, 3]
+        )
+
+        result = merge_contributors([[contributor1], [contributor2]])
+
+        self.assertEqual(result[0].contribution_count, 7)
+        self.assertEqual(result[0].weekly_commits, [1, 3, 3])
+
+    def test_merge_contributors_adds_repository_counts(self):
+        """
+        Test the merge_contributors function adds up the counts of each repository.
+        """
+        contributor1 = ContributorStats(
+            "user1", False, "url", 3, "url1", "", repository_counts={"org/a": 3}
+        )
+        contributor2 = ContributorStats(
+            "user1", False, "url", 2, "url2", "", repository_counts={"org/b": 2}
+        )
+        contributor3 = ContributorStats(
+            "user1", False, "url", 1, "url3", "", repository_counts={"org/a": 1}
+        )
+
+        result = merge_contributors([[contributor1], [contributor2, contributor3]])
+
+        self.assertEqual(result[0].repository_counts, {"org/a": 4, "org/b": 2})
+
     def test_is_new_contributor_true(self):
         """
         Test the is_new_contributor function when the contributor is new.
@@ -171,11 +208,12 @@ class TestContributorStats(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch("requests.post")
-    def test_fetch_sponsor_info(self, mock_post):
+    @patch("contributor_stats.transport.session")
+    def test_fetch_sponsor_info(self, mock_session):
         """
         Test the get_sponsor_information function.
         """
+        mock_post = mock_session.return_value.post
         # Mock response data
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -223,14 +261,16 @@ class TestContributorStats(unittest.TestCase):
                 "variables": {"username": "user1"},
             },
             headers={"Authorization": "Bearer token"},
-            timeout=60,
+            timeout=transport.TIMEOUT,
         )
 
-    @patch("requests.post")
-    def test_fetch_sponsor_info_raises_on_error(self, mock_post):
-        """Test get_sponsor_information raises when the API response is invalid."""
+    @patch("contributor_stats.time.sleep")
+    @patch("contributor_stats.transport.session")
+    def test_fetch_sponsor_info_reports_failed_lookups(self, mock_session, mock_sleep):
+        """Test a lookup that keeps failing is retried, reported and does not abort the run."""
+        mock_post = mock_session.return_value.post
         mock_response = MagicMock()
-        mock_response.status_code = 500
+        mock_response.status_code = 502
         mock_response.json.return_value = {"errors": [{"message": "fail"}]}
         mock_post.return_value = mock_response
 
@@ -245,9 +285,96 @@ class TestContributorStats(unittest.TestCase):
             ),
         ]
 
-        with self.assertRaises(ValueError):
+        with patch("builtins.print") as mock_print:
+            result = get_sponsor_information(contributors, token="token", ghe="")
+
+        self.assertEqual(result[0].sponsor_info, "")
+        self.assertEqual(mock_post.call_count, contributor_stats.SPONSOR_ATTEMPTS)
+        self.assertEqual(mock_sleep.call_count, contributor_stats.SPONSOR_ATTEMPTS - 1)
+        mock_print.assert_any_call(
+            "::warning::Could not get the sponsor information of 1 contributors: user1"
+        )
+
+    @patch("contributor_stats.time.sleep")
+    @patch("contributor_stats.transport.session")
+    def test_fetch_sponsor_info_retries_transient_error(self, mock_session, _):
+        """Test a server error followed by a success finds the sponsor page."""
+        failed_response = MagicMock(status_code=503)
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {
+            "data": {"repositoryOwner": {"hasSponsorsListing": True}}
+        }
+        mock_session.return_value.post.side_effect = [
+            requests.exceptions.ConnectionError("reset"),
+            failed_response,
+            mock_response,
+        ]
+        contributors = [ContributorStats("user1", False, "", 1, "url", "")]
+
+        with patch("builtins.print"):
             get_sponsor_information(contributors, token="token", ghe="")
 
+        self.assertEqual(
+            contributors[0].sponsor_info, "https://github.com/sponsors/user1"
+        )
+
+    @patch("contributor_stats.transport.session")
+    def test_fetch_sponsor_info_of_organization(self, mock_session):
+        """Test an owner that is not a user has no sponsor page."""
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {"data": {"repositoryOwner": {}}}
+        mock_session.return_value.post.return_value = mock_response
+        contributors = [ContributorStats("org", False, "", 1, "url", "")]
+
+        get_sponsor_information(contributors, token="token", ghe="")
+
+        self.assertEqual(contributors[0].sponsor_info, "")
+
+    def test_fetch_sponsor_info_from_enricher(self):
+        """Test the sponsors listings are read from the background lookups."""
+        enricher = MagicMock()
+        enricher.result.side_effect = {"user1": True, "user2": False, "user3": None}.get
+        contributors = [
+            ContributorStats(name, False, "", 1, "url", "")
+            for name in ("user1", "user2", "user3")
+        ]
+
+        with patch("builtins.print") as mock_print:
+            get_sponsor_information(contributors, "token", "", enricher)
+
+        self.assertEqual(
+            list(enricher.submit.call_args.args[0]), ["user1", "user2", "user3"]
+        )
+        self.assertEqual(
+            [contributor.sponsor_info for contributor in contributors],
+            ["https://github.com/sponsors/user1", "", ""],
+        )
+        mock_print.assert_called_once_with(
+            "::warning::Could not get the sponsor information of 1 contributors: user3"
+        )
+
+    @patch("contributor_stats.transport.session")
+    def test_fetch_sponsor_info_asks_token_function_per_request(self, mock_session):
+        """Test get_sponsor_information calls a token function for every request."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "data": {"repositoryOwner": {"hasSponsorsListing": False}}
+        }
+        mock_session.return_value.post.return_value = mock_response
+        tokens = iter(["token1", "token2"])
+        contributors = [
+            ContributorStats(name, False, "", 1, "url", "") for name in ("a", "b")
+        ]
+
+        get_sponsor_information(contributors, lambda: next(tokens), "")
+
+        headers = [
+            call.kwargs["headers"]["Authorization"]
+            for call in mock_session.return_value.post.call_args_list
+        ]
+        self.assertEqual(headers, ["Bearer token1", "Bearer token2"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,14 +1,27 @@
+# pylint: disable=too-many-lines
 """This module contains the tests for the contributors.py module"""
 
+import datetime
+import json
+import os
 import runpy
+import shutil
+import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
+import checkpoint
 import contributors as contributors_module
+import enrichment
+import github3
+import history
+import repository
+import scheduler
 from contributor_stats import ContributorStats
+from repository import RepositoryHandle
 
 
-class TestContributors(unittest.TestCase):
+class TestContributors(unittest.TestCase):  # pylint: disable=too-many-public-methods
     """
     Test case for the contributors module.
     """
@@ -24,6 +37,7 @@ class TestContributors(unittest.TestCase):
         mock_commit.author.avatar_url = (
             "https://avatars.githubusercontent.com/u/12345678?v=4"
         )
+        mock_commit.commit.committer = {"date": "2022-01-02T00:00:00Z"}
         mock_repo.full_name = "owner/repo"
         mock_repo.commits.return_value = iter([mock_commit])
 
@@ -42,6 +56,9 @@ class TestContributors(unittest.TestCase):
             1,
             "https://github.com/owner/repo/commits?author=user&since=2022-01-01&until=2022-12-31",
             "",
+            # The weeks from Sunday 2021-12-26 to Sunday 2022-12-25
+            weekly_commits=[0, 1] + [0] * 51,
+            repository_counts={"owner/repo": 1},
         )
 
     @patch("contributors.get_contributors")
@@ -50,9 +67,13 @@ class TestContributors(unittest.TestCase):
         Test the get_all_contributors function when an organization is provided.
         """
         mock_github_connection = MagicMock()
+        mock_repo1 = MagicMock(full_name="org/repo1")
+        mock_repo1.as_dict.return_value = {"size": 10}
+        mock_repo2 = MagicMock(full_name="org/repo2")
+        mock_repo2.as_dict.return_value = {"size": 20}
         mock_github_connection.organization().repositories.return_value = [
-            "repo1",
-            "repo2",
+            mock_repo1,
+            mock_repo2,
         ]
         mock_get_contributors.return_value = [
             ContributorStats(
@@ -83,8 +104,16 @@ class TestContributors(unittest.TestCase):
                 ),
             ],
         )
-        mock_get_contributors.assert_any_call("repo1", "2022-01-01", "2022-12-31", ghe)
-        mock_get_contributors.assert_any_call("repo2", "2022-01-01", "2022-12-31", ghe)
+        repos = sorted(
+            (call.args[0] for call in mock_get_contributors.call_args_list),
+            key=lambda repo: repo.full_name,
+        )
+        self.assertEqual([repo.full_name for repo in repos], ["org/repo1", "org/repo2"])
+        self.assertEqual([repo.metadata for repo in repos], [mock_repo1, mock_repo2])
+        for call in mock_get_contributors.call_args_list:
+            self.assertEqual(
+                call.args[1:], ("2022-01-01", "2022-12-31", ghe, None, {}, None)
+            )
 
     @patch("contributors.get_contributors")
     def test_get_all_contributors_with_repository(self, mock_get_contributors):
@@ -92,7 +121,6 @@ class TestContributors(unittest.TestCase):
         Test the get_all_contributors function when a repository is provided.
         """
         mock_github_connection = MagicMock()
-        mock_github_connection.repository.return_value = "repo"
         mock_get_contributors.return_value = [
             ContributorStats(
                 "user",
@@ -122,10 +150,50 @@ class TestContributors(unittest.TestCase):
                 ),
             ],
         )
-        mock_get_contributors.assert_called_once_with(
-            "repo", "2022-01-01", "2022-12-31", ghe
+        mock_get_contributors.assert_called_once()
+        repo = mock_get_contributors.call_args.args[0]
+        self.assertIsInstance(repo, RepositoryHandle)
+        self.assertEqual(repo.full_name, "owner/repo")
+        self.assertEqual(
+            mock_get_contributors.call_args.args[1:],
+            ("2022-01-01", "2022-12-31", ghe, None, {}, None),
+        )
+        mock_github_connection.repository.assert_not_called()
+
+    @patch("contributors.commit_search.iter_org_commit_authors")
+    def test_get_all_contributors_with_commit_search(self, mock_iter):
+        """Test the commit search mode aggregates per repository and merges."""
+        mock_github_connection = MagicMock()
+        mock_iter.return_value = iter(
+            [
+                ("org/repo1", "user", "avatar", "2022-01-02T00:00:00Z"),
+                ("org/repo1", "user", "avatar", "2022-01-01T00:00:00Z"),
+                ("org/repo2", "user", "avatar", "2022-01-01T00:00:00Z"),
+                ("org/repo2", "bot[bot]", "avatar", "2022-01-01T00:00:00Z"),
+                ("org/repo2", None, None, "2022-01-01T00:00:00Z"),
+            ]
         )
 
+        result = contributors_module.get_all_contributors(
+            "org", [], "2022-01-01", "2022-12-31", mock_github_connection, "", True
+        )
+
+        self.assertEqual(
+            result,
+            [
+                ContributorStats(
+                    "user",
+                    False,
+                    "avatar",
+                    3,
+                    "https://github.com/org/repo1/commits?author=user&since=2022-01-01&until=2022-12-31, "
+                    "https://github.com/org/repo2/commits?author=user&since=2022-01-01&until=2022-12-31",
+                    "",
+                ),
+            ],
+        )
+        mock_github_connection.organization.assert_not_called()
+
     @patch("contributors.contributor_stats.ContributorStats")
     def test_get_contributors_with_single_commit(self, mock_contributor_stats):
         """
@@ -137,6 +205,7 @@ class TestContributors(unittest.TestCase):
         mock_commit.author.avatar_url = (
             "https://avatars.githubusercontent.com/u/12345678?v=4"
         )
+        mock_commit.commit.committer = {"date": "2022-01-02T00:00:00Z"}
 
         mock_repo.full_name = "owner/repo"
         mock_repo.commits.return_value = iter([mock_commit])
@@ -157,6 +226,9 @@ class TestContributors(unittest.TestCase):
             1,
             "https://github.com/owner/repo/commits?author=user&since=2022-01-01&until=2022-12-31",
             "",
+            # The weeks from Sunday 2021-12-26 to Sunday 2022-12-25
+            weekly_commits=[0, 1] + [0] * 51,
+            repository_counts={"owner/repo": 1},
         )
 
     @patch("contributors.contributor_stats.ContributorStats")
@@ -208,8 +280,112 @@ class TestContributors(unittest.TestCase):
             100,
             "https://github.com/owner/repo/commits?author=user",
             "",
+            repository_counts={"owner/repo": 100},
+        )
+
+    def test_get_all_time_contributors_falls_back_to_statistics(self):
+        """Test a repository refused by the contributors endpoint uses its statistics."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        refused = MagicMock(status_code=403)
+        refused.json.return_value = {
+            "message": "The history or contributor list is too large to list "
+            "contributors for this repository via the API."
+        }
+        strategies = {}
+
+        with patch.object(
+            RepositoryHandle,
+            "contributors",
+            side_effect=github3.exceptions.ForbiddenError(refused),
+        ), patch.object(
+            RepositoryHandle,
+            "contributor_statistics",
+            return_value=[("user", "avatar", 12)],
+        ):
+            result = contributors_module.get_all_time_contributors(handle, strategies)
+
+        self.assertEqual(result, [("user", "avatar", 12)])
+        self.assertEqual(strategies, {"owner/repo": contributors_module.STATS_STRATEGY})
+
+    def test_get_all_time_contributors_falls_back_to_commits(self):
+        """Test a repository without statistics is listed from all its commits."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        strategies = {}
+
+        with patch.object(
+            RepositoryHandle, "contributors", return_value=iter([])
+        ), patch.object(
+            RepositoryHandle, "contributor_statistics", return_value=None
+        ) as mock_statistics, patch.object(
+            contributors_module, "STATS_RETRY_SECONDS", 0
+        ), patch.object(
+            contributors_module,
+            "get_commit_authors",
+            return_value={"user": {"avatar_url": "avatar", "contribution_count": 7}},
+        ) as mock_get_commit_authors:
+            result = contributors_module.get_all_time_contributors(handle, strategies)
+
+        self.assertEqual(result, [("user", "avatar", 7)])
+        self.assertEqual(mock_statistics.call_count, contributors_module.STATS_ATTEMPTS)
+        self.assertEqual(mock_get_commit_authors.call_args.args[1], "2008-02-29")
+        self.assertEqual(
+            strategies, {"owner/repo": contributors_module.COMMITS_STRATEGY}
         )
 
+    def test_get_all_time_contributors_with_too_many_authors(self):
+        """Test statistics capped at their busiest authors fall back to commits."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        strategies = {"owner/repo": contributors_module.STATS_STRATEGY}
+        statistics = [
+            (f"user{index}", "avatar", 1)
+            for index in range(repository.STATS_MAX_AUTHORS)
+        ]
+
+        with patch.object(
+            RepositoryHandle, "contributor_statistics", return_value=statistics
+        ), patch.object(
+            contributors_module,
+            "get_commit_authors",
+            return_value={"user": {"avatar_url": "avatar", "contribution_count": 7}},
+        ) as mock_get_commit_authors:
+            result = contributors_module.get_all_time_contributors(handle, strategies)
+
+        self.assertEqual(result, [("user", "avatar", 7)])
+        mock_get_commit_authors.assert_called_once()
+        self.assertEqual(
+            strategies, {"owner/repo": contributors_module.COMMITS_STRATEGY}
+        )
+
+    def test_get_all_time_contributors_uses_recorded_strategy(self):
+        """Test a repository goes straight to the strategy recorded by an earlier run."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        strategies = {"owner/repo": contributors_module.STATS_STRATEGY}
+
+        with patch.object(
+            RepositoryHandle, "contributors"
+        ) as mock_contributors, patch.object(
+            RepositoryHandle,
+            "contributor_statistics",
+            return_value=[("user", "avatar", 12)],
+        ):
+            result = contributors_module.get_all_time_contributors(handle, strategies)
+
+        self.assertEqual(result, [("user", "avatar", 12)])
+        mock_contributors.assert_not_called()
+
+    def test_get_all_time_contributors_of_empty_repository(self):
+        """Test an empty repository is not given a fallback strategy."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        strategies = {}
+
+        with patch.object(
+            RepositoryHandle, "contributors", return_value=iter([])
+        ), patch.object(RepositoryHandle, "contributor_statistics", return_value=[]):
+            result = contributors_module.get_all_time_contributors(handle, strategies)
+
+        self.assertEqual(result, [])
+        self.assertEqual(strategies, {})
+
     def test_get_contributors_skips_when_no_commits_in_range(self):
         """Test get_contributors returns empty list when no commits in the date range."""
         mock_repo = MagicMock()
@@ -246,6 +422,8 @@ class TestContributors(unittest.TestCase):
         mock_commit2 = MagicMock()
         mock_commit2.author.login = "user"
         mock_commit2.author.avatar_url = "https://avatars.githubusercontent.com/u/1"
+        mock_commit1.commit.committer = {"date": "2022-01-09T00:00:00Z"}
+        mock_commit2.commit.committer = {"date": "2022-01-02T00:00:00Z"}
         mock_repo.commits.return_value = iter([mock_commit1, mock_commit2])
 
         result = contributors_module.get_contributors(
@@ -254,6 +432,7 @@ class TestContributors(unittest.TestCase):
 
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0].contribution_count, 2)
+        self.assertEqual(result[0].weekly_commits[:4], [0, 1, 1, 0])
 
     def test_get_contributors_handles_exception(self):
         """Test get_contributors returns None when an exception is raised."""
@@ -283,6 +462,358 @@ class TestContributors(unittest.TestCase):
             )
         )
 
+    def test_get_contributors_skips_refused_repositories(self):
+        """Test only server errors and throttling are reported as failures to retry."""
+        cases = [
+            (409, {}, []),
+            (404, {}, []),
+            (451, {}, []),
+            (403, {}, []),
+            (403, {"Retry-After": "60"}, None),
+            (403, {"X-RateLimit-Remaining": "0"}, None),
+            (429, {}, None),
+            (502, {}, None),
+        ]
+        for status_code, headers, expected in cases:
+            with self.subTest(status_code=status_code, headers=headers):
+                response = MagicMock(status_code=status_code, headers=headers)
+                response.json.return_value = {"message": "Git Repository is empty."}
+                mock_repo = MagicMock()
+                mock_repo.full_name = "owner/repo"
+                mock_repo.commits.side_effect = github3.exceptions.error_for(response)
+
+                with patch("builtins.print"):
+                    result = contributors_module.get_contributors(
+                        mock_repo, "2022-01-01", "2022-12-31", ""
+                    )
+
+                self.assertEqual(result, expected)
+
+    def test_get_contributors_slices_heavy_window(self):
+        """Test a window with too many commits is refetched as disjoint time slices."""
+
+        def make_commit(login, date):
+            commit = MagicMock()
+            commit.author.login = login
+            commit.author.avatar_url = f"https://avatars.githubusercontent.com/{login}"
+            commit.commit.committer = {"date": date}
+            return commit
+
+        slice_calls = []
+
+        def commits(since, until):
+            if len(since) == 10:
+                # The initial probe over the whole window overflows
+                return iter(
+                    [
+                        make_commit("user1", "2022-01-03T00:00:00Z"),
+                        make_commit("user1", "2022-01-02T00:00:00Z"),
+                        make_commit("user2", "2022-01-01T12:00:00Z"),
+                    ]
+                )
+            slice_calls.append((since, until))
+            if since <= "2022-01-02T00:00:00Z" <= until:
+                return iter([make_commit("user1", "2022-01-02T00:00:00Z")])
+            return iter([])
+
+        mock_repo = MagicMock()
+        mock_repo.full_name = "owner/repo"
+        mock_repo.commits.side_effect = commits
+
+        with patch.object(contributors_module, "SLICE_PROBE_COMMITS", 2):
+            result = contributors_module.get_contributors(
+                mock_repo, "2022-01-01", "2022-01-04", ""
+            )
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].username, "user1")
+        self.assertEqual(result[0].contribution_count, 1)
+        slice_calls.sort()
+        self.assertEqual(slice_calls[0][0], "2022-01-01T00:00:00Z")
+        self.assertEqual(slice_calls[-1][1], "2022-01-04T00:00:00Z")
+        for (_, until), (next_since, _) in zip(slice_calls, slice_calls[1:]):
+            self.assertLess(until, next_since)
+
+    def test_get_contributors_reads_raw_commits_from_handles(self):
+        """Test get_contributors uses the raw commit authors of repository handles."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        with patch.object(
+            RepositoryHandle,
+            "commit_authors",
+            return_value=iter(
+                [
+                    ("user", "avatar", "2022-01-02T00:00:00Z", "sha1"),
+                    ("user", "avatar", "2022-01-01T00:00:00Z", "sha2"),
+                    ("dependabot[bot]", "avatar", "2022-01-01T00:00:00Z", "sha3"),
+                    (None, None, "2022-01-01T00:00:00Z", "sha4"),
+                ]
+            ),
+        ) as mock_commit_authors:
+            result = contributors_module.get_contributors(
+                handle, "2022-01-01", "2022-12-31", ""
+            )
+
+        mock_commit_authors.assert_called_once_with(
+            since="2022-01-01",
+            until="2022-12-31",
+            prefetch_pages=contributors_module.SLICE_PROBE_PAGES,
+        )
+        self.assertEqual(
+            result,
+            [
+                ContributorStats(
+                    "user",
+                    False,
+                    "avatar",
+                    2,
+                    "https://github.com/owner/repo/commits?author=user&since=2022-01-01&until=2022-12-31",
+                    "",
+                )
+            ],
+        )
+
+    @patch("contributors.get_contributors")
+    def test_get_all_contributors_resumes_from_checkpoint(self, mock_get_contributors):
+        """Test finished repositories are saved and skipped by a restarted run."""
+        finished = [ContributorStats("user1", False, "avatar", 1, "url", "")]
+        # repo2 fails, get_contributors reports it and returns None
+        mock_get_contributors.side_effect = lambda repo, *_: (
+            finished if repo.full_name == "owner/repo1" else None
+        )
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir, patch.object(
+            contributors_module, "REPO_ATTEMPTS", 1
+        ), patch("builtins.print"):
+            contributors_module.get_all_contributors(
+                "",
+                ["owner/repo1", "owner/repo2"],
+                "2022-01-01",
+                "2022-12-31",
+                MagicMock(),
+                "",
+                checkpoint_dir=checkpoint_dir,
+            )
+            self.assertEqual(len(os.listdir(checkpoint_dir)), 1)
+            mock_get_contributors.side_effect = None
+            mock_get_contributors.return_value = []
+            result = contributors_module.get_all_contributors(
+                "",
+                ["owner/repo1", "owner/repo2"],
+                "2022-01-01",
+                "2022-12-31",
+                MagicMock(),
+                "",
+                checkpoint_dir=checkpoint_dir,
+            )
+            # The complete run leaves nothing for the next one to resume
+            self.assertEqual(os.listdir(checkpoint_dir), [])
+
+        self.assertEqual(result, finished)
+        # repo1 finished in the first run, so the restart only fetches repo2
+        self.assertEqual(
+            sorted(
+                call.args[0].full_name for call in mock_get_contributors.call_args_list
+            ),
+            ["owner/repo1", "owner/repo2", "owner/repo2"],
+        )
+
+    @patch("contributors.get_contributors")
+    def test_get_all_contributors_starts_expensive_repositories_first(
+        self, mock_get_contributors
+    ):
+        """Test repositories are fetched by their previous commit counts, biggest first."""
+        mock_get_contributors.side_effect = lambda repo, *_: [
+            ContributorStats("user", False, "avatar", len(repo.name), "url", "")
+        ]
+
+        with tempfile.TemporaryDirectory() as cache_dir, patch.object(
+            contributors_module, "REPO_WORKERS", 1
+        ):
+            scheduler.save_costs(cache_dir, {"owner/b": 10, "owner/ccc": 50})
+            contributors_module.get_all_contributors(
+                "",
+                ["owner/a", "owner/b", "owner/ccc"],
+                "2022-01-01",
+                "2022-12-31",
+                MagicMock(),
+                "",
+                cache_dir=cache_dir,
+            )
+            costs = scheduler.load_costs(cache_dir)
+
+        self.assertEqual(
+            [call.args[0].full_name for call in mock_get_contributors.call_args_list],
+            ["owner/ccc", "owner/b", "owner/a"],
+        )
+        self.assertEqual(costs, {"owner/a": 1, "owner/b": 1, "owner/ccc": 3})
+
+    @patch("contributors.time.sleep")
+    @patch("contributors.get_contributors")
+    def test_get_all_contributors_retries_and_reports_failed_repositories(
+        self, mock_get_contributors, mock_sleep
+    ):
+        """Test failed repositories are fetched again, then reported as missing."""
+        contributor = ContributorStats("user1", False, "avatar", 1, "url", "")
+        outcomes = {"owner/flaky": [None, [contributor]], "owner/down": [None, None]}
+        mock_get_contributors.side_effect = lambda repo, *_: outcomes[
+            repo.full_name
+        ].pop(0)
+
+        with patch("builtins.print") as mock_print:
+            result = contributors_module.get_all_contributors(
+                "",
+                ["owner/flaky", "owner/down"],
+                "2022-01-01",
+                "2022-12-31",
+                MagicMock(),
+                "",
+            )
+
+        self.assertEqual(result, [contributor])
+        self.assertEqual(mock_get_contributors.call_count, 4)
+        mock_sleep.assert_called_once()
+        mock_print.assert_any_call(
+            "::warning::The contributors of 1 repositories are missing from the report: owner/down"
+        )
+
+    @patch("contributors.get_contributors")
+    def test_get_all_contributors_hands_logins_to_enricher(self, mock_get_contributors):
+        """Test the logins of each repository are looked up as soon as it is fetched."""
+        mock_get_contributors.side_effect = lambda repo, *_: [
+            ContributorStats(f"{repo.name}-user", False, "avatar", 1, "url", "")
+        ]
+        enricher = MagicMock()
+
+        contributors_module.get_all_contributors(
+            "",
+            ["owner/repo1", "owner/repo2"],
+            "2022-01-01",
+            "2022-12-31",
+            MagicMock(),
+            "",
+            enricher=enricher,
+        )
+
+        self.assertEqual(
+            sorted(list(call.args[0])[0] for call in enricher.submit.call_args_list),
+            ["repo1-user", "repo2-user"],
+        )
+
+    def test_get_contributors_resumes_saved_slices(self):
+        """Test only the parts of a window missing from the checkpoint are fetched."""
+        mock_repo = MagicMock()
+        mock_repo.full_name = "owner/repo"
+        mock_repo.commits.return_value = iter([])
+
+        with tempfile.TemporaryDirectory() as checkpoint_dir:
+            progress = checkpoint.Checkpoint(
+                checkpoint_dir, "", ["owner/repo"], "2022-01-01", "2022-01-04"
+            )
+            progress.save_slice(
+                "owner/repo",
+                "2022-01-02T00:00:00+00:00",
+                "2022-01-04T00:00:00+00:00",
+                {"user1": {"avatar_url": "avatar", "contribution_count": 5}},
+                5,
+            )
+            with patch.object(
+                contributors_module, "SLICE_MIN_SECONDS", 86400
+            ), patch.object(contributors_module, "SLICE_TARGET_COMMITS", 1):
+                result = contributors_module.get_contributors(
+                    mock_repo, "2022-01-01", "2022-01-04", "", progress
+                )
+            saved_slices = progress.load_slices("owner/repo")
+
+        mock_repo.commits.assert_called_once_with(
+            since="2022-01-01T00:00:00Z", until="2022-01-01T23:59:59Z"
+        )
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].username, "user1")
+        self.assertEqual(result[0].contribution_count, 5)
+        self.assertEqual(len(saved_slices), 2)
+
+    def test_get_contributors_tops_up_history(self):
+        """Test a later window only fetches the range the history store does not hold."""
+        mock_repo = MagicMock()
+        mock_repo.full_name = "owner/repo"
+        commits = {
+            "2022-01-02T00:00:00Z": "user1",
+            "2022-01-05T00:00:00Z": "user2",
+        }
+
+        def commits_between(since, until):
+            for committed_date, login in commits.items():
+                if since[:10] <= committed_date[:10] <= until[:10]:
+                    commit = MagicMock(sha=committed_date)
+                    commit.author.login = login
+                    commit.author.avatar_url = "avatar"
+                    commit.commit.committer = {"date": committed_date}
+                    yield commit
+
+        mock_repo.commits.side_effect = commits_between
+
+        with tempfile.TemporaryDirectory() as history_dir:
+            store = history.HistoryStore(os.path.join(history_dir, "history.db"))
+            first = contributors_module.get_contributors(
+                mock_repo, "2022-01-01", "2022-01-04", "", store=store
+            )
+            second = contributors_module.get_contributors(
+                mock_repo, "2022-01-02", "2022-01-06", "", store=store
+            )
+            store.close()
+
+        self.assertEqual([c.username for c in first], ["user1"])
+        self.assertEqual(sorted(c.username for c in second), ["user1", "user2"])
+        self.assertEqual(
+            mock_repo.commits.call_args_list[-1].kwargs,
+            {"since": "2022-01-04T00:00:01Z", "until": "2022-01-06T00:00:00Z"},
+        )
+
+    def test_get_contributors_counts_the_same_with_a_store(self):
+        """Test a window counted from rolled up weeks matches one fetched live."""
+        handle = RepositoryHandle(MagicMock(), "owner/repo")
+        commits = [
+            ("user1", "avatar", "2022-12-27T10:00:00Z", "a"),
+            ("user1", "avatar", "2022-12-30T10:00:00Z", "b"),
+            ("user2", "avatar", "2023-01-03T10:00:00Z", "c"),
+            ("user1", "avatar", "2023-01-09T10:00:00Z", "d"),
+            ("user2", "avatar", "2023-01-16T10:00:00Z", "e"),
+            ("user1", "avatar", "2023-01-20T10:00:00Z", "f"),
+        ]
+
+        def commit_authors(since, until, **_kwargs):
+            return iter(
+                [commit for commit in reversed(commits) if since <= commit[2] <= until]
+            )
+
+        def count(result):
+            return sorted(
+                (c.username, c.contribution_count, tuple(c.weekly_commits))
+                for c in result
+            )
+
+        with tempfile.TemporaryDirectory() as history_dir, patch.object(
+            RepositoryHandle, "commit_authors", side_effect=commit_authors
+        ) as mock_commit_authors:
+            live = contributors_module.get_contributors(
+                handle, "2022-12-28", "2023-01-18", ""
+            )
+            store = history.HistoryStore(os.path.join(history_dir, "history.db"))
+            contributors_module.get_contributors(
+                handle, "2022-12-25", "2023-01-21", "", store=store
+            )
+            mock_commit_authors.reset_mock()
+            stored = contributors_module.get_contributors(
+                handle, "2022-12-28", "2023-01-18", "", store=store
+            )
+            store.close()
+
+        mock_commit_authors.assert_not_called()
+        self.assertEqual(count(stored), count(live))
+        self.assertEqual(
+            [(c[0], c[1]) for c in count(live)], [("user1", 2), ("user2", 2)]
+        )
+
     def test_main_runs_under_main_guard(self):
         """Test running contributors as a script executes main."""
         mock_env = MagicMock()
@@ -301,6 +832,21 @@ class TestContributors(unittest.TestCase):
             False,
             "contributors.md",
             False,
+            False,
+            None,
+            "",
+            None,
+            None,
+            False,
+            "",
+            "",
+            [],
+            False,
+            False,
+            "",
+            [],
+            "",
+            "",
         )
 
         mock_auth = MagicMock()
@@ -309,7 +855,6 @@ class TestContributors(unittest.TestCase):
         mock_org.repositories.return_value = []
         mock_github.organization.return_value = mock_org
         mock_auth.auth_to_github.return_value = mock_github
-        mock_auth.get_github_app_installation_token.return_value = "token"
 
         mock_markdown = MagicMock()
         mock_json_writer = MagicMock()
@@ -327,10 +872,14 @@ class TestContributors(unittest.TestCase):
             runpy.run_module("contributors", run_name="__main__")
 
         mock_env.get_env_vars.assert_called_once()
-        mock_auth.auth_to_github.assert_called_once()
-        mock_auth.get_github_app_installation_token.assert_called_once_with(
+        mock_auth.AppInstallationTokenManager.assert_called_once_with(
             "", 123, b"key", 456
         )
+        mock_auth.auth_to_github.assert_called_once()
+        self.assertIs(
+            mock_auth.auth_to_github.call_args.args[-1],
+            mock_auth.AppInstallationTokenManager.return_value,
+        )
         mock_markdown.write_to_markdown.assert_called_once()
         mock_json_writer.write_to_json.assert_called_once()
 
@@ -375,6 +924,21 @@ class TestContributors(unittest.TestCase):
                 False,
                 "contributors.md",
                 False,
+                False,
+                None,
+                "",
+                None,
+                None,
+                False,
+                "",
+                "",
+                [],
+                False,
+                False,
+                "",
+                [],
+                "",
+                "",
             )
             mock_auth_to_github.return_value = MagicMock()
             mock_get_all_contributors.side_effect = [[contributor], []]
@@ -384,6 +948,154 @@ class TestContributors(unittest.TestCase):
         mock_is_new.assert_called_once_with("user1", [])
         self.assertTrue(contributor.new_contributor)
 
+    @patch("contributors.get_contributors")
+    def test_get_all_contributors_with_shard(self, mock_get_contributors):
+        """Test a shard only gets the contributors of its own repositories."""
+        repository_list = [f"owner/repo{number}" for number in range(10)]
+        mock_get_contributors.return_value = []
+
+        fetched = []
+        for shard_index in range(3):
+            contributors_module.get_all_contributors(
+                "",
+                repository_list,
+                "2022-01-01",
+                "2022-12-31",
+                MagicMock(),
+                "",
+                shard_index=shard_index,
+                shard_count=3,
+            )
+            fetched.append(
+                [
+                    call.args[0].full_name
+                    for call in mock_get_contributors.call_args_list
+                ]
+            )
+            mock_get_contributors.reset_mock()
+
+        self.assertEqual(sorted(sum(fetched, [])), sorted(repository_list))
+        self.assertTrue(all(len(names) < len(repository_list) for names in fetched))
+
+    def test_main_writes_partial_result_of_shard(self):
+        """Test a shard writes its partial result instead of the report."""
+        contributor = ContributorStats("user1", False, "avatar", 10, "commit_url", "")
+        returning = ContributorStats("user2", False, "avatar", 1, "commit_url", "")
+
+        with patch.object(
+            contributors_module.env, "get_env_vars"
+        ) as mock_get_env_vars, patch.object(
+            contributors_module.auth, "auth_to_github"
+        ), patch.object(
+            contributors_module, "get_all_contributors"
+        ) as mock_get_all_contributors, patch.object(
+            contributors_module.shard, "write_partial", return_value="partial.json"
+        ) as mock_write_partial, patch.object(
+            contributors_module.markdown, "write_to_markdown"
+        ) as mock_write_to_markdown, patch.object(
+            contributors_module.json_writer, "write_to_json"
+        ) as mock_write_to_json:
+            mock_get_env_vars.return_value = (
+                "org",
+                [],
+                None,
+                None,
+                b"",
+                False,
+                "token",
+                "",
+                "2022-01-01",
+                "2022-12-31",
+                False,
+                False,
+                "contributors.md",
+                False,
+                False,
+                None,
+                "",
+                1,
+                2,
+                False,
+                "",
+                "",
+                [],
+                False,
+                False,
+                "",
+                [],
+                "",
+                "",
+            )
+            mock_get_all_contributors.side_effect = [[contributor], [returning]]
+
+            contributors_module.main()
+
+        self.assertEqual(
+            mock_get_all_contributors.call_args_list[1].kwargs["shard_index"], 1
+        )
+        mock_write_partial.assert_called_once_with(1, [contributor], [returning])
+        mock_write_to_markdown.assert_not_called()
+        mock_write_to_json.assert_not_called()
+
+    def test_main_reduces_partial_results(self):
+        """Test the reduce step renders the report from the partial results."""
+        contributor = ContributorStats("user1", False, "avatar", 10, "commit_url", "")
+        returning = ContributorStats("user1", False, "avatar", 1, "commit_url", "")
+
+        with patch.object(
+            contributors_module.env, "get_env_vars"
+        ) as mock_get_env_vars, patch.object(
+            contributors_module.auth, "auth_to_github"
+        ), patch.object(
+            contributors_module, "get_all_contributors"
+        ) as mock_get_all_contributors, patch.object(
+            contributors_module.shard,
+            "read_partials",
+            return_value=([contributor], [returning]),
+        ) as mock_read_partials, patch.object(
+            contributors_module.markdown, "write_to_markdown"
+        ) as mock_write_to_markdown, patch.object(
+            contributors_module.json_writer, "write_to_json"
+        ):
+            mock_get_env_vars.return_value = (
+                "org",
+                [],
+                None,
+                None,
+                b"",
+                False,
+                "token",
+                "",
+                "2022-01-01",
+                "2022-12-31",
+                False,
+                False,
+                "contributors.md",
+                False,
+                False,
+                None,
+                "",
+                None,
+                2,
+                True,
+                "",
+                "",
+                [],
+                False,
+                False,
+                "",
+                [],
+                "",
+                "",
+            )
+
+            contributors_module.main()
+
+        mock_read_partials.assert_called_once_with(".", 2)
+        mock_get_all_contributors.assert_not_called()
+        self.assertEqual(mock_write_to_markdown.call_args.args[0], [contributor])
+        self.assertFalse(contributor.new_contributor)
+
     def test_main_fetches_sponsor_info_when_enabled(self):
         """Test main fetches sponsor information when sponsor_info is enabled."""
         contributor = ContributorStats(
@@ -431,6 +1143,21 @@ class TestContributors(unittest.TestCase):
                 False,
                 "contributors.md",
                 False,
+                False,
+                None,
+                "",
+                None,
+                None,
+                False,
+                "",
+                "",
+                [],
+                False,
+                False,
+                "",
+                [],
+                "",
+                "",
             )
             mock_auth_to_github.return_value = MagicMock()
             mock_get_all_contributors.return_value = [contributor]
@@ -438,7 +1165,155 @@ class TestContributors(unittest.TestCase):
 
             contributors_module.main()
 
-        mock_get_sponsor_information.assert_called_once_with([contributor], "token", "")
+        mock_get_sponsor_information.assert_called_once_with(
+            [contributor], "token", "", ANY
+        )
+        enricher = mock_get_sponsor_information.call_args.args[3]
+        self.assertIsInstance(enricher, enrichment.Enricher)
+        self.assertIs(mock_get_all_contributors.call_args.args[11], enricher)
+
+    def test_main_reports_each_date_window(self):
+        """Test main writes one report per window, sharing one history store."""
+        with patch.object(
+            contributors_module.env, "get_env_vars"
+        ) as mock_get_env_vars, patch.object(
+            contributors_module.auth, "auth_to_github"
+        ), patch.object(
+            contributors_module, "get_all_contributors", return_value=[]
+        ) as mock_get_all_contributors, patch.object(
+            contributors_module.markdown, "write_to_markdown"
+        ) as mock_write_to_markdown, patch.object(
+            contributors_module.json_writer, "write_to_json"
+        ) as mock_write_to_json:
+            mock_get_env_vars.return_value = (
+                "org",
+                [],
+                None,
+                None,
+                b"",
+                False,
+                "token",
+                "",
+                "",
+                "",
+                False,
+                False,
+                "contributors.md",
+                False,
+                True,
+                None,
+                "",
+                None,
+                None,
+                False,
+                "",
+                "",
+                [("2024-01-01", "2024-03-31"), ("2024-03-01", "2024-03-31")],
+                False,
+                False,
+                "",
+                [],
+                "",
+                "",
+            )
+
+            contributors_module.main()
+
+        window_calls = mock_get_all_contributors.call_args_list[::2]
+        returning_calls = mock_get_all_contributors.call_args_list[1::2]
+        self.assertEqual(
+            [call.args[2:4] for call in window_calls],
+            [("2024-01-01", "2024-03-31"), ("2024-03-01", "2024-03-31")],
+        )
+        self.assertEqual(
+            [call.kwargs["end_date"] for call in returning_calls],
+            ["2024-01-01", "2024-03-01"],
+        )
+        # Only the windows are searched, the years before them are scanned
+        self.assertEqual([call.args[6] for call in window_calls], [True, True])
+        self.assertEqual(
+            [call.kwargs["use_commit_search"] for call in returning_calls],
+            [False, False],
+        )
+        history_dbs = {call.args[12] for call in window_calls} | {
+            call.kwargs["history_db"] for call in returning_calls
+        }
+        self.assertEqual(len(history_dbs), 1)
+        history_db = history_dbs.pop()
+        self.assertTrue(history_db.endswith("history.db"))
+        self.assertFalse(os.path.exists(os.path.dirname(history_db)))
+        # The store only lives for this run, so it covers the recent past too
+        self.assertEqual(
+            {
+                call.kwargs["history_settle_margin"]
+                for call in mock_get_all_contributors.call_args_list
+            },
+            {datetime.timedelta(0)},
+        )
+        self.assertEqual(
+            [call.args[1] for call in mock_write_to_markdown.call_args_list],
+            [
+                "contributors-2024-01-01-2024-03-31.md",
+                "contributors-2024-03-01-2024-03-31.md",
+            ],
+        )
+        self.assertEqual(
+            [call.kwargs["filename"] for call in mock_write_to_json.call_args_list],
+            [
+                "contributors-2024-01-01-2024-03-31.json",
+                "contributors-2024-03-01-2024-03-31.json",
+            ],
+        )
+
+    def test_write_reports_compares_with_previous_report(self):
+        """Test the changes since the report about to be overwritten are reported."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        json_filename = os.path.join(directory, "contributors.json")
+        previous = ContributorStats("user1", False, "url", 1, "commit_url", "")
+        current = ContributorStats("user1", False, "url", 4, "commit_url", "")
+        contributors_module.json_writer.write_to_json(
+            [previous], json_filename, "", "", "org", [], False, False
+        )
+
+        with patch.object(
+            contributors_module.markdown, "write_to_markdown"
+        ) as mock_write_to_markdown:
+            contributors_module.write_reports(
+                [current],
+                "contributors.md",
+                json_filename,
+                "",
+                "",
+                "org",
+                [],
+                False,
+                False,
+                "",
+                False,
+                False,
+                False,
+                [],
+                json_filename,
+            )
+
+        delta = {
+            "appeared": [],
+            "vanished": [],
+            "changed": [
+                {
+                    "username": "user1",
+                    "previous_count": 1,
+                    "contribution_count": 4,
+                    "change": 3,
+                }
+            ],
+        }
+        self.assertEqual(mock_write_to_markdown.call_args.args[-1], delta)
+        with open(
+            os.path.join(directory, "contributors-delta.json"), "r", encoding="utf-8"
+        ) as f:
+            self.assertEqual(json.load(f), {"previous": json_filename, **delta})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""Test the write_to_csv function in csv_writer.py."""
+
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+
+from contributor_stats import ContributorStats
+from csv_writer import write_to_csv
+
+
+class TestWriteToCsv(unittest.TestCase):
+    """Test the write_to_csv function."""
+
+    def setUp(self):
+        """Set up the files for the tests."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.filename = os.path.join(directory, "contributors.csv")
+        self.repositories_filename = os.path.join(
+            directory, "contributors-repositories.csv"
+        )
+
+    def test_write_to_csv(self):
+        """Test that write_to_csv writes one row per contributor and repository."""
+        contributor = ContributorStats(
+            username="test_user",
+            new_contributor=False,
+            avatar_url="https://test_url.com",
+            contribution_count=10,
+            commit_url="https://test_commit_url.com",
+            sponsor_info="",
+            repository_counts={"org/repo2": 3, "org/repo1": 7},
+        )
+        contributor.new_contributor = True
+
+        write_to_csv([contributor], self.filename, self.repositories_filename)
+
+        with open(self.filename, "r", encoding="utf-8", newline="") as f:
+            self.assertEqual(
+                list(csv.reader(f)),
+                [
+                    [
+                        "username",
+                        "new_contributor",
+                        "avatar_url",
+                        "contribution_count",
+                        "sponsor_info",
+                    ],
+                    ["test_user", "True", "https://test_url.com", "10", ""],
+                ],
+            )
+        with open(self.repositories_filename, "r", encoding="utf-8", newline="") as f:
+            self.assertEqual(
+                list(csv.reader(f)),
+                [
+                    ["username", "repository", "contribution_count"],
+                    ["test_user", "org/repo1", "7"],
+                    ["test_user", "org/repo2", "3"],
+                ],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Test cases for the enrichment module."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from enrichment import Enricher
+
+
+class TestEnricher(unittest.TestCase):
+    """
+    Test case for the Enricher class.
+    """
+
+    def test_each_login_is_looked_up_once(self):
+        """Test logins seen several times are only looked up the first time."""
+        lookup = MagicMock(side_effect=lambda login: login.upper())
+        enricher = Enricher(lookup)
+        self.addCleanup(enricher.close)
+
+        enricher.submit(["user1", "user2"])
+        enricher.submit(["user2", "user3"])
+
+        self.assertEqual(enricher.result("user1"), "USER1")
+        self.assertEqual(enricher.result("user3"), "USER3")
+        self.assertEqual(enricher.result("user4"), "USER4")
+        self.assertEqual(
+            sorted(call.args[0] for call in lookup.call_args_list),
+            ["user1", "user2", "user3", "user4"],
+        )
+
+    def test_failed_lookup_returns_none(self):
+        """Test a lookup that raises is reported and returns None."""
+        enricher = Enricher(MagicMock(side_effect=KeyError("data")))
+        self.addCleanup(enricher.close)
+
+        with patch("builtins.print") as mock_print:
+            self.assertIsNone(enricher.result("user1"))
+
+        mock_print.assert_called_once_with("Looking up user1 failed: 'data'")
+
+
+if __name__ == "__main__":
+    unittest.main()
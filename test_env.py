@@ -1,3 +1,4 @@
+# pylint: disable=too-many-lines
 """This is the test module for the env module."""
 
 import os
@@ -7,7 +8,7 @@ from unittest.mock import patch
 import env
 
 
-class TestEnv(unittest.TestCase):
+class TestEnv(unittest.TestCase):  # pylint: disable=too-many-public-methods
     """
     Test case for the env module.
     """
@@ -70,6 +71,21 @@ class TestEnv(unittest.TestCase):
             link_to_profile,
             _output_filename,
             _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
         ) = env.get_env_vars()
 
         self.assertEqual(organization, "org")
@@ -185,6 +201,21 @@ class TestEnv(unittest.TestCase):
             link_to_profile,
             _output_filename,
             _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
         ) = env.get_env_vars()
 
         self.assertEqual(organization, "org")
@@ -235,6 +266,21 @@ class TestEnv(unittest.TestCase):
             _link_to_profile,
             output_filename,
             _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
         ) = env.get_env_vars()
 
         self.assertEqual(output_filename, "custom-report.md")
@@ -321,6 +367,21 @@ class TestEnv(unittest.TestCase):
             _link_to_profile,
             output_filename,
             _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
         ) = env.get_env_vars()
 
         self.assertEqual(output_filename, "contributors.md")
@@ -351,6 +412,21 @@ class TestEnv(unittest.TestCase):
             _link_to_profile,
             output_filename,
             _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
         ) = env.get_env_vars()
 
         self.assertEqual(output_filename, "contributors.md")
@@ -471,6 +547,21 @@ class TestEnv(unittest.TestCase):
             _link_to_profile,
             _output_filename,
             _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
         ) = env.get_env_vars()
         self.assertEqual(start_date, "2024-01-01")
         self.assertEqual(end_date, "2025-01-01")
@@ -490,6 +581,704 @@ class TestEnv(unittest.TestCase):
             "start_date and end_date must be in the format YYYY-MM-DD",
         )
 
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "USE_COMMIT_SEARCH": "true",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_use_commit_search(self):
+        """Test that USE_COMMIT_SEARCH enables the commit search mode."""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertTrue(use_commit_search)
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "HTTP_POOL_SIZE": "64",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_http_pool_size(self):
+        """Test that HTTP_POOL_SIZE sets the connection pool size."""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(http_pool_size, 64)
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "CHECKPOINT_DIR": " checkpoints ",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_checkpoint_dir(self):
+        """Test that CHECKPOINT_DIR is read and stripped"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(checkpoint_dir, "checkpoints")
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "SHARD_INDEX": "1",
+            "SHARD_COUNT": "4",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_shard(self):
+        """Test that SHARD_INDEX and SHARD_COUNT are read as integers"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(shard_index, 1)
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "SHARD_INDEX": "4",
+            "SHARD_COUNT": "4",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_shard_index_out_of_range(self):
+        """Test that SHARD_INDEX must be lower than SHARD_COUNT."""
+        with self.assertRaises(ValueError) as cm:
+            env.get_env_vars()
+        self.assertEqual(
+            str(cm.exception), "SHARD_INDEX must be between 0 and SHARD_COUNT - 1"
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "SHARD_REDUCE": "true",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_shard_reduce_without_count(self):
+        """Test that SHARD_REDUCE requires SHARD_COUNT."""
+        with self.assertRaises(ValueError) as cm:
+            env.get_env_vars()
+        self.assertEqual(
+            str(cm.exception), "SHARD_INDEX and SHARD_REDUCE require SHARD_COUNT"
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "CACHE_DIR": " .cache ",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_cache_dir(self):
+        """Test that CACHE_DIR is read and stripped"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(cache_dir, ".cache")
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "HISTORY_DB": " history.db ",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_history_db(self):
+        """Test HISTORY_DB is read and stripped."""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(history_db, "history.db")
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "DATE_WINDOWS": "2024-01-01:2024-03-31,\n 2024-03-01:2024-03-31\n",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_date_windows(self):
+        """Test DATE_WINDOWS is read as a list of (start, end) windows."""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(
+            date_windows,
+            [("2024-01-01", "2024-03-31"), ("2024-03-01", "2024-03-31")],
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "DATE_WINDOWS": "2024-01-01",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_date_windows_invalid_format(self):
+        """Test that DATE_WINDOWS windows must be START:END dates."""
+        with self.assertRaises(ValueError) as cm:
+            env.get_env_vars()
+        self.assertEqual(
+            str(cm.exception),
+            "DATE_WINDOWS windows must be in the format YYYY-MM-DD:YYYY-MM-DD",
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "DATE_WINDOWS": "2024-01-01:2024-03-31",
+            "START_DATE": "2024-01-01",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_date_windows_with_start_date(self):
+        """Test that DATE_WINDOWS replaces START_DATE and END_DATE."""
+        with self.assertRaises(ValueError) as cm:
+            env.get_env_vars()
+        self.assertEqual(
+            str(cm.exception),
+            "DATE_WINDOWS cannot be combined with START_DATE or END_DATE",
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "DATE_WINDOWS": "2024-01-01:2024-03-31",
+            "SHARD_COUNT": "2",
+            "SHARD_INDEX": "0",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_date_windows_with_shards(self):
+        """Test that DATE_WINDOWS cannot be split across shards."""
+        with self.assertRaises(ValueError) as cm:
+            env.get_env_vars()
+        self.assertEqual(
+            str(cm.exception), "DATE_WINDOWS cannot be combined with SHARD_COUNT"
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "TIME_SERIES": "true",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_time_series(self):
+        """Test that TIME_SERIES is read as a boolean"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertTrue(time_series)
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "CONTRIBUTOR_ANALYTICS": "true",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_contributor_analytics(self):
+        """Test that CONTRIBUTOR_ANALYTICS is read as a boolean"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertTrue(contributor_analytics)
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "MATRIX_EXPORT_DIR": " matrix ",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_matrix_export_dir(self):
+        """Test that MATRIX_EXPORT_DIR is read and stripped"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(matrix_export_dir, "matrix")
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "OUTPUT_FORMATS": "CSV, parquet",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_output_formats(self):
+        """Test that OUTPUT_FORMATS is read as a list of formats"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            output_formats,
+            _event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(output_formats, ["csv", "parquet"])
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "OUTPUT_FORMATS": "csv,xlsx",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_unknown_output_format(self):
+        """Test that OUTPUT_FORMATS only accepts the formats that can be written."""
+        with self.assertRaises(ValueError) as cm:
+            env.get_env_vars()
+        self.assertEqual(
+            str(cm.exception),
+            "OUTPUT_FORMATS must be a comma separated list of csv, parquet",
+        )
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "EVENT_LOG": " events.ndjson.gz ",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_event_log_path(self):
+        """Test that EVENT_LOG is read and stripped"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            event_log_path,
+            _previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(event_log_path, "events.ndjson.gz")
+
+    @patch.dict(
+        os.environ,
+        {
+            "ORGANIZATION": "org",
+            "GH_TOKEN": "token",
+            "PREVIOUS_JSON": " last-week.json ",
+        },
+        clear=True,
+    )
+    def test_get_env_vars_previous_json(self):
+        """Test that PREVIOUS_JSON is read and stripped"""
+        (
+            _organization,
+            _repository_list,
+            _gh_app_id,
+            _gh_app_installation_id,
+            _gh_app_private_key,
+            _gh_app_enterprise_only,
+            _token,
+            _ghe,
+            _start_date,
+            _end_date,
+            _sponsor_info,
+            _link_to_profile,
+            _output_filename,
+            _show_avatar,
+            _use_commit_search,
+            _http_pool_size,
+            _checkpoint_dir,
+            _shard_index,
+            _shard_count,
+            _shard_reduce,
+            _cache_dir,
+            _history_db,
+            _date_windows,
+            _time_series,
+            _contributor_analytics,
+            _matrix_export_dir,
+            _output_formats,
+            _event_log_path,
+            previous_json,
+        ) = env.get_env_vars()
+
+        self.assertEqual(previous_json, "last-week.json")
+
 
 if __name__ == "__main__":
     unittest.main()
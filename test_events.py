@@ -0,0 +1,92 @@
+"""Test cases for the events module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import events
+from contributor_stats import ContributorStats
+
+
+class TestEventLog(unittest.TestCase):
+    """
+    Test case for the EventLog class.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "events.ndjson.gz")
+
+    def test_record_logs_commits_per_week(self):
+        """Test each author's commits are logged per repository and week."""
+        event_log = events.EventLog(self.path, {"start_date": "2023-01-01"})
+        event_log.record(
+            "2023-01-01",
+            "2023-01-14",
+            [
+                [
+                    ContributorStats(
+                        "user1",
+                        False,
+                        "avatar1",
+                        5,
+                        "commit_url",
+                        "",
+                        weekly_commits=[0, 3],
+                        repository_counts={"org/repo": 5},
+                    )
+                ],
+                [
+                    ContributorStats(
+                        "user2",
+                        False,
+                        "avatar2",
+                        2,
+                        "commit_url",
+                        "",
+                        repository_counts={"org/other": 2},
+                    )
+                ],
+            ],
+        )
+        event_log.close()
+
+        run, logged_events = events.read_events(self.path)
+
+        self.assertEqual(run, {"start_date": "2023-01-01"})
+        event = {"since": "2023-01-01", "until": "2023-01-14"}
+        self.assertEqual(
+            logged_events,
+            [
+                {
+                    **event,
+                    "repository": "org/repo",
+                    "login": "user1",
+                    "avatar_url": "avatar1",
+                    "week": "2023-01-08",
+                    "commits": 3,
+                },
+                {
+                    **event,
+                    "repository": "org/repo",
+                    "login": "user1",
+                    "avatar_url": "avatar1",
+                    "week": None,
+                    "commits": 2,
+                },
+                {
+                    **event,
+                    "repository": "org/other",
+                    "login": "user2",
+                    "avatar_url": "avatar2",
+                    "week": None,
+                    "commits": 2,
+                },
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+"""Test cases for the history module."""
+
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+import history
+from history import HistoryStore
+
+
+def utc(*args):
+    """Return a UTC datetime"""
+    return datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+
+
+class TestHistoryStore(unittest.TestCase):
+    """
+    Test case for the HistoryStore class.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "history.db")
+        self.store = HistoryStore(self.path)
+        self.addCleanup(self.store.close)
+
+    def test_load_slices_counts_commits_in_the_window(self):
+        """Test fetched ranges are clipped to the window and counted per author."""
+        self.store.record(
+            "org/repo",
+            utc(2022, 1, 1),
+            utc(2022, 1, 31),
+            [
+                ("user1", "avatar1", "2022-01-05T10:00:00Z", "a"),
+                ("user1", "avatar1", "2022-01-20T10:00:00Z", "b"),
+                ("user2", "avatar2", "2022-01-21T10:00:00Z", "c"),
+                ("dependabot[bot]", "avatar", "2022-01-21T11:00:00Z", "d"),
+                (None, None, "2022-01-22T10:00:00Z", "e"),
+            ],
+        )
+
+        self.assertEqual(
+            self.store.load_slices("org/repo", utc(2022, 1, 10), utc(2022, 2, 28)),
+            [
+                (
+                    "2022-01-10T00:00:00+00:00",
+                    "2022-01-31T00:00:00+00:00",
+                    {
+                        "user1": {
+                            "avatar_url": "avatar1",
+                            "contribution_count": 1,
+                            "weeks": {"2022-01-16": 1},
+                        },
+                        "user2": {
+                            "avatar_url": "avatar2",
+                            "contribution_count": 1,
+                            "weeks": {"2022-01-16": 1},
+                        },
+                    },
+                    4,
+                )
+            ],
+        )
+        self.assertEqual(
+            self.store.load_slices("org/repo", utc(2022, 2, 1), utc(2022, 2, 28)), []
+        )
+        self.assertEqual(
+            self.store.load_slices("org/other", utc(2022, 1, 1), utc(2022, 1, 31)), []
+        )
+
+    def test_adjacent_ranges_are_merged_and_commits_kept_once(self):
+        """Test touching ranges load as one slice and a commit saved twice counts once."""
+        commit = ("user1", "avatar1", "2022-01-01T12:00:00Z", "a")
+        self.store.record(
+            "org/repo", utc(2022, 1, 1), utc(2022, 1, 1, 23, 59, 59), [commit]
+        )
+        self.store.record("org/repo", utc(2022, 1, 2), utc(2022, 1, 3), [])
+        self.store.record("org/repo", utc(2022, 1, 1), utc(2022, 1, 2), [commit])
+
+        slices = self.store.load_slices("org/repo", utc(2022, 1, 1), utc(2022, 1, 3))
+
+        self.assertEqual(len(slices), 1)
+        self.assertEqual(slices[0][1], "2022-01-03T00:00:00+00:00")
+        self.assertEqual(slices[0][3], 1)
+
+    def test_recent_ranges_are_fetched_again(self):
+        """Test the part of a range within the settle margin is left to fetch later."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        tomorrow = now + datetime.timedelta(days=1)
+        self.store.record("org/repo", utc(2022, 1, 1), tomorrow, [])
+        self.store.record("org/repo", now - datetime.timedelta(days=3), now, [])
+
+        slices = self.store.load_slices("org/repo", utc(2022, 1, 1), tomorrow)
+
+        self.assertEqual(len(slices), 1)
+        self.assertLessEqual(
+            datetime.datetime.fromisoformat(slices[0][1]),
+            now - history.SETTLE_MARGIN,
+        )
+
+    def test_store_without_settle_margin_covers_up_to_now(self):
+        """Test a store for one run only leaves its future part to fetch."""
+        store = HistoryStore(self.path, datetime.timedelta(0))
+        self.addCleanup(store.close)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        store.record("org/repo", now - datetime.timedelta(days=7), now, [])
+
+        slices = store.load_slices("org/repo", now - datetime.timedelta(days=7), now)
+
+        self.assertEqual(len(slices), 1)
+        self.assertGreater(
+            datetime.datetime.fromisoformat(slices[0][1]),
+            now - datetime.timedelta(minutes=1),
+        )
+
+    def test_whole_weeks_are_counted_from_their_rollup(self):
+        """Test a window counts its whole weeks and its edges like its commits."""
+        self.store.record(
+            "org/repo",
+            utc(2022, 12, 30),
+            utc(2023, 1, 10),
+            [
+                ("user1", "avatar1", "2023-01-02T10:00:00Z", "a"),
+                (None, None, "2023-01-03T10:00:00Z", "b"),
+                ("user1", "avatar1", "2023-01-09T10:00:00Z", "c"),
+            ],
+        )
+
+        self.assertEqual(
+            self.store.load_slices("org/repo", utc(2023, 1, 1), utc(2023, 1, 10)),
+            [
+                (
+                    "2023-01-01T00:00:00+00:00",
+                    "2023-01-10T00:00:00+00:00",
+                    {
+                        "user1": {
+                            "avatar_url": "avatar1",
+                            "contribution_count": 2,
+                            "weeks": {"2023-01-01": 1, "2023-01-08": 1},
+                        }
+                    },
+                    3,
+                )
+            ],
+        )
+
+    def test_commits_persist_across_runs(self):
+        """Test a new store on the same file finds the commits of an earlier run."""
+        self.store.record(
+            "org/repo",
+            utc(2022, 1, 1),
+            utc(2022, 1, 2),
+            [("user1", "avatar1", "2022-01-01T12:00:00Z", "a")],
+        )
+        self.store.close()
+
+        store = HistoryStore(self.path)
+        self.addCleanup(store.close)
+        self.assertEqual(
+            store.load_slices("org/repo", utc(2022, 1, 1), utc(2022, 1, 2))[0][3], 1
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -60,6 +60,48 @@ class TestWriteToJson(unittest.TestCase):
             result = json.load(f)
         self.assertDictEqual(result, self.data)
 
+    def test_write_to_json_with_time_series(self):
+        """Test that write_to_json adds the weekly commits and their weeks."""
+        contributors = (
+            ContributorStats(
+                username="test_user",
+                new_contributor=False,
+                avatar_url="https://test_url.com",
+                contribution_count=10,
+                commit_url="https://test_commit_url.com",
+                sponsor_info="",
+                weekly_commits=[1, 0, 4, 5, 0, 0],
+            ),
+        )
+
+        write_to_json(
+            contributors=contributors,
+            filename=self.filename,
+            start_date=self.data["start_date"],
+            end_date=self.data["end_date"],
+            organization=self.data["organization"],
+            repository_list=self.data["repository_list"],
+            sponsor_info=self.data["sponsor_info"],
+            link_to_profile=self.data["link_to_profile"],
+            time_series=True,
+        )
+        with open(self.filename, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        self.assertEqual(
+            result["weeks"],
+            [
+                "2021-12-26",
+                "2022-01-02",
+                "2022-01-09",
+                "2022-01-16",
+                "2022-01-23",
+                "2022-01-30",
+            ],
+        )
+        self.assertEqual(
+            result["contributors"][0]["weekly_commits"], [1, 0, 4, 5, 0, 0]
+        )
+
     def tearDown(self):
         os.remove(self.filename)
 
@@ -4,7 +4,7 @@ import unittest
 from unittest.mock import mock_open, patch
 
 import contributor_stats
-from markdown import write_to_markdown
+from markdown import get_analytics_table, get_delta_table, write_to_markdown
 
 
 class TestMarkdown(unittest.TestCase):
@@ -213,6 +213,56 @@ class TestMarkdown(unittest.TestCase):
         )
         mock_file().write.assert_called_once_with(expected_content)
 
+    @patch(
+        "markdown.os.environ.get", return_value=None
+    )  # Mock GITHUB_STEP_SUMMARY to None
+    @patch("builtins.open", new_callable=mock_open)
+    def test_write_to_markdown_with_time_series(
+        self, mock_file, mock_env_get
+    ):  # pylint: disable=unused-argument
+        """
+        Test the write_to_markdown function with the weekly commits turned on.
+        """
+        person1 = contributor_stats.ContributorStats(
+            "user1",
+            False,
+            "url",
+            8,
+            "commit url",
+            "",
+            weekly_commits=[0, 2, 6, 0],
+        )
+
+        write_to_markdown(
+            [person1],
+            "filename",
+            "2023-01-01",
+            "2023-01-28",
+            None,
+            "org/repo",
+            "false",
+            False,
+            "",
+            time_series=True,
+        )
+
+        expected_content = (
+            "# Contributors\n\n"
+            "- Date range for contributor list:  2023-01-01 to 2023-01-28\n"
+            "- Repository: org/repo\n\n"
+            "| Total Contributors | Total Contributions | % New Contributors |\n"
+            "| --- | --- | --- |\n"
+            "| 1 | 8 | 0.0% |\n\n"
+            "| Username | Contribution Count | New Contributor | Weekly Commits | "
+            "Commits between 2023-01-01 and 2023-01-28 |\n"
+            "| --- | --- | --- | --- | --- |\n"
+            "| user1 | 8 | False | ▁▃█▁ | commit url |\n"
+            "\n _this file was generated by the "
+            "[Contributors GitHub Action]"
+            "(https://github.com/github-community-projects/contributors)_\n"
+        )
+        mock_file().write.assert_called_once_with(expected_content)
+
     @patch(
         "markdown.os.environ.get", return_value=None
     )  # Mock GITHUB_STEP_SUMMARY to None
@@ -566,6 +616,65 @@ class TestMarkdown(unittest.TestCase):
         )
         mock_file().write.assert_called_once_with(expected_content)
 
+    def test_get_analytics_table(self):
+        """
+        Test the get_analytics_table function.
+        """
+        analytics = {
+            "top_contributors": 10,
+            "top_share": 80.5,
+            "gini": 0.42,
+            "percentiles": {"p50": 3.0, "p90": 12.5, "p99": 40.0},
+            "repositories": {
+                "org/repo": {
+                    "contributors": 4,
+                    "bus_factor": 2,
+                    "new_contributor_rate": 25.0,
+                }
+            },
+        }
+
+        self.assertEqual(
+            get_analytics_table(analytics, "2023-01-01", "2023-01-02"),
+            "| Top 10 Share | Gini Coefficient | 50th Percentile | 90th Percentile | "
+            "99th Percentile |\n"
+            "| --- | --- | --- | --- | --- |\n"
+            "| 80.5% | 0.42 | 3.0 | 12.5 | 40.0 |\n\n"
+            "| Repository | Contributors | Bus Factor | % New Contributors |\n"
+            "| --- | --- | --- | --- |\n"
+            "| org/repo | 4 | 2 | 25.0% |\n\n",
+        )
+
+    def test_get_delta_table(self):
+        """
+        Test the get_delta_table function.
+        """
+        delta = {
+            "appeared": [{"username": "user4", "contribution_count": 2}],
+            "vanished": [{"username": "user3", "contribution_count": 1}],
+            "changed": [
+                {
+                    "username": "user2",
+                    "previous_count": 3,
+                    "contribution_count": 5,
+                    "change": 2,
+                }
+            ],
+        }
+
+        self.assertEqual(
+            get_delta_table(delta),
+            "| Appeared Contributors | Vanished Contributors | "
+            "Changed Contribution Counts |\n"
+            "| --- | --- | --- |\n"
+            "| 1 | 1 | 1 |\n\n"
+            "| Username | Change | Previous Contribution Count | Contribution Count |\n"
+            "| --- | --- | --- | --- |\n"
+            "| user4 | appeared | 0 | 2 |\n"
+            "| user3 | vanished | 1 | 0 |\n"
+            "| user2 | +2 | 3 | 5 |\n\n",
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
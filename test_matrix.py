@@ -0,0 +1,78 @@
+"""Test cases for the matrix module."""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import matrix
+from contributor_stats import ContributorStats
+
+
+class TestMatrix(unittest.TestCase):
+    """
+    Test case for the matrix module.
+    """
+
+    def setUp(self):
+        self.directory = os.path.join(tempfile.mkdtemp(), "matrix")
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.directory))
+        self.contributors = [
+            ContributorStats(
+                "user1",
+                False,
+                "url",
+                7,
+                "commit_url",
+                "",
+                repository_counts={"org/b": 5, "org/a": 2},
+            ),
+            ContributorStats("user2", False, "url", 3, "commit_url", ""),
+            ContributorStats(
+                "user3",
+                False,
+                "url",
+                1,
+                "commit_url",
+                "",
+                repository_counts={"org/b": 1, "org/c": 0},
+            ),
+        ]
+
+    def test_write_and_read_matrix(self):
+        """Test a written matrix reads back as CSR arrays with its index files."""
+        matrix.write_matrix(self.directory, self.contributors)
+
+        contributors, repositories, indptr, indices, data = matrix.read_matrix(
+            self.directory
+        )
+
+        self.assertEqual(contributors, ["user1", "user2", "user3"])
+        self.assertEqual(repositories, ["org/a", "org/b", "org/c"])
+        self.assertEqual(list(indptr), [0, 2, 2, 3])
+        self.assertEqual(list(indices), [0, 1, 1])
+        self.assertEqual(list(data), [2, 5, 1])
+
+    def test_matrix_file_layout(self):
+        """Test the matrix file is the header followed by the packed arrays."""
+        matrix.write_matrix(self.directory, self.contributors)
+
+        with open(os.path.join(self.directory, matrix.MATRIX_FILENAME), "rb") as f:
+            content = f.read()
+
+        self.assertEqual(content[:28], struct.pack("<4sQQQ", b"CSR1", 3, 3, 3))
+        self.assertEqual(len(content), 28 + 4 * 8 + 3 * 4 + 3 * 4)
+
+    def test_read_matrix_rejects_other_files(self):
+        """Test reading a file that is not a matrix raises a ValueError."""
+        os.makedirs(self.directory)
+        with open(os.path.join(self.directory, matrix.MATRIX_FILENAME), "wb") as f:
+            f.write(b"\0" * matrix.HEADER.size)
+
+        with self.assertRaises(ValueError):
+            matrix.read_matrix(self.directory)
+
+
+if __name__ == "__main__":
+    unittest.main()
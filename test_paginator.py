@@ -0,0 +1,287 @@
+"""Test cases for the paginator module."""
+
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import github3
+import paginator
+
+API_URL = "https://api.github.com/repos/owner/repo/commits"
+
+
+def make_response(page, last_page=None, status_code=200):
+    """Build a fake paginated response for the given page number."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.links = {}
+    if last_page is None or page < last_page:
+        response.links["next"] = {"url": f"{API_URL}?per_page=100&page={page + 1}"}
+    if last_page is not None:
+        response.links["last"] = {"url": f"{API_URL}?per_page=100&page={last_page}"}
+    response.page = page
+    return response
+
+
+def wait_for_prefetch(session):
+    """Block until every prefetch the session has started is finished."""
+    listings = session._listings  # pylint: disable=protected-access
+    for listing in list(listings.values()):
+        for future in list(listing["pages"].values()):
+            future.result()
+
+
+class TestPrefetchingSession(unittest.TestCase):
+    """
+    Test case for the PrefetchingSession class.
+    """
+
+    def setUp(self):
+        self.requested = []
+
+    def fake_request(self, last_page=None):
+        """Return a GitHubSession.request replacement serving numbered pages."""
+
+        def request(_session, method, url, **kwargs):
+            self.requested.append((method, url))
+            page = int(
+                paginator.parse_qs(paginator.urlparse(url).query).get("page", ["1"])[0]
+            )
+            if kwargs.get("params"):
+                page = int(kwargs["params"].get("page", page))
+            return make_response(page, last_page)
+
+        return request
+
+    def test_fans_out_up_to_depth_when_last_page_is_known(self):
+        """Test pages up to depth ahead are requested once and served from the cache."""
+        session = paginator.PrefetchingSession(depth=3)
+        with patch(
+            "github3.session.GitHubSession.request",
+            autospec=True,
+            side_effect=self.fake_request(last_page=10),
+        ):
+            first = session.get(API_URL, params={"per_page": 100})
+            wait_for_prefetch(session)
+            prefetched = sorted(url for _, url in self.requested[1:])
+            second = session.request("GET", f"{API_URL}?per_page=100&page=2")
+
+        self.assertEqual(first.page, 1)
+        self.assertEqual(second.page, 2)
+        self.assertEqual(
+            prefetched,
+            [f"{API_URL}?per_page=100&page={page}" for page in (2, 3, 4)],
+        )
+        # page 2 was served from the prefetched pages, not requested again
+        self.assertEqual(
+            [url for _, url in self.requested].count(f"{API_URL}?per_page=100&page=2"),
+            1,
+        )
+
+    def test_prefetches_next_page_without_last_link(self):
+        """Test only the rel=next page is prefetched when there is no rel=last."""
+        session = paginator.PrefetchingSession(depth=3)
+        with patch(
+            "github3.session.GitHubSession.request",
+            autospec=True,
+            side_effect=self.fake_request(),
+        ):
+            session.get(f"{API_URL}?page=1")
+            wait_for_prefetch(session)
+
+        self.assertEqual(
+            [url for _, url in self.requested],
+            [f"{API_URL}?page=1", f"{API_URL}?per_page=100&page=2"],
+        )
+
+    def test_does_not_prefetch_other_methods_or_errors(self):
+        """Test POST requests and failed GET requests never trigger prefetching."""
+        session = paginator.PrefetchingSession()
+        with patch(
+            "github3.session.GitHubSession.request",
+            autospec=True,
+            return_value=make_response(1, 5, status_code=500),
+        ) as mock_request:
+            session.post(API_URL, json={})
+            session.get(API_URL)
+            wait_for_prefetch(session)
+
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_does_not_prefetch_search_results(self):
+        """Test search pages are only fetched when they are asked for."""
+        session = paginator.PrefetchingSession()
+        search_url = "https://api.github.com/search/commits?q=org%3Aorg&page=1"
+
+        with patch.object(
+            github3.session.GitHubSession, "request", autospec=True
+        ) as mock_request:
+            mock_request.return_value = make_response(1, last_page=5)
+            session.request("GET", search_url)
+
+        self.assertEqual(mock_request.call_count, 1)
+        listings = session._listings  # pylint: disable=protected-access
+        self.assertEqual(len(listings), 0)
+
+    def test_listings_read_together_keep_their_pages(self):
+        """Test many listings read in turns never lose the pages fetched for them."""
+        session = paginator.PrefetchingSession(depth=4)
+        requested = []
+
+        with_page = paginator._with_page  # pylint: disable=protected-access
+
+        def request(_session, _method, url, **_kwargs):
+            requested.append(url)
+            parsed = paginator.urlparse(url)
+            page = int(paginator.parse_qs(parsed.query).get("page", ["1"])[0])
+            response = MagicMock(status_code=200, page=page)
+            response.links = {"last": {"url": with_page(url, 10)}}
+            if page < 10:
+                response.links["next"] = {"url": with_page(url, page + 1)}
+            return response
+
+        urls = [f"{API_URL}?sha=branch{number}" for number in range(40)]
+        with patch(
+            "github3.session.GitHubSession.request", autospec=True, side_effect=request
+        ):
+            for page in range(1, 11):
+                for url in urls:
+                    page_url = url if page == 1 else f"{url}&page={page}"
+                    self.assertEqual(session.request("GET", page_url).page, page)
+                wait_for_prefetch(session)
+
+        self.assertEqual(len(requested), len(urls) * 10)
+        self.assertEqual(len(set(requested)), len(urls) * 10)
+
+    def test_queued_page_is_fetched_by_the_caller(self):
+        """Test a page whose prefetch has not started is not waited for."""
+        session = paginator.PrefetchingSession(depth=1)
+        blocked = threading.Event()
+        self.addCleanup(blocked.set)
+        # Keep every pool thread busy so the prefetched page stays queued
+        for _ in range(paginator.PREFETCH_WORKERS):
+            session._executor.submit(blocked.wait)  # pylint: disable=protected-access
+
+        with patch(
+            "github3.session.GitHubSession.request",
+            autospec=True,
+            side_effect=self.fake_request(last_page=2),
+        ):
+            session.get(API_URL, params={"per_page": 100})
+            second = session.request("GET", f"{API_URL}?per_page=100&page=2")
+
+        self.assertEqual(second.page, 2)
+        self.assertEqual(
+            [url for _, url in self.requested],
+            [API_URL, f"{API_URL}?per_page=100&page=2"],
+        )
+
+    def test_prefetch_pages_limits_a_listing(self):
+        """Test no page after prefetch_pages is fetched ahead for the listing."""
+        session = paginator.PrefetchingSession(depth=4)
+        with patch(
+            "github3.session.GitHubSession.request",
+            autospec=True,
+            side_effect=self.fake_request(last_page=10),
+        ):
+            session.get(API_URL, params={"per_page": 100}, prefetch_pages=2)
+            wait_for_prefetch(session)
+            session.request("GET", f"{API_URL}?per_page=100&page=2")
+            wait_for_prefetch(session)
+
+        self.assertEqual(
+            [url for _, url in self.requested],
+            [API_URL, f"{API_URL}?per_page=100&page=2"],
+        )
+
+    def test_page_key_ignores_param_order_and_encoding(self):
+        """Test a Link url and the same url built from params share one key."""
+        self.assertEqual(
+            paginator._page_key(  # pylint: disable=protected-access
+                f"{API_URL}?until=2022-01-01T00%3A00%3A00Z&page=2", None
+            ),
+            paginator._page_key(  # pylint: disable=protected-access
+                API_URL, {"page": 2, "until": "2022-01-01T00:00:00Z", "since": None}
+            ),
+        )
+
+
+class TestIterJsonPages(unittest.TestCase):
+    """
+    Test case for the iter_json_pages function.
+    """
+
+    def test_follows_next_links(self):
+        """Test every page is decoded and the next link is followed without params."""
+        first = MagicMock(status_code=200, content=b'[{"sha": "1"}]')
+        first.links = {"next": {"url": f"{API_URL}?page=2"}}
+        second = MagicMock(status_code=200, content=b'[{"sha": "2"}]')
+        second.links = {}
+        session = MagicMock()
+        session.get.side_effect = [first, second]
+
+        pages = list(paginator.iter_json_pages(session, API_URL, {"per_page": 100}))
+
+        self.assertEqual(pages, [[{"sha": "1"}], [{"sha": "2"}]])
+        self.assertEqual(session.get.call_args_list[1].kwargs, {"params": None})
+        self.assertEqual(session.get.call_args_list[1].args, (f"{API_URL}?page=2",))
+
+    def test_passes_prefetch_pages_with_the_first_page(self):
+        """Test only the first request tells the session how far to prefetch."""
+        first = MagicMock(status_code=200, content=b"[]")
+        first.links = {"next": {"url": f"{API_URL}?page=2"}}
+        second = MagicMock(status_code=200, content=b"[]")
+        second.links = {}
+        session = MagicMock()
+        session.get.side_effect = [first, second]
+
+        list(paginator.iter_json_pages(session, API_URL, prefetch_pages=11))
+
+        self.assertEqual(
+            session.get.call_args_list[0].kwargs,
+            {"params": None, "prefetch_pages": 11},
+        )
+        self.assertEqual(session.get.call_args_list[1].kwargs, {"params": None})
+
+    def test_raises_github3_error_on_failure(self):
+        """Test a failed page raises the same exception github3 iterators raise."""
+        response = MagicMock(status_code=409, content=b"{}")
+        response.json.return_value = {"message": "Git Repository is empty."}
+        session = MagicMock()
+        session.get.return_value = response
+
+        with self.assertRaises(github3.exceptions.Conflict):
+            list(paginator.iter_json_pages(session, API_URL))
+
+    @patch("paginator.time.sleep")
+    def test_gives_up_when_rate_limit_persists(self, mock_sleep):
+        """Test a page still refused after its rate limit waits raises."""
+        response = MagicMock(status_code=429, content=b"{}")
+        response.headers = {"Retry-After": "3"}
+        response.json.return_value = {"message": "rate limited"}
+        session = MagicMock()
+        session.get.return_value = response
+
+        with self.assertRaises(github3.exceptions.GitHubError):
+            list(paginator.iter_json_pages(session, API_URL, rate_limit_waits=2))
+
+        self.assertEqual(session.get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        mock_sleep.assert_called_with(3.0)
+
+    def test_does_not_wait_by_default(self):
+        """Test a rate limited page raises at once unless waits are asked for."""
+        response = MagicMock(status_code=429, content=b"{}")
+        response.headers = {"Retry-After": "3"}
+        response.json.return_value = {"message": "rate limited"}
+        session = MagicMock()
+        session.get.return_value = response
+
+        with self.assertRaises(github3.exceptions.GitHubError):
+            list(paginator.iter_json_pages(session, API_URL))
+
+        session.get.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
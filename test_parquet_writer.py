@@ -0,0 +1,94 @@
+"""Test the write_to_parquet function in parquet_writer.py."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import parquet_writer
+from contributor_stats import ContributorStats
+
+
+class TestWriteToParquet(unittest.TestCase):
+    """Test the write_to_parquet function."""
+
+    def setUp(self):
+        """Set up the files for the tests."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.filename = os.path.join(directory, "contributors.parquet")
+        self.repositories_filename = os.path.join(
+            directory, "contributors-repositories.parquet"
+        )
+
+    def test_write_to_parquet_requires_pyarrow(self):
+        """Test that write_to_parquet explains that pyarrow is missing."""
+        with patch.object(parquet_writer, "pyarrow", None):
+            with self.assertRaises(ValueError) as cm:
+                parquet_writer.write_to_parquet(
+                    [], self.filename, self.repositories_filename
+                )
+        self.assertEqual(
+            str(cm.exception), "OUTPUT_FORMATS parquet requires the pyarrow package"
+        )
+
+    @unittest.skipIf(parquet_writer.pyarrow is None, "pyarrow is not installed")
+    def test_write_to_parquet(self):
+        """Test that write_to_parquet writes typed, dictionary encoded columns."""
+        contributors = [
+            ContributorStats(
+                "user1",
+                False,
+                "url1",
+                10,
+                "commit_url",
+                "",
+                repository_counts={"org/repo1": 7, "org/repo2": 3},
+            ),
+            ContributorStats(
+                "user2",
+                False,
+                "url2",
+                1,
+                "commit_url",
+                "https://github.com/sponsors/user2",
+                repository_counts={"org/repo1": 1},
+            ),
+        ]
+
+        with patch.object(parquet_writer, "BATCH_SIZE", 1):
+            parquet_writer.write_to_parquet(
+                contributors, self.filename, self.repositories_filename
+            )
+
+        table = parquet_writer.pyarrow.parquet.read_table(self.filename)
+        self.assertEqual(
+            table.to_pydict(),
+            {
+                "username": ["user1", "user2"],
+                "new_contributor": [False, False],
+                "avatar_url": ["url1", "url2"],
+                "contribution_count": [10, 1],
+                "sponsor_info": [None, "https://github.com/sponsors/user2"],
+            },
+        )
+        repositories = parquet_writer.pyarrow.parquet.read_table(
+            self.repositories_filename
+        )
+        self.assertEqual(
+            str(repositories.schema.field("repository").type),
+            "dictionary<values=string, indices=int32, ordered=0>",
+        )
+        self.assertEqual(
+            repositories.to_pydict(),
+            {
+                "username": ["user1", "user1", "user2"],
+                "repository": ["org/repo1", "org/repo2", "org/repo1"],
+                "contribution_count": [7, 3, 1],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
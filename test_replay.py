@@ -0,0 +1,141 @@
+"""Test cases for the replay module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import contributors
+import events
+import replay
+from contributor_stats import ContributorStats
+
+
+class TestReplay(unittest.TestCase):
+    """
+    Test case for the replay module.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "events.ndjson.gz")
+        event_log = events.EventLog(
+            self.path,
+            {
+                "start_date": "2023-01-01",
+                "end_date": "2023-01-14",
+                "organization": "org",
+                "repository_list": [],
+                "ghe": "",
+            },
+        )
+        event_log.record(
+            "2023-01-01",
+            "2023-01-14",
+            [
+                contributors.build_contributors(
+                    "org/repo1",
+                    {
+                        "user1": {
+                            "avatar_url": "avatar1",
+                            "contribution_count": 3,
+                            "weeks": {"2023-01-01": 1, "2023-01-08": 2},
+                        },
+                        "user2": {
+                            "avatar_url": "avatar2",
+                            "contribution_count": 1,
+                            "weeks": {"2023-01-08": 1},
+                        },
+                    },
+                    "2023-01-01",
+                    "2023-01-14",
+                    "",
+                ),
+                contributors.build_contributors(
+                    "org/repo2",
+                    {"user1": {"avatar_url": "avatar1", "contribution_count": 4}},
+                    "2023-01-01",
+                    "2023-01-14",
+                    "",
+                ),
+            ],
+        )
+        event_log.record(
+            "2008-02-29",
+            "2023-01-01",
+            [
+                [
+                    ContributorStats(
+                        "user1",
+                        False,
+                        "avatar1",
+                        9,
+                        "commit_url",
+                        "",
+                        repository_counts={"org/repo1": 9},
+                    )
+                ]
+            ],
+        )
+        event_log.close()
+
+    def test_rebuild_contributors(self):
+        """Test the contributors of a date range are rebuilt from its events."""
+        _, logged_events = events.read_events(self.path)
+
+        replayed = replay.rebuild_contributors(
+            logged_events, "2023-01-01", "2023-01-14", ""
+        )
+
+        self.assertEqual([c.username for c in replayed], ["user1", "user2"])
+        self.assertEqual(replayed[0].contribution_count, 7)
+        self.assertEqual(replayed[0].weekly_commits, [1, 2])
+        self.assertEqual(
+            replayed[0].repository_counts, {"org/repo1": 3, "org/repo2": 4}
+        )
+        self.assertEqual(
+            replayed[0].commit_url,
+            "https://github.com/org/repo1/commits?author=user1&since=2023-01-01&until=2023-01-14, "
+            "https://github.com/org/repo2/commits?author=user1&since=2023-01-01&until=2023-01-14",
+        )
+
+    @patch.object(contributors, "write_reports")
+    def test_main_writes_reports_of_a_subset(self, mock_write_reports):
+        """Test main reports on the requested repositories and marks new contributors."""
+        with patch.dict(
+            os.environ,
+            {"EVENT_LOG": self.path, "REPOSITORY": "org/repo1", "SHOW_AVATAR": "true"},
+            clear=True,
+        ):
+            replay.main()
+
+        args = mock_write_reports.call_args.args
+        replayed = args[0]
+        self.assertEqual(
+            [(c.username, c.contribution_count, c.new_contributor) for c in replayed],
+            [("user1", 3, False), ("user2", 1, True)],
+        )
+        self.assertEqual(
+            args[1:7],
+            (
+                "contributors.md",
+                "contributors.json",
+                "2023-01-01",
+                "2023-01-14",
+                "",
+                ["org/repo1"],
+            ),
+        )
+        self.assertTrue(args[10])
+
+    def test_get_env_vars_requires_event_log(self):
+        """Test replaying without EVENT_LOG raises a ValueError."""
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                replay.get_env_vars()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Test cases for the repository module."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import github3
+from repository import RepositoryHandle
+
+
+class TestRepositoryHandle(unittest.TestCase):
+    """
+    Test case for the RepositoryHandle class.
+    """
+
+    def setUp(self):
+        self.github_connection = MagicMock()
+        self.github_connection.session.build_url.side_effect = lambda *parts: (
+            "https://api.github.com/" + "/".join(parts)
+        )
+        self.handle = RepositoryHandle(self.github_connection, "owner/repo")
+
+    def test_init_makes_no_request(self):
+        """Test creating a handle does not request the repository."""
+        self.assertEqual(self.handle.full_name, "owner/repo")
+        self.assertEqual(self.handle.owner, "owner")
+        self.assertEqual(self.handle.name, "repo")
+        self.github_connection.repository.assert_not_called()
+
+    def test_metadata_is_fetched_lazily_once(self):
+        """Test the repository metadata is requested on first access only."""
+        metadata = MagicMock()
+        self.github_connection.repository.return_value = metadata
+
+        self.assertIs(self.handle.metadata, metadata)
+        self.assertIs(self.handle.metadata, metadata)
+        self.github_connection.repository.assert_called_once_with("owner", "repo")
+
+    def test_listing(self):
+        """Test the listing JSON is read from known metadata without a request."""
+        self.assertEqual(self.handle.listing, {})
+        metadata = MagicMock()
+        metadata.as_dict.return_value = {"size": 42}
+        handle = RepositoryHandle(self.github_connection, "owner/repo", metadata)
+
+        self.assertEqual(handle.listing, {"size": 42})
+        self.github_connection.repository.assert_not_called()
+
+    def test_metadata_given_up_front_is_not_fetched(self):
+        """Test known metadata is used without a request."""
+        metadata = MagicMock()
+        handle = RepositoryHandle(self.github_connection, "owner/repo", metadata)
+
+        self.assertIs(handle.metadata, metadata)
+        self.github_connection.repository.assert_not_called()
+
+    @patch("github3.structs.GitHubIterator")
+    def test_commits(self, mock_iterator):
+        """Test commits iterates the commits endpoint with the date range."""
+        self.handle.commits(since="2022-01-01", until="2022-12-31")
+
+        mock_iterator.assert_called_once_with(
+            -1,
+            "https://api.github.com/repos/owner/repo/commits",
+            github3.repos.commit.ShortCommit,
+            self.github_connection,
+            {"since": "2022-01-01", "until": "2022-12-31"},
+        )
+
+    @patch("repository.paginator.iter_json_pages")
+    def test_commit_authors_reads_raw_pages(self, mock_iter_json_pages):
+        """Test commit_authors extracts logins and avatars from the raw commit JSON."""
+        mock_iter_json_pages.return_value = iter(
+            [
+                [
+                    {
+                        "sha": "abc",
+                        "author": {"login": "user1", "avatar_url": "avatar1"},
+                        "commit": {"committer": {"date": "2022-01-02T00:00:00Z"}},
+                    },
+                    {
+                        "sha": "def",
+                        "author": None,
+                        "commit": {"committer": {"date": "2022-01-01T00:00:00Z"}},
+                    },
+                ]
+            ]
+        )
+
+        result = list(self.handle.commit_authors("2022-01-01", "2022-12-31", 11))
+
+        self.assertEqual(
+            result,
+            [
+                ("user1", "avatar1", "2022-01-02T00:00:00Z", "abc"),
+                (None, None, "2022-01-01T00:00:00Z", "def"),
+            ],
+        )
+        mock_iter_json_pages.assert_called_once_with(
+            self.github_connection.session,
+            "https://api.github.com/repos/owner/repo/commits",
+            {"per_page": 100, "since": "2022-01-01", "until": "2022-12-31"},
+            prefetch_pages=11,
+        )
+
+    def test_contributor_statistics(self):
+        """Test contributor_statistics reads the total commits of each author."""
+        response = self.github_connection.session.get.return_value
+        response.status_code = 200
+        response.json.return_value = [
+            {"author": {"login": "user1", "avatar_url": "avatar1"}, "total": 12},
+            {"author": None, "total": 3},
+        ]
+
+        self.assertEqual(
+            self.handle.contributor_statistics(), [("user1", "avatar1", 12)]
+        )
+        self.github_connection.session.get.assert_called_once_with(
+            "https://api.github.com/repos/owner/repo/stats/contributors"
+        )
+
+    def test_contributor_statistics_not_ready(self):
+        """Test contributor_statistics returns None while GitHub computes them."""
+        self.github_connection.session.get.return_value.status_code = 202
+
+        self.assertIsNone(self.handle.contributor_statistics())
+
+    def test_contributor_statistics_of_empty_repository(self):
+        """Test contributor_statistics returns no authors for an empty repository."""
+        self.github_connection.session.get.return_value.status_code = 204
+
+        self.assertEqual(self.handle.contributor_statistics(), [])
+
+    @patch("github3.structs.GitHubIterator")
+    def test_contributors(self, mock_iterator):
+        """Test contributors iterates the contributors endpoint."""
+        self.handle.contributors()
+
+        mock_iterator.assert_called_once_with(
+            -1,
+            "https://api.github.com/repos/owner/repo/contributors",
+            github3.users.Contributor,
+            self.github_connection,
+            {},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
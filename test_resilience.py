@@ -0,0 +1,84 @@
+"""Test cases for the resilience module."""
+
+import unittest
+from unittest.mock import patch
+
+import resilience
+
+
+class TestBackoffDelay(unittest.TestCase):
+    """
+    Test case for the backoff_delay function.
+    """
+
+    def test_backoff_delay_grows_up_to_its_cap(self):
+        """Test the random delay stays below an exponentially growing cap."""
+        with patch("resilience.random.uniform", side_effect=lambda low, high: high):
+            delays = [resilience.backoff_delay(attempt) for attempt in range(1, 10)]
+
+        self.assertEqual(delays[:3], [1.0, 2.0, 4.0])
+        self.assertEqual(delays[-1], resilience.BACKOFF_MAX)
+
+    def test_backoff_delay_is_jittered(self):
+        """Test the delay is drawn at random from zero."""
+        with patch("resilience.random.uniform", return_value=0.3) as mock_uniform:
+            self.assertEqual(resilience.backoff_delay(3), 0.3)
+
+        mock_uniform.assert_called_once_with(0, 4.0)
+
+
+@patch("resilience.time.sleep")
+@patch("resilience.time.monotonic", return_value=1000.0)
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Test case for the CircuitBreaker class.
+    """
+
+    def setUp(self):
+        self.breaker = resilience.CircuitBreaker()
+
+    def test_circuit_opens_after_consecutive_failures(self, _, mock_sleep):
+        """Test a host is paused after FAILURE_THRESHOLD failures in a row."""
+        for _ in range(resilience.FAILURE_THRESHOLD - 1):
+            self.breaker.record("api.github.com", True)
+        self.assertFalse(self.breaker.is_open("api.github.com"))
+
+        self.breaker.record("api.github.com", True)
+
+        self.assertTrue(self.breaker.is_open("api.github.com"))
+        self.assertFalse(self.breaker.is_open("uploads.github.com"))
+        with patch("builtins.print"):
+            self.breaker.wait("api.github.com")
+        mock_sleep.assert_called_once_with(resilience.OPEN_SECONDS)
+
+    def test_success_resets_the_failures(self, *_):
+        """Test failures separated by a success do not open the circuit."""
+        for _ in range(resilience.FAILURE_THRESHOLD - 1):
+            self.breaker.record("api.github.com", True)
+        self.breaker.record("api.github.com", False)
+        self.breaker.record("api.github.com", True)
+
+        self.assertFalse(self.breaker.is_open("api.github.com"))
+
+    def test_failed_probe_reopens_for_longer(self, mock_monotonic, mock_sleep):
+        """Test the first failure after a pause opens the circuit again for twice as long."""
+        for _ in range(resilience.FAILURE_THRESHOLD):
+            self.breaker.record("api.github.com", True)
+        mock_monotonic.return_value += resilience.OPEN_SECONDS
+        self.assertFalse(self.breaker.is_open("api.github.com"))
+
+        self.breaker.record("api.github.com", True)
+
+        with patch("builtins.print"):
+            self.breaker.wait("api.github.com")
+        mock_sleep.assert_called_once_with(resilience.OPEN_SECONDS * 2)
+
+    def test_closed_circuit_does_not_wait(self, _, mock_sleep):
+        """Test requests to a healthy host are sent right away."""
+        self.breaker.wait("api.github.com")
+
+        mock_sleep.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Test cases for the scheduler module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import scheduler
+from repository import RepositoryHandle
+
+
+class TestScheduler(unittest.TestCase):
+    """
+    Test case for the scheduler module.
+    """
+
+    def make_repo(self, full_name, listing=None):
+        """Return a repository handle listed with the given JSON, if any"""
+        metadata = None
+        if listing is not None:
+            metadata = MagicMock()
+            metadata.as_dict.return_value = listing
+        return RepositoryHandle(MagicMock(), full_name, metadata)
+
+    def test_order_by_cost(self):
+        """Test repositories are ordered by previous commits or size, then push date."""
+        repos = [
+            self.make_repo("org/unknown"),
+            self.make_repo("org/small", {"size": 10, "pushed_at": "2024-01-01"}),
+            self.make_repo("org/stale", {"size": 500, "pushed_at": "2020-01-01"}),
+            self.make_repo("org/fresh", {"size": 500, "pushed_at": "2024-01-01"}),
+            self.make_repo("org/busy", {"size": 1}),
+            self.make_repo("org/quiet", {"size": 1, "pushed_at": "2024-01-01"}),
+            self.make_repo("org/monorepo", {"size": 4_000_000}),
+            self.make_repo("org/unknown2"),
+        ]
+
+        ordered = scheduler.order_by_cost(repos, {"org/busy": 9000, "org/quiet": 0})
+
+        self.assertEqual(
+            [repo.full_name for repo in ordered],
+            [
+                "org/monorepo",
+                "org/busy",
+                "org/fresh",
+                "org/stale",
+                "org/small",
+                "org/quiet",
+                "org/unknown",
+                "org/unknown2",
+            ],
+        )
+
+    def test_save_and_load_costs(self):
+        """Test the commit counts of a run are loaded by the next one."""
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+
+        self.assertEqual(scheduler.load_costs(cache_dir), {})
+        scheduler.save_costs(cache_dir, {"org/repo": 42})
+
+        self.assertEqual(scheduler.load_costs(cache_dir), {"org/repo": 42})
+        self.assertEqual(os.listdir(cache_dir), [scheduler.COSTS_FILENAME])
+
+    def test_costs_without_cache_dir(self):
+        """Test nothing is loaded or saved without a cache directory."""
+        scheduler.save_costs("", {"org/repo": 42})
+
+        self.assertEqual(scheduler.load_costs(""), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Test cases for the shard module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import shard
+from contributor_stats import ContributorStats
+
+
+class TestShard(unittest.TestCase):
+    """
+    Test case for the shard module.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+
+    def test_in_shard_assigns_each_repository_to_one_shard(self):
+        """Test every repository lands in exactly one shard, the same one every time."""
+        repos = [f"org/repo{number}" for number in range(50)]
+        for repo in repos:
+            shards = [index for index in range(3) if shard.in_shard(repo, index, 3)]
+            self.assertEqual(len(shards), 1)
+            self.assertTrue(shard.in_shard(repo.upper(), shards[0], 3))
+        self.assertTrue(all(shard.in_shard(repo, 0, 1) for repo in repos))
+
+    def test_write_and_read_partials(self):
+        """Test the partial results of all shards are merged."""
+        shard.write_partial(
+            0,
+            [ContributorStats("user1", False, "avatar1", 2, "url1", "")],
+            [ContributorStats("user1", False, "avatar1", 5, "old1", "")],
+        )
+        os.mkdir("artifact")
+        os.chdir("artifact")
+        shard.write_partial(
+            1,
+            [
+                ContributorStats("user1", False, "avatar1", 3, "url2", ""),
+                ContributorStats("user2", False, "avatar2", 1, "url3", ""),
+            ],
+            [],
+        )
+        os.chdir(self.directory)
+
+        contributors, returning_contributors = shard.read_partials(".", 2)
+
+        self.assertEqual(
+            contributors,
+            [
+                ContributorStats("user1", False, "avatar1", 5, "url1, url2", ""),
+                ContributorStats("user2", False, "avatar2", 1, "url3", ""),
+            ],
+        )
+        self.assertEqual(
+            returning_contributors,
+            [ContributorStats("user1", False, "avatar1", 5, "old1", "")],
+        )
+
+    def test_read_partials_with_missing_shard(self):
+        """Test the reduce step fails when a shard has not written its result."""
+        shard.write_partial(1, [], [])
+
+        with self.assertRaises(ValueError) as cm:
+            shard.read_partials(".", 3)
+        self.assertEqual(
+            str(cm.exception), "Missing the partial results of shards [0, 2]"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""Test cases for the singleflight module."""
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Test case for the SingleFlight class.
+    """
+
+    def test_concurrent_calls_share_one_result(self):
+        """Test a call arriving while the same one is in flight waits for its result."""
+        flights = SingleFlight()
+        started = threading.Event()
+        finish = threading.Event()
+
+        def slow_call():
+            started.set()
+            finish.wait(5)
+            return "result"
+
+        results = []
+        leader = threading.Thread(
+            target=lambda: results.append(flights.do("key", slow_call))
+        )
+        leader.start()
+        self.assertTrue(started.wait(5))
+        follower_call = MagicMock()
+        follower = threading.Thread(
+            target=lambda: results.append(
+                flights.do("key", follower_call, lambda _: False)
+            )
+        )
+        follower.start()
+        while not flights.metrics["coalesced"]:
+            follower.join(0.01)
+        finish.set()
+        leader.join()
+        follower.join()
+
+        follower_call.assert_not_called()
+        self.assertEqual(sorted(results), [("result", False), ("result", True)])
+
+    def test_reusable_results_are_memoized_up_to_max_entries(self):
+        """Test completed results are reused and the least recently used is dropped."""
+        flights = SingleFlight(max_entries=2)
+        call = MagicMock(side_effect=lambda: call.call_count)
+
+        self.assertEqual(flights.do("a", call), (1, False))
+        self.assertEqual(flights.do("b", call), (2, False))
+        self.assertEqual(flights.do("a", call), (1, True))
+        self.assertEqual(flights.do("c", call), (3, False))
+        self.assertEqual(flights.do("b", call), (4, False))
+        self.assertEqual(flights.do("c", call), (3, True))
+        self.assertEqual(flights.metrics, {"coalesced": 0, "memoized": 2})
+
+    def test_failures_and_unreusable_results_are_not_memoized(self):
+        """Test the call runs again after an error or a result that may not be reused."""
+        flights = SingleFlight()
+        call = MagicMock(side_effect=[RuntimeError("boom"), "accepted", "done"])
+
+        with self.assertRaises(RuntimeError):
+            flights.do("key", call)
+        self.assertEqual(
+            flights.do("key", call, lambda result: result == "done"),
+            ("accepted", False),
+        )
+        self.assertEqual(flights.do("key", call), ("done", False))
+        self.assertEqual(flights.do("key", call), ("done", True))
+        self.assertEqual(call.call_count, 3)
+
+    def test_summary(self):
+        """Test the run metrics line."""
+        self.assertEqual(
+            SingleFlight().summary(), "0 requests coalesced, 0 served from memory"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
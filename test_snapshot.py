@@ -0,0 +1,83 @@
+"""Test cases for the snapshot module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import snapshot
+from contributor_stats import ContributorStats
+from json_writer import write_to_json
+
+
+def contributor(username, contribution_count):
+    """Return a ContributorStats with a contribution count"""
+    return ContributorStats(
+        username, False, "avatar", contribution_count, "commit_url", ""
+    )
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    Test case for the snapshot module.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.filename = os.path.join(directory, "contributors.json")
+
+    @patch.object(snapshot, "CHUNK_SIZE", 7)
+    def test_load_previous_counts(self):
+        """Test the counts are read from a report split across many chunks."""
+        write_to_json(
+            [contributor("user1", 12345), contributor("user2", 3)],
+            self.filename,
+            "2024-01-01",
+            "2024-01-08",
+            "org",
+            [],
+            False,
+            False,
+            time_series=True,
+        )
+
+        self.assertEqual(
+            snapshot.load_previous_counts(self.filename), {"user1": 12345, "user2": 3}
+        )
+
+    def test_load_previous_counts_rejects_other_files(self):
+        """Test a file that is not a JSON object raises a ValueError."""
+        with open(self.filename, "w", encoding="utf-8") as f:
+            f.write("[]")
+
+        with self.assertRaises(ValueError):
+            snapshot.load_previous_counts(self.filename)
+
+    def test_diff(self):
+        """Test contributors that appeared, vanished or changed are reported."""
+        delta = snapshot.diff(
+            {"user1": 5, "user2": 3, "user3": 1},
+            [contributor("user4", 2), contributor("user1", 5), contributor("user2", 1)],
+        )
+
+        self.assertEqual(
+            delta,
+            {
+                "appeared": [{"username": "user4", "contribution_count": 2}],
+                "vanished": [{"username": "user3", "contribution_count": 1}],
+                "changed": [
+                    {
+                        "username": "user2",
+                        "previous_count": 3,
+                        "contribution_count": 1,
+                        "change": -2,
+                    }
+                ],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
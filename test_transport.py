@@ -0,0 +1,65 @@
+"""Test cases for the transport module."""
+
+import unittest
+
+import concurrency
+import paginator
+import transport
+
+
+class TestTransport(unittest.TestCase):
+    """
+    Test case for the transport module.
+    """
+
+    def setUp(self):
+        transport.configure(8)
+
+    def test_sessions_share_one_adapter(self):
+        """Test github3 sessions and the raw session use the same connection pool."""
+        github3_session = transport.github_session()
+        raw_session = transport.session()
+
+        self.assertIsInstance(github3_session, paginator.PrefetchingSession)
+        adapter = raw_session.get_adapter("https://api.github.com")
+        self.assertIs(github3_session.get_adapter("https://api.github.com"), adapter)
+        self.assertEqual(adapter._pool_maxsize, 8)  # pylint: disable=protected-access
+        self.assertIs(adapter.max_retries, transport.RETRY)
+        self.assertEqual(github3_session.timeout, transport.TIMEOUT)
+        self.assertIs(adapter.limiter, transport.limiter())
+        self.assertEqual(transport.limiter().max_limit, 8)
+
+    def test_limiter_is_replaced_by_configure(self):
+        """Test each configured pool gets its own concurrency limit."""
+        limiter = transport.limiter()
+        transport.configure(4)
+
+        self.assertIsInstance(
+            transport.limiter(), concurrency.AdaptiveConcurrencyLimiter
+        )
+        self.assertIsNot(transport.limiter(), limiter)
+
+    def test_raw_session_is_shared(self):
+        """Test the raw session is created once and reused."""
+        self.assertIs(transport.session(), transport.session())
+
+    def test_summary_covers_limiter_and_coalescing(self):
+        """Test the run metrics line reports the limiter and the shared responses."""
+        self.assertEqual(
+            transport.summary(),
+            f"{transport.limiter().summary()}, 0 requests coalesced, 0 served from memory",
+        )
+
+    def test_configure_defaults_pool_size(self):
+        """Test configure falls back to the default pool size."""
+        transport.configure(None)
+
+        adapter = transport.session().get_adapter("https://api.github.com")
+        self.assertEqual(
+            adapter._pool_maxsize,  # pylint: disable=protected-access
+            transport.DEFAULT_POOL_SIZE,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""This module contains the HTTP transport shared by every request the action makes."""
+
+import threading
+
+import concurrency
+import paginator
+import requests
+import singleflight
+from urllib3.util.retry import Retry
+
+DEFAULT_POOL_SIZE = 32
+# (connect, read) timeout in seconds for every request
+TIMEOUT = (5, 60)
+# Connection failures and server errors are retried with jittered exponential
+# backoff. Requests that may have reached GitHub, read errors and error
+# responses, are only retried for idempotent methods; a connection that could
+# not be opened is retried for any method since nothing was sent. Throttled
+# responses are not retried here, whatever their Retry-After says: they go up
+# to the ThrottledAdapter, which pauses every request before sending it again.
+RETRY = Retry(
+    total=5,
+    connect=3,
+    read=2,
+    status=3,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    backoff_max=30,
+    status_forcelist=(500, 502, 503, 504),
+    allowed_methods=("GET", "HEAD"),
+    respect_retry_after_header=False,
+    raise_on_status=False,
+)
+
+_lock = threading.Lock()
+# The shared "adapter" and "session", created on first use
+_shared: dict = {}
+
+
+def configure(pool_size: int | None = None) -> None:
+    """
+    Set up the shared connection pool.
+
+    Sessions created afterwards all mount the same adapter, so github3 and
+    the raw GraphQL and App token requests reuse the same keep-alive
+    connections instead of each opening their own. The adapter also holds
+    the adaptive limit on concurrent requests, which never grows beyond the
+    pool size, and shares one response between identical GET requests.
+
+    Args:
+        pool_size (int | None): The maximum number of connections kept open
+            per host, DEFAULT_POOL_SIZE when None
+    """
+    with _lock:
+        _shared["adapter"] = _new_adapter(pool_size or DEFAULT_POOL_SIZE)
+        _shared.pop("session", None)
+
+
+def github_session() -> paginator.PrefetchingSession:
+    """Return a new github3 session using the shared connection pool"""
+    github3_session = paginator.PrefetchingSession(
+        default_connect_timeout=TIMEOUT[0], default_read_timeout=TIMEOUT[1]
+    )
+    with _lock:
+        _mount(github3_session)
+    return github3_session
+
+
+def session() -> requests.Session:
+    """
+    Return the shared session for requests made outside of github3.
+
+    Like every requests session it keeps connections alive and asks for
+    gzip encoded responses. Callers pass TIMEOUT with each request.
+    """
+    with _lock:
+        if "session" not in _shared:
+            _shared["session"] = requests.Session()
+            _mount(_shared["session"])
+        return _shared["session"]
+
+
+def limiter() -> concurrency.AdaptiveConcurrencyLimiter:
+    """Return the adaptive concurrency limit shared by every request"""
+    with _lock:
+        if "adapter" not in _shared:
+            _shared["adapter"] = _new_adapter(DEFAULT_POOL_SIZE)
+        return _shared["adapter"].limiter
+
+
+def summary() -> str:
+    """Return the run metrics of the shared adapter as a line of text"""
+    with _lock:
+        if "adapter" not in _shared:
+            _shared["adapter"] = _new_adapter(DEFAULT_POOL_SIZE)
+        adapter = _shared["adapter"]
+    return f"{adapter.limiter.summary()}, {adapter.flights.summary()}"
+
+
+def _mount(http_session: requests.Session) -> None:
+    """Route every request of a session through the shared adapter, with _lock held"""
+    if "adapter" not in _shared:
+        _shared["adapter"] = _new_adapter(DEFAULT_POOL_SIZE)
+    http_session.mount("https://", _shared["adapter"])
+    http_session.mount("http://", _shared["adapter"])
+
+
+def _new_adapter(pool_size: int) -> concurrency.ThrottledAdapter:
+    """Create an adapter keeping up to pool_size keep-alive connections per host"""
+    return concurrency.ThrottledAdapter(
+        concurrency.AdaptiveConcurrencyLimiter(pool_size),
+        flights=singleflight.SingleFlight(),
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=RETRY,
+    )